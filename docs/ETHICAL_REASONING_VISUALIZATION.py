@@ -1,13 +1,37 @@
+import functools
+import os
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
 import numpy as np
 import matplotlib.pyplot as plt
 import networkx as nx
 from mpl_toolkits.mplot3d import Axes3D
 
+from visualization_export import (
+    default_layout_cache, render_in_pool, save_figure, use_headless_backend
+)
+
 class EthicalReasoningVisualizer:
-    def __init__(self):
+    def __init__(
+        self,
+        output_dir: Optional[str] = None,
+        formats: Sequence[str] = ('png',),
+        layout_cache=None
+    ):
         """
         Advanced visualization tools for ethical reasoning complexity
+        
+        Parameters:
+        - output_dir: Write figures here (Agg backend) instead of showing them
+        - formats: Export formats, 'png' and/or 'svg'
+        - layout_cache: LayoutCache for graph positions (defaults to the shared one)
         """
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.layout_cache = layout_cache or default_layout_cache()
+        if output_dir:
+            use_headless_backend()
         self.color_palette = {
             'complexity_low': '#66b3ff',     # Light Blue
             'complexity_medium': '#ff9933',  # Orange
@@ -24,13 +48,8 @@ class EthicalReasoningVisualizer:
         fig = plt.figure(figsize=(12, 8))
         ax = fig.add_subplot(111, projection='3d')
         
-        # Generate sample complexity landscape
-        X = np.linspace(-5, 5, 100)
-        Y = np.linspace(-5, 5, 100)
-        X, Y = np.meshgrid(X, Y)
-        
-        # Simulate complexity surface
-        Z = np.sin(np.sqrt(X**2 + Y**2))
+        # Sample complexity landscape, computed once per process
+        X, Y, Z = _complexity_landscape(100)
         
         # Plot surface with complexity-based coloring
         surf = ax.plot_surface(
@@ -47,7 +66,7 @@ class EthicalReasoningVisualizer:
         
         fig.colorbar(surf, shrink=0.5, aspect=5)
         plt.tight_layout()
-        plt.show()
+        return self._finish(fig, 'ethical_landscape')
     
     def visualize_uncertainty_propagation(self, uncertainty_data):
         """
@@ -56,7 +75,7 @@ class EthicalReasoningVisualizer:
         Parameters:
         - uncertainty_data: Dictionary of uncertainty metrics
         """
-        plt.figure(figsize=(10, 6))
+        fig = plt.figure(figsize=(10, 6))
         
         # Generate sample uncertainty distribution
         x = np.random.normal(0, 1, 1000)
@@ -69,7 +88,7 @@ class EthicalReasoningVisualizer:
         plt.xlabel('Interpretation Variance')
         plt.ylabel('Contextual Shift Potential')
         plt.tight_layout()
-        plt.show()
+        return self._finish(fig, 'uncertainty_propagation')
     
     def create_ethical_reasoning_network(self, reasoning_components):
         """
@@ -91,8 +110,8 @@ class EthicalReasoningVisualizer:
             ('Uncertainty Quantifier', 'Ethical Decision Maker')
         ])
         
-        pos = nx.spring_layout(G)
-        plt.figure(figsize=(10, 8))
+        pos = self.layout_cache.layout(G, _spring_layout, variant='spring')
+        fig = plt.figure(figsize=(10, 8))
         
         nx.draw_networkx_nodes(
             G, pos, 
@@ -105,7 +124,28 @@ class EthicalReasoningVisualizer:
         plt.title('Ethical Reasoning Component Interactions')
         plt.axis('off')
         plt.tight_layout()
+        return self._finish(fig, 'ethical_reasoning_network')
+    
+    def render_all(self, complexity_data, uncertainty_data, reasoning_components):
+        """
+        Render every reasoning figure
+        
+        Returns written file paths in export mode, otherwise None
+        """
+        paths = []
+        paths.extend(self.visualize_ethical_landscape(complexity_data) or [])
+        paths.extend(self.visualize_uncertainty_propagation(uncertainty_data) or [])
+        paths.extend(self.create_ethical_reasoning_network(reasoning_components) or [])
+        return paths if self.output_dir else None
+    
+    def _finish(self, fig, name):
+        """
+        Save and close the figure in export mode, otherwise show it
+        """
+        if self.output_dir:
+            return save_figure(fig, self.output_dir, name, self.formats)
         plt.show()
+        return None
     
     def _assign_complexity_color(self, component):
         """
@@ -118,16 +158,82 @@ class EthicalReasoningVisualizer:
         }
         return complexity_map.get(component, self.color_palette['complexity_medium'])
 
+def _spring_layout(G):
+    return nx.spring_layout(G, seed=0)
+
+@functools.lru_cache(maxsize=8)
+def _complexity_landscape(resolution: int) -> Tuple[np.ndarray, ...]:
+    """
+    Meshgrid and simulated complexity surface, shared read-only between calls
+    """
+    X = np.linspace(-5, 5, resolution)
+    Y = np.linspace(-5, 5, resolution)
+    X, Y = np.meshgrid(X, Y)
+    
+    # Simulate complexity surface
+    Z = np.sin(np.sqrt(X**2 + Y**2))
+    
+    for array in (X, Y, Z):
+        array.flags.writeable = False
+    return X, Y, Z
+
+def _render_reasoning_report(
+    name: str,
+    report: Dict[str, Any],
+    output_dir: str,
+    formats: Sequence[str]
+) -> List[str]:
+    visualizer = EthicalReasoningVisualizer(os.path.join(output_dir, name), formats)
+    return visualizer.render_all(
+        report.get('complexity_data', {}),
+        report.get('uncertainty_data', {}),
+        report['reasoning_components']
+    )
+
+def render_reasoning_reports(
+    reports: Dict[str, Dict[str, Any]],
+    output_dir: str,
+    formats: Sequence[str] = ('png',),
+    workers: Optional[int] = None,
+    layout_cache_dir: Optional[str] = None
+) -> List[str]:
+    """
+    Render many reasoning reports in parallel, headless
+    
+    Parameters:
+    - reports: Report name -> {'reasoning_components', 'complexity_data', 'uncertainty_data'}
+    - output_dir: Root directory; each report gets a subdirectory
+    - formats: Export formats, 'png' and/or 'svg'
+    - workers: Worker processes (None uses every CPU, 1 renders in-process)
+    - layout_cache_dir: Directory where workers share cached layouts
+    
+    Returns paths of all written files
+    """
+    jobs = [
+        (name, report, output_dir, tuple(formats))
+        for name, report in reports.items()
+    ]
+    return render_in_pool(_render_reasoning_report, jobs, workers, layout_cache_dir)
+
 # Example usage
 if __name__ == "__main__":
+    components = [
+        'Cognitive Variance', 
+        'Contextual Interpreter', 
+        'Uncertainty Quantifier', 
+        'Ethical Decision Maker'
+    ]
+    
+    if len(sys.argv) > 1:
+        # Headless export: python ETHICAL_REASONING_VISUALIZATION.py <output_dir>
+        report = {'reasoning_components': components}
+        for path in render_reasoning_reports({'sample': report}, sys.argv[1]):
+            print(path)
+        sys.exit(0)
+    
     visualizer = EthicalReasoningVisualizer()
     
     # Demonstrate visualization techniques
     visualizer.visualize_ethical_landscape({})
     visualizer.visualize_uncertainty_propagation({})
-    visualizer.create_ethical_reasoning_network([
-        'Cognitive Variance', 
-        'Contextual Interpreter', 
-        'Uncertainty Quantifier', 
-        'Ethical Decision Maker'
-    ])
+    visualizer.create_ethical_reasoning_network(components)
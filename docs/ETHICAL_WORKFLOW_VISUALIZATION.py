@@ -1,21 +1,58 @@
+import functools
+import os
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
 import networkx as nx
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 
+from visualization_export import (
+    default_layout_cache, render_in_pool, save_figure, use_headless_backend
+)
+
+ETHICAL_MODULES = ['Intent Verification', 'Consequence Projection', 'Ethical Learning']
+
+# Node count above which the intervention network switches to the large-graph mode
+LARGE_GRAPH_THRESHOLD = 500
+
 class EthicalWorkflowVisualizer:
     """
     Advanced visualization tools for ethical agent workflows
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        output_dir: Optional[str] = None,
+        formats: Sequence[str] = ('png',),
+        layout_cache=None
+    ):
+        """
+        Initialize visualizer
+
+        Args:
+            output_dir: Write figures here (Agg backend) instead of showing them
+            formats: Export formats, 'png' and/or 'svg'
+            layout_cache: LayoutCache for graph positions (defaults to the shared one)
+        """
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.layout_cache = layout_cache or default_layout_cache()
+        if output_dir:
+            use_headless_backend()
         self.color_palette = {
             'low_risk': '#66b3ff',     # Light Blue
             'moderate_risk': '#ff9933', # Orange
             'high_risk': '#ff5050'     # Red
         }
     
-    def visualize_ethical_intervention_network(self, agent_workflows):
+    def visualize_ethical_intervention_network(
+        self,
+        agent_workflows,
+        large_graph: Optional[bool] = None,
+        keep_edge_fraction: float = 0.1
+    ):
         """
         Create network graph of ethical interventions across agents
         
@@ -23,12 +60,17 @@ class EthicalWorkflowVisualizer:
         - Intervention points
         - Ethical complexity
         - Workflow interactions
+        
+        Large-graph mode (default above LARGE_GRAPH_THRESHOLD nodes) replaces
+        the O(n^2) spring layout with a sparse spectral layout, draws only the
+        strongest keep_edge_fraction of edges plus each node's strongest edge,
+        and labels only the ethical modules.
         """
         G = nx.DiGraph()
         
         # Add nodes for agents and ethical modules
         agents = list(agent_workflows.keys())
-        ethical_modules = ['Intent Verification', 'Consequence Projection', 'Ethical Learning']
+        ethical_modules = ETHICAL_MODULES
         
         for agent in agents:
             G.add_node(agent, type='agent', color=self._assign_agent_color(agent))
@@ -41,9 +83,15 @@ class EthicalWorkflowVisualizer:
             for module in ethical_modules:
                 G.add_edge(agent, module, weight=self._calculate_interaction_weight(workflow, module))
         
+        if large_graph is None:
+            large_graph = G.number_of_nodes() > LARGE_GRAPH_THRESHOLD
+        if large_graph:
+            return self._draw_large_intervention_network(G, keep_edge_fraction)
+        
         # Visualization
-        plt.figure(figsize=(12, 8))
-        pos = nx.spring_layout(G, k=0.5)  # positions for all nodes
+        fig = plt.figure(figsize=(12, 8))
+        # positions for all nodes, reused for graphs with the same structure
+        pos = self.layout_cache.layout(G, _spring_layout, variant='spring-k0.5')
         
         # Draw nodes
         nx.draw_networkx_nodes(
@@ -67,7 +115,53 @@ class EthicalWorkflowVisualizer:
         plt.title('Ethical Intervention Network')
         plt.axis('off')
         plt.tight_layout()
-        plt.show()
+        return self._finish(fig, 'ethical_intervention_network')
+    
+    def _draw_large_intervention_network(self, G, keep_edge_fraction: float):
+        """
+        Draw thousands of nodes: spectral layout, pruned edges, module labels only
+        """
+        fig = plt.figure(figsize=(16, 12))
+        # Interaction weights are drawn per call, so the layout uses structure only
+        # and repeated renders of the same workflows hit the cache
+        pos = self.layout_cache.layout(G, _structural_spectral_layout, variant='sparse-spectral')
+        
+        edges = prune_edges(G, keep_fraction=keep_edge_fraction)
+        # Without arrows NetworkX draws a single LineCollection instead of one patch per edge
+        nx.draw_networkx_edges(
+            G, pos,
+            edgelist=edges,
+            edge_color='gray',
+            arrows=False,
+            alpha=0.25,
+            width=[G[u][v]['weight'] for u, v in edges]
+        )
+        
+        nodes = list(G.nodes())
+        nx.draw_networkx_nodes(
+            G, pos,
+            nodelist=nodes,
+            node_color=[G.nodes[node]['color'] for node in nodes],
+            node_size=[
+                300 if G.nodes[node]['type'] == 'ethical_module'
+                else max(2.0, 20_000 / len(nodes)) for node in nodes
+            ],
+            linewidths=0,
+            alpha=0.8
+        )
+        
+        modules = {
+            node: node for node, data in G.nodes(data=True) if data['type'] == 'ethical_module'
+        }
+        nx.draw_networkx_labels(G, pos, labels=modules, font_size=10, font_weight="bold")
+        
+        plt.title(
+            f'Ethical Intervention Network ({G.number_of_nodes()} nodes, '
+            f'{len(edges)} of {G.number_of_edges()} edges shown)'
+        )
+        plt.axis('off')
+        plt.tight_layout()
+        return self._finish(fig, 'ethical_intervention_network')
     
     def visualize_ethical_risk_heatmap(self, agent_workflows):
         """
@@ -78,7 +172,7 @@ class EthicalWorkflowVisualizer:
         - Intervention effectiveness
         - Workflow complexity
         """
-        plt.figure(figsize=(10, 6))
+        fig = plt.figure(figsize=(10, 6))
         
         # Generate risk data
         risk_data = self._generate_risk_matrix(agent_workflows)
@@ -96,7 +190,7 @@ class EthicalWorkflowVisualizer:
         plt.xlabel('Ethical Intervention Modules')
         plt.ylabel('Agent Types')
         plt.tight_layout()
-        plt.show()
+        return self._finish(fig, 'ethical_risk_heatmap')
     
     def visualize_workflow_complexity(self, agent_workflows):
         """
@@ -113,7 +207,7 @@ class EthicalWorkflowVisualizer:
         # Generate complexity data
         complexity_data = self._generate_complexity_surface(agent_workflows)
         
-        X, Y = np.meshgrid(complexity_data['x'], complexity_data['y'])
+        X, Y = complexity_data['X'], complexity_data['Y']
         Z = complexity_data['z']
         
         # Plot surface
@@ -131,7 +225,32 @@ class EthicalWorkflowVisualizer:
         
         fig.colorbar(surf, shrink=0.5, aspect=5)
         plt.tight_layout()
+        return self._finish(fig, 'workflow_complexity')
+    
+    def render_all(self, agent_workflows) -> Optional[List[str]]:
+        """
+        Render every workflow figure
+
+        Returns:
+            Written file paths in export mode, otherwise None
+        """
+        paths = []
+        for render in (
+            self.visualize_ethical_intervention_network,
+            self.visualize_ethical_risk_heatmap,
+            self.visualize_workflow_complexity
+        ):
+            paths.extend(render(agent_workflows) or [])
+        return paths if self.output_dir else None
+    
+    def _finish(self, fig, name: str) -> Optional[List[str]]:
+        """
+        Save and close the figure in export mode, otherwise show it
+        """
+        if self.output_dir:
+            return save_figure(fig, self.output_dir, name, self.formats)
         plt.show()
+        return None
     
     def _assign_agent_color(self, agent):
         """
@@ -156,7 +275,7 @@ class EthicalWorkflowVisualizer:
         Generate simulated risk matrix for heatmap
         """
         agents = list(agent_workflows.keys())
-        modules = ['Intent Verification', 'Consequence Projection', 'Ethical Learning']
+        modules = ETHICAL_MODULES
         
         risk_matrix = np.random.uniform(0, 1, (len(agents), len(modules)))
         return risk_matrix
@@ -165,19 +284,190 @@ class EthicalWorkflowVisualizer:
         """
         Generate 3D complexity surface data
         """
-        x = np.linspace(-5, 5, 100)
-        y = np.linspace(-5, 5, 100)
-        X, Y = np.meshgrid(x, y)
-        
-        # Create a complex surface representing workflow complexity
-        Z = np.sin(np.sqrt(X**2 + Y**2))
-        
+        x, y, X, Y, Z = _complexity_surface(100)
         return {
             'x': x,
             'y': y,
+            'X': X,
+            'Y': Y,
             'z': Z
         }
 
+def _spring_layout(G):
+    return nx.spring_layout(G, k=0.5, weight=None, seed=0)
+
+def _structural_spectral_layout(G):
+    return sparse_spectral_layout(G, weight=None)
+
+def sparse_spectral_layout(G, weight: Optional[str] = 'weight', seed: int = 0):
+    """
+    Near-linear layout for large sparse graphs
+    
+    Each connected component is placed by the two leading non-trivial
+    eigenvectors of its normalized adjacency matrix, found with a sparse
+    Lanczos solver, so the cost grows with the number of edges rather
+    than with n^2 like spring_layout. Strongly connected nodes end up
+    close together; a node with a few neighbours sits near their
+    weighted average. Components are scaled by the square root of their
+    size and packed in rows, largest first.
+    
+    Returns:
+        Dict mapping each node to an (x, y) position
+    """
+    from scipy.sparse.csgraph import connected_components
+    
+    nodes = list(G.nodes())
+    if not nodes:
+        return {}
+    adjacency = nx.to_scipy_sparse_array(G, nodelist=nodes, weight=weight, format='csr')
+    adjacency = (adjacency + adjacency.T).tocsr().astype(np.float64)
+    n_components, labels = connected_components(adjacency, directed=False)
+    
+    rng = np.random.default_rng(seed)
+    positions = np.zeros((len(nodes), 2))
+    order = np.argsort(labels, kind='stable')
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    components = sorted(np.split(order, bounds), key=len, reverse=True)
+    
+    # Shelf packing: fill a row up to roughly sqrt(total area), then start the next
+    row_width = np.sqrt(len(nodes)) * 1.5
+    x = y = row_height = 0.0
+    for members in components:
+        local = _spectral_coordinates(adjacency[members][:, members], rng)
+        size = np.sqrt(len(members))
+        if x > 0 and x + size > row_width:
+            x, y, row_height = 0.0, y - row_height - 1.0, 0.0
+        positions[members] = local * size + [x + size / 2, y - size / 2]
+        x += size + 1.0
+        row_height = max(row_height, size)
+    
+    positions -= positions.mean(axis=0)
+    positions /= max(np.abs(positions).max(), 1e-12)
+    return dict(zip(nodes, positions))
+
+def _spectral_coordinates(adjacency, rng) -> np.ndarray:
+    """
+    Positions of one connected component, within radius 0.5 of the origin
+    """
+    from scipy.sparse import diags
+    from scipy.sparse.linalg import ArpackNoConvergence, eigsh
+    
+    n = adjacency.shape[0]
+    if n <= 2:
+        return np.array([[-0.25, 0.0], [0.25, 0.0]])[:n]
+    
+    degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    scale = diags(1.0 / np.sqrt(np.maximum(degree, 1e-12)))
+    normalized = scale @ adjacency @ scale
+    
+    if n <= 200:
+        _, vectors = np.linalg.eigh(normalized.toarray())
+        vectors = vectors[:, ::-1][:, :3]
+    else:
+        try:
+            values, vectors = eigsh(
+                normalized, k=3, which='LA', v0=rng.random(n), tol=1e-4, maxiter=n * 10
+            )
+        except ArpackNoConvergence as e:
+            values, vectors = e.eigenvalues, e.eigenvectors
+        vectors = vectors[:, np.argsort(values)[::-1]]
+    
+    # Drop the trivial eigenvector and map back to random-walk eigenvectors
+    coords = vectors[:, 1:3] * scale.diagonal()[:, None]
+    if coords.shape[1] < 2:
+        coords = np.column_stack([coords, rng.random((n, 2 - coords.shape[1]))])
+    coords = coords - np.median(coords, axis=0)
+    # Hubs get eigenvector entries orders of magnitude larger than everyone
+    # else; compress radii (r -> r / (r + r90)) so they don't squash the rest
+    radius = np.linalg.norm(coords, axis=1)
+    typical = np.percentile(radius, 90)
+    if typical <= 0:
+        return coords
+    return coords * (0.5 / (radius + typical))[:, None]
+
+def prune_edges(
+    G,
+    weight: str = 'weight',
+    keep_fraction: float = 0.1,
+    min_weight: Optional[float] = None
+) -> List[Tuple[Any, Any]]:
+    """
+    Edges worth drawing in a large graph
+    
+    Keeps edges whose weight is at least min_weight (by default the
+    (1 - keep_fraction) quantile of all weights) plus the strongest edge
+    of every node, so no node is left floating without context.
+    """
+    edges = list(G.edges(data=weight, default=1.0))
+    if not edges:
+        return []
+    weights = np.fromiter((w for _, _, w in edges), dtype=np.float64, count=len(edges))
+    if min_weight is None:
+        min_weight = np.quantile(weights, 1.0 - keep_fraction)
+    
+    strongest: Dict[Any, int] = {}
+    for i, (u, v, w) in enumerate(edges):
+        for node in (u, v):
+            if node not in strongest or w > weights[strongest[node]]:
+                strongest[node] = i
+    keep = weights >= min_weight
+    keep[list(strongest.values())] = True
+    return [(u, v) for (u, v, _), kept in zip(edges, keep) if kept]
+
+@functools.lru_cache(maxsize=8)
+def _complexity_surface(resolution: int) -> Tuple[np.ndarray, ...]:
+    """
+    Meshgrid and surface for the complexity landscape, computed once per resolution
+
+    The arrays are shared between calls, so they are made read-only.
+    """
+    x = np.linspace(-5, 5, resolution)
+    y = np.linspace(-5, 5, resolution)
+    X, Y = np.meshgrid(x, y)
+    
+    # Create a complex surface representing workflow complexity
+    Z = np.sin(np.sqrt(X**2 + Y**2))
+    
+    arrays = (x, y, X, Y, Z)
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays
+
+def _render_workflow_report(
+    name: str,
+    agent_workflows: Dict[str, Any],
+    output_dir: str,
+    formats: Sequence[str]
+) -> List[str]:
+    visualizer = EthicalWorkflowVisualizer(os.path.join(output_dir, name), formats)
+    return visualizer.render_all(agent_workflows)
+
+def render_workflow_reports(
+    workflow_sets: Dict[str, Dict[str, Any]],
+    output_dir: str,
+    formats: Sequence[str] = ('png',),
+    workers: Optional[int] = None,
+    layout_cache_dir: Optional[str] = None
+) -> List[str]:
+    """
+    Render the figures of many agent workflows in parallel, headless
+
+    Args:
+        workflow_sets: Report name -> agent workflows; each report gets a subdirectory
+        output_dir: Root directory for the exported figures
+        formats: Export formats, 'png' and/or 'svg'
+        workers: Worker processes (None uses every CPU, 1 renders in-process)
+        layout_cache_dir: Directory where workers share cached layouts
+
+    Returns:
+        Paths of all written files
+    """
+    jobs = [
+        (name, workflows, output_dir, tuple(formats))
+        for name, workflows in workflow_sets.items()
+    ]
+    return render_in_pool(_render_workflow_report, jobs, workers, layout_cache_dir)
+
 # Example usage
 if __name__ == "__main__":
     sample_workflows = {
@@ -187,6 +477,12 @@ if __name__ == "__main__":
         'Seer': {'complexity': 0.5, 'risk_level': 'moderate'}
     }
     
+    if len(sys.argv) > 1:
+        # Headless export: python ETHICAL_WORKFLOW_VISUALIZATION.py <output_dir>
+        for path in render_workflow_reports({'sample': sample_workflows}, sys.argv[1]):
+            print(path)
+        sys.exit(0)
+    
     visualizer = EthicalWorkflowVisualizer()
     
     # Demonstrate visualization techniques
@@ -0,0 +1,227 @@
+"""
+Headless export and layout caching shared by the ethical visualizers
+
+Both EthicalWorkflowVisualizer and EthicalReasoningVisualizer accept an
+output_dir. When it is set they switch matplotlib to the Agg backend and
+write each figure as PNG/SVG instead of calling plt.show(), so they can
+run in cron jobs and worker processes without a display.
+
+Graph layouts are cached by graph structure (nodes and edges, plus
+weights for weighted layouts), in memory and optionally as JSON files
+shared between processes. Layouts are seeded, so a cached layout is identical to a
+recomputed one.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import networkx as nx
+
+EXPORT_FORMATS = ('png', 'svg')
+
+def use_headless_backend() -> None:
+    """
+    Switch matplotlib to the non-interactive Agg backend
+    """
+    import matplotlib.pyplot as plt
+    if plt.get_backend().lower() != 'agg':
+        plt.switch_backend('Agg')
+
+def save_figure(
+    fig: Any,
+    output_dir: str,
+    name: str,
+    formats: Iterable[str] = ('png',),
+    dpi: int = 100
+) -> List[str]:
+    """
+    Write a figure in each format and close it
+
+    Returns:
+        Paths of the written files
+    """
+    import matplotlib.pyplot as plt
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for fmt in formats:
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f'format must be one of {EXPORT_FORMATS}, got {fmt!r}')
+        path = os.path.join(output_dir, f'{name}.{fmt}')
+        fig.savefig(path, format=fmt, dpi=dpi, bbox_inches='tight')
+        paths.append(path)
+    plt.close(fig)
+    return paths
+
+def graph_structure_key(G: nx.Graph, variant: str = '', weight: Optional[str] = None) -> str:
+    """
+    Stable digest of a graph's nodes and edges
+
+    Node and edge attributes (colors, weights) are ignored so graphs that
+    only differ in styling share a layout, except for the weight attribute
+    when the layout depends on it. variant separates layouts of the same
+    graph computed with different algorithms or parameters.
+    """
+    digest = hashlib.sha256()
+    digest.update(f'{variant}|{G.is_directed()}|'.encode('utf-8'))
+    for node in sorted(repr(node) for node in G.nodes()):
+        digest.update(node.encode('utf-8'))
+        digest.update(b'\0')
+    digest.update(b'\1')
+    edges = (
+        repr((u, v)) if weight is None else repr((u, v, round(float(data.get(weight, 1)), 6)))
+        for u, v, data in G.edges(data=True)
+    )
+    for edge in sorted(edges):
+        digest.update(edge.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+class LayoutCache:
+    """
+    LRU cache of node positions keyed by graph structure
+
+    With a directory, layouts are also stored as JSON files so worker
+    processes and later runs reuse them. Files are written to a temporary
+    name and renamed, so concurrent writers never expose partial files.
+    """
+
+    def __init__(self, max_entries: int = 256, directory: Optional[str] = None):
+        """
+        Initialize layout cache
+
+        Args:
+            max_entries: Layouts kept in memory
+            directory: Optional directory for persisted layouts
+        """
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: 'OrderedDict[str, Dict[Any, Tuple[float, float]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'disk_hits': 0, 'misses': 0}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def layout(
+        self,
+        G: nx.Graph,
+        compute: Callable[[nx.Graph], Dict[Any, Any]],
+        variant: str = '',
+        weight: Optional[str] = None
+    ) -> Dict[Any, Tuple[float, float]]:
+        """
+        Positions for G, computed with compute(G) on a miss
+
+        Pass weight when compute() uses that edge attribute, so graphs
+        with different weights do not share a layout.
+        """
+        key = graph_structure_key(G, variant, weight)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return self._entries[key]
+
+        pos = self._load(key, G)
+        if pos is not None:
+            stat = 'disk_hits'
+        else:
+            stat = 'misses'
+            pos = {node: (float(xy[0]), float(xy[1])) for node, xy in compute(G).items()}
+            self._store(key, pos)
+
+        with self._lock:
+            self._stats[stat] += 1
+            self._entries[key] = pos
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return pos
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, 'entries': len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+    def _load(self, key: str, G: nx.Graph) -> Optional[Dict[Any, Tuple[float, float]]]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), encoding='utf-8') as handle:
+                stored = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        # JSON keys are strings; map them back through the graph's own nodes
+        nodes = {repr(node): node for node in G.nodes()}
+        if set(stored) != set(nodes):
+            return None
+        return {nodes[name]: tuple(xy) for name, xy in stored.items()}
+
+    def _store(self, key: str, pos: Dict[Any, Tuple[float, float]]) -> None:
+        if not self.directory:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump({repr(node): list(xy) for node, xy in pos.items()}, handle)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+_default_cache = LayoutCache(directory=os.getenv('ETHICAL_LAYOUT_CACHE_DIR') or None)
+
+def default_layout_cache() -> LayoutCache:
+    """
+    Process-wide layout cache (persisted when ETHICAL_LAYOUT_CACHE_DIR is set)
+    """
+    return _default_cache
+
+def _init_render_worker(layout_cache_dir: Optional[str]) -> None:
+    # Pool initializer only: replaces process-wide state of the worker
+    global _default_cache
+    use_headless_backend()
+    if layout_cache_dir:
+        _default_cache = LayoutCache(directory=layout_cache_dir)
+
+def render_in_pool(
+    render: Callable[..., List[str]],
+    jobs: Iterable[Tuple[Any, ...]],
+    workers: Optional[int] = None,
+    layout_cache_dir: Optional[str] = None
+) -> List[str]:
+    """
+    Run render(*job) for every job in a process pool of headless workers
+
+    render must be a module-level function so it can be pickled. Workers
+    switch to the Agg backend and share layouts through layout_cache_dir
+    when it is given. With workers=1 or a single job, render runs in the
+    calling process, which keeps its own backend and default layout cache.
+
+    Returns:
+        All written file paths, in job order
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    jobs = list(jobs)
+    if workers == 1 or len(jobs) <= 1:
+        return [path for job in jobs for path in render(*job)]
+
+    paths: List[str] = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_render_worker,
+        initargs=(layout_cache_dir,)
+    ) as pool:
+        for written in pool.map(render, *zip(*jobs)):
+            paths.extend(written)
+    return paths
@@ -22,6 +22,8 @@ setup(
         'dev': [
             'pytest',
             'pytest-cov',
+            'pytest-benchmark',
+            'pytest-xdist',
             'mypy',
             'black',
             'flake8'
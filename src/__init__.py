@@ -1,5 +0,0 @@
-# Project Overseer Core Package
-from . import tools
-from . import agents
-
-__all__ = ['tools', 'agents']
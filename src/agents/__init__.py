@@ -1,3 +1,16 @@
-from .integration_tools import AgentIntegrationToolkit
+from .integration_tools import AgentIntegrationToolkit, AgentCommunicationHandler
+from .command_parser import AgentCommandParser
+from .command_dispatcher import AgentCommandDispatcher
+from .workflow import Output, Step, Workflow, WorkflowCache, WorkflowRunner
 
-__all__ = ['AgentIntegrationToolkit']
+__all__ = [
+    'AgentIntegrationToolkit',
+    'AgentCommunicationHandler',
+    'AgentCommandParser',
+    'AgentCommandDispatcher',
+    'Workflow',
+    'Step',
+    'Output',
+    'WorkflowCache',
+    'WorkflowRunner'
+]
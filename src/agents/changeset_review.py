@@ -0,0 +1,171 @@
+import codecs
+import os
+import re
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Optional, Iterable, Iterator, List, Set, Tuple
+
+from .code_review import CodeReviewEngine
+
+HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+# Plain paths, standard a/ b/ prefixes: independent of quotePath, noprefix and mnemonicPrefix
+GIT = ['git', '-c', 'core.quotePath=false']
+DIFF_PREFIXES = ['--src-prefix=a/', '--dst-prefix=b/']
+
+# One engine per worker process, so each worker keeps its own result cache
+_worker_engine: Optional[CodeReviewEngine] = None
+
+def git_changed_lines(
+    repo_dir: str,
+    base: str = 'HEAD',
+    paths: Optional[Iterable[str]] = None
+) -> Dict[str, Set[int]]:
+    """
+    Map changed Python files to their added/modified lines relative to a base revision
+
+    Compares the working tree against `base` using `git diff --unified=0`.
+    Untracked files that are not ignored count as entirely added. Paths
+    are resolved relative to `repo_dir`; deleted files and pure deletions
+    are omitted.
+
+    Example:
+        git_changed_lines('/repo', base='origin/main')
+        # {'/repo/src/app.py': {12, 13, 40}}
+    """
+    pathspec = list(paths or ['*.py'])
+    cmd = GIT + ['diff', '--unified=0', '--no-color', '--no-ext-diff', '--relative']
+    cmd += DIFF_PREFIXES + [base, '--']
+    output = subprocess.run(
+        cmd + pathspec,
+        cwd=repo_dir,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    untracked = subprocess.run(
+        GIT + ['ls-files', '-z', '--others', '--exclude-standard', '--'] + pathspec,
+        cwd=repo_dir,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+
+    changes: Dict[str, Set[int]] = {}
+    current: Optional[Set[int]] = None
+    for line in output.splitlines():
+        if line.startswith('+++ '):
+            target = _diff_path(line[4:])
+            if target == '/dev/null' or not target.endswith('.py'):
+                current = None
+            else:
+                path = os.path.join(repo_dir, target[2:])
+                current = changes.setdefault(path, set())
+        elif line.startswith('@@') and current is not None:
+            match = HUNK_HEADER.match(line)
+            if match:
+                start = int(match.group(1))
+                count = int(match.group(2)) if match.group(2) is not None else 1
+                current.update(range(start, start + count))
+
+    for target in untracked.split('\0'):
+        if not target.endswith('.py'):
+            continue
+        path = os.path.join(repo_dir, target)
+        try:
+            with open(path, encoding='utf-8', errors='replace') as handle:
+                changes[path] = set(range(1, sum(1 for _ in handle) + 1))
+        except OSError:
+            continue
+
+    return {path: lines for path, lines in changes.items() if lines}
+
+def _diff_path(name: str) -> str:
+    """
+    Decode a ---/+++ file name from a git diff
+
+    Names with spaces carry a trailing tab, and names with control
+    characters or quotes stay C-quoted even with core.quotePath=false.
+    """
+    name = name.rstrip('\t')
+    if len(name) >= 2 and name[0] == name[-1] == '"':
+        raw = codecs.escape_decode(name[1:-1].encode('utf-8'))[0]
+        return raw.decode('utf-8', errors='surrogateescape')
+    return name
+
+def review_file(path: str, lines: Optional[Set[int]] = None) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Review one file, keeping only findings that overlap `lines` when given
+
+    Runs inside worker processes; the file is read there so only the path crosses
+    the process boundary.
+    """
+    global _worker_engine
+    if _worker_engine is None:
+        _worker_engine = CodeReviewEngine()
+
+    try:
+        with open(path, encoding='utf-8') as handle:
+            code = handle.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return path, [{
+            'check': 'io',
+            'line': 0,
+            'end_line': 0,
+            'column': 0,
+            'severity': 'error',
+            'message': f'Could not read file: {e}'
+        }]
+
+    findings = _worker_engine.review(code)
+    if lines is not None:
+        findings = [
+            finding for finding in findings
+            if not lines.isdisjoint(range(finding['line'], finding['end_line'] + 1))
+        ]
+    return path, findings
+
+def review_files(
+    paths: Iterable[str],
+    max_workers: Optional[int] = None,
+    changes: Optional[Dict[str, Set[int]]] = None
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Review many files across a process pool, yielding each file as it finishes
+
+    Args:
+        paths: Files to review
+        max_workers: Worker processes (defaults to the CPU count)
+        changes: Optional changed lines per path; findings outside them are dropped
+
+    Yields:
+        (path, findings) in completion order
+    """
+    paths = list(paths)
+    changes = changes or {}
+
+    # A pool is not worth its startup cost for a single file
+    if len(paths) <= 1 or max_workers == 1:
+        for path in paths:
+            yield review_file(path, changes.get(path))
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(review_file, path, changes.get(path)) for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+def review_changeset(
+    repo_dir: str,
+    base: str = 'HEAD',
+    max_workers: Optional[int] = None
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Review the Python files changed since `base`, reporting only findings in changed hunks
+
+    Example:
+        for path, findings in review_changeset('/repo', base='origin/main'):
+            ...
+    """
+    changes = git_changed_lines(repo_dir, base)
+    return review_files(sorted(changes), max_workers=max_workers, changes=changes)
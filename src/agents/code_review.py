@@ -0,0 +1,354 @@
+import ast
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Set, Tuple, Type
+
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+class ReviewContext:
+    """
+    Shared traversal state handed to every check
+    """
+
+    def __init__(self):
+        self.scopes: List[ast.AST] = []
+        self.findings: List[Dict[str, Any]] = []
+
+    def report(self, check: str, node: ast.AST, message: str, severity: str = 'warning') -> None:
+        """
+        Record a finding at the node's position
+        """
+        self.findings.append({
+            'check': check,
+            'line': getattr(node, 'lineno', 0),
+            'end_line': getattr(node, 'end_lineno', None) or getattr(node, 'lineno', 0),
+            'column': getattr(node, 'col_offset', 0),
+            'severity': severity,
+            'message': message
+        })
+
+class ReviewCheck:
+    """
+    Base class for static review checks
+
+    Subclasses list the AST node types they inspect in node_types; the
+    engine calls visit() for each such node during its single traversal.
+    enter_scope()/leave_scope() bracket every function or lambda body.
+    """
+
+    name = 'check'
+    node_types: Tuple[Type[ast.AST], ...] = ()
+
+    def start(self, context: ReviewContext) -> None:
+        """
+        Reset per-review state
+        """
+
+    def visit(self, node: ast.AST, context: ReviewContext) -> None:
+        """
+        Inspect a node of one of the declared node_types
+        """
+
+    def enter_scope(self, node: ast.AST, context: ReviewContext) -> None:
+        """
+        Called before a function body is traversed
+        """
+
+    def leave_scope(self, node: ast.AST, context: ReviewContext) -> None:
+        """
+        Called after a function body is traversed
+        """
+
+    def finish(self, context: ReviewContext) -> None:
+        """
+        Report findings that need the whole module
+        """
+
+class ComplexityCheck(ReviewCheck):
+    """
+    Flags functions whose cyclomatic complexity exceeds a threshold
+    """
+
+    name = 'complexity'
+    node_types = (
+        ast.If, ast.For, ast.AsyncFor, ast.While, ast.IfExp, ast.ExceptHandler,
+        ast.With, ast.AsyncWith, ast.Assert, ast.BoolOp, ast.comprehension
+    )
+
+    def __init__(self, max_complexity: int = 10):
+        self.max_complexity = max_complexity
+        self._counters: List[int] = []
+
+    def start(self, context: ReviewContext) -> None:
+        self._counters = []
+
+    def visit(self, node: ast.AST, context: ReviewContext) -> None:
+        if not self._counters:
+            return
+        if isinstance(node, ast.BoolOp):
+            self._counters[-1] += len(node.values) - 1
+        elif isinstance(node, ast.comprehension):
+            self._counters[-1] += 1 + len(node.ifs)
+        else:
+            self._counters[-1] += 1
+
+    def enter_scope(self, node: ast.AST, context: ReviewContext) -> None:
+        self._counters.append(1)
+
+    def leave_scope(self, node: ast.AST, context: ReviewContext) -> None:
+        complexity = self._counters.pop()
+        if complexity > self.max_complexity and not isinstance(node, ast.Lambda):
+            context.report(
+                self.name,
+                node,
+                f'Function {node.name!r} has cyclomatic complexity {complexity} '
+                f'(limit {self.max_complexity}); consider splitting it'
+            )
+
+class UnusedNamesCheck(ReviewCheck):
+    """
+    Flags imports and local variables that are never read
+    """
+
+    name = 'unused-name'
+    node_types = (ast.Import, ast.ImportFrom, ast.Name, ast.Global, ast.Nonlocal, ast.Assign)
+
+    def start(self, context: ReviewContext) -> None:
+        self._imports: Dict[str, ast.AST] = {}
+        self._exported: Set[str] = set()
+        self._all_loads: Set[str] = set()
+        # Per function scope: (stored names, loaded names, declared global/nonlocal)
+        self._scopes: List[Tuple[Dict[str, ast.AST], Set[str], Set[str]]] = []
+
+    def visit(self, node: ast.AST, context: ReviewContext) -> None:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            if isinstance(node, ast.ImportFrom) and node.module == '__future__':
+                return
+            for alias in node.names:
+                if alias.name == '*':
+                    continue
+                bound = alias.asname or alias.name.split('.')[0]
+                self._imports.setdefault(bound, node)
+        elif isinstance(node, ast.Name):
+            if isinstance(node.ctx, ast.Load):
+                self._all_loads.add(node.id)
+                if self._scopes:
+                    self._scopes[-1][1].add(node.id)
+            elif isinstance(node.ctx, ast.Store) and self._scopes:
+                self._scopes[-1][0].setdefault(node.id, node)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            if self._scopes:
+                self._scopes[-1][2].update(node.names)
+        elif isinstance(node, ast.Assign) and not self._scopes:
+            self._collect_exports(node)
+
+    def enter_scope(self, node: ast.AST, context: ReviewContext) -> None:
+        self._scopes.append(({}, set(), set()))
+
+    def leave_scope(self, node: ast.AST, context: ReviewContext) -> None:
+        stores, loads, declared = self._scopes.pop()
+        if self._scopes:
+            # Closures read their parent's variables
+            self._scopes[-1][1].update(loads)
+        for name, store in stores.items():
+            if name in loads or name in declared or name.startswith('_'):
+                continue
+            context.report(self.name, store, f'Local variable {name!r} is assigned but never used')
+
+    def finish(self, context: ReviewContext) -> None:
+        for name, node in self._imports.items():
+            if name not in self._all_loads and name not in self._exported:
+                context.report(self.name, node, f'Import {name!r} is unused')
+
+    def _collect_exports(self, node: ast.Assign) -> None:
+        if not any(isinstance(t, ast.Name) and t.id == '__all__' for t in node.targets):
+            return
+        if isinstance(node.value, (ast.List, ast.Tuple)):
+            for element in node.value.elts:
+                if isinstance(element, ast.Constant) and isinstance(element.value, str):
+                    self._exported.add(element.value)
+
+class BareExceptCheck(ReviewCheck):
+    """
+    Flags bare except clauses, which also swallow KeyboardInterrupt and SystemExit
+    """
+
+    name = 'bare-except'
+    node_types = (ast.ExceptHandler,)
+
+    def visit(self, node: ast.AST, context: ReviewContext) -> None:
+        if node.type is None:
+            context.report(
+                self.name,
+                node,
+                "Bare 'except:' catches SystemExit and KeyboardInterrupt; "
+                "catch Exception or a specific error instead"
+            )
+
+class DangerousCallCheck(ReviewCheck):
+    """
+    Flags calls that execute code, spawn shells or deserialize untrusted data
+    """
+
+    name = 'dangerous-call'
+    node_types = (ast.Call,)
+
+    DANGEROUS_CALLS = {
+        'eval': 'eval() executes arbitrary code',
+        'exec': 'exec() executes arbitrary code',
+        'os.system': 'os.system() runs a shell command; prefer subprocess with a list',
+        'os.popen': 'os.popen() runs a shell command; prefer subprocess with a list',
+        'pickle.load': 'pickle can execute code when loading untrusted data',
+        'pickle.loads': 'pickle can execute code when loading untrusted data',
+        'marshal.loads': 'marshal is unsafe for untrusted data'
+    }
+
+    def visit(self, node: ast.AST, context: ReviewContext) -> None:
+        name = self._qualified_name(node.func)
+        if name is None:
+            return
+
+        keywords = {keyword.arg: keyword.value for keyword in node.keywords}
+        if name in self.DANGEROUS_CALLS:
+            context.report(self.name, node, self.DANGEROUS_CALLS[name], severity='error')
+        elif name == 'yaml.load' and 'Loader' not in keywords:
+            context.report(
+                self.name,
+                node,
+                'yaml.load() without Loader; use yaml.safe_load()',
+                severity='error'
+            )
+        elif name.startswith('subprocess.'):
+            shell = keywords.get('shell')
+            if isinstance(shell, ast.Constant) and shell.value is True:
+                context.report(
+                    self.name,
+                    node,
+                    f'{name}() with shell=True risks shell injection',
+                    severity='error'
+                )
+
+    @staticmethod
+    def _qualified_name(func: ast.AST) -> Optional[str]:
+        if isinstance(func, ast.Name):
+            return func.id
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+            return f'{func.value.id}.{func.attr}'
+        return None
+
+def default_checks() -> List[ReviewCheck]:
+    """
+    Build the standard set of review checks
+    """
+    return [ComplexityCheck(), UnusedNamesCheck(), BareExceptCheck(), DangerousCallCheck()]
+
+class CodeReviewEngine:
+    """
+    Local static review of Python code
+
+    Parses code once and runs every check during a single AST traversal.
+    Results are cached by content hash, so re-reviewing unchanged code is a
+    dictionary lookup. Issues found here do not need an LLM round-trip.
+
+    Example:
+        engine = CodeReviewEngine()
+        for finding in engine.review(source):
+            print(finding['line'], finding['message'])
+    """
+
+    def __init__(self, checks: Optional[List[ReviewCheck]] = None, cache_size: int = 512):
+        """
+        Initialize review engine
+
+        Args:
+            checks: Checks to run (defaults to default_checks())
+            cache_size: Number of reviewed sources kept in the result cache
+        """
+        self.checks = checks if checks is not None else default_checks()
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._review_lock = threading.Lock()
+
+        self._dispatch: Dict[Type[ast.AST], List[ReviewCheck]] = {}
+        for check in self.checks:
+            for node_type in check.node_types:
+                self._dispatch.setdefault(node_type, []).append(check)
+
+    def review(self, code: str) -> List[Dict[str, Any]]:
+        """
+        Review source code
+
+        Returns:
+            Findings sorted by line, each with check, line, column, severity and message
+        """
+        key = hashlib.sha256(code.encode('utf-8')).hexdigest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return list(cached)
+
+        findings = self._analyze(code)
+
+        with self._lock:
+            self._cache[key] = findings
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return list(findings)
+
+    def _analyze(self, code: str) -> List[Dict[str, Any]]:
+        context = ReviewContext()
+        try:
+            tree = ast.parse(code)
+        except SyntaxError as e:
+            context.findings.append({
+                'check': 'syntax',
+                'line': e.lineno or 0,
+                'end_line': e.lineno or 0,
+                'column': e.offset or 0,
+                'severity': 'error',
+                'message': f'Syntax error: {e.msg}'
+            })
+            return context.findings
+
+        # Checks keep per-review state, so traversals are serialized
+        with self._review_lock:
+            for check in self.checks:
+                check.start(context)
+            self._traverse(tree, context)
+            for check in self.checks:
+                check.finish(context)
+
+        return sorted(context.findings, key=lambda f: (f['line'], f['column'], f['check']))
+
+    def _traverse(self, tree: ast.AST, context: ReviewContext) -> None:
+        dispatch = self._dispatch
+        checks = self.checks
+        stack: List[Tuple[ast.AST, bool]] = [(tree, False)]
+
+        while stack:
+            node, leaving = stack.pop()
+            if leaving:
+                for check in checks:
+                    check.leave_scope(node, context)
+                context.scopes.pop()
+                continue
+
+            for check in dispatch.get(type(node), ()):
+                check.visit(node, context)
+
+            if isinstance(node, FUNCTION_NODES):
+                context.scopes.append(node)
+                for check in checks:
+                    check.enter_scope(node, context)
+                stack.append((node, True))
+
+            stack.extend((child, False) for child in reversed(list(ast.iter_child_nodes(node))))
+
+def format_finding(finding: Dict[str, Any]) -> str:
+    """
+    Render a finding as a single review suggestion
+    """
+    return f"line {finding['line']}: [{finding['check']}] {finding['message']}"
@@ -0,0 +1,248 @@
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable, Iterable, List, Tuple
+
+from tools import github_tool, docker_tool, terraform_tool
+from tools.result_cache import ToolResultCache
+
+CommandHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+# Keyword arguments identifying the resource a command operates on.
+# Commands sharing a target run strictly in submission order.
+TARGET_KEYS = {
+    'GitHub': ('repo_name', 'org_name'),
+    'Docker': ('container_id', 'image', 'tag', 'dockerfile_path'),
+    'Terraform': ('directory',)
+}
+
+# Backends whose commands always share one target when none is given
+# (terraform_tool falls back to the working directory)
+DEFAULT_TARGETS = {
+    'Terraform': '.'
+}
+
+def _tool_handler(
+    tool: Callable[..., Dict[str, Any]],
+    cache: Optional[ToolResultCache] = None
+) -> CommandHandler:
+    """
+    Adapt a unified tool interface to a parsed-command handler
+
+    The tool interfaces only take keyword arguments, so commands carrying
+    positional arguments are rejected rather than run without them.
+    """
+    def handler(command: Dict[str, Any]) -> Dict[str, Any]:
+        error = positional_args_error(command)
+        if error is not None:
+            return error
+        return tool(command['command'], cache=cache, **command.get('kwargs', {}))
+    return handler
+
+def positional_args_error(command: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Error result for a tool command with positional arguments, else None
+    """
+    if not command.get('args'):
+        return None
+    return {
+        'status': 'error',
+        'error_message': (
+            f"{command.get('agent')} {command.get('command')} takes key=value arguments only; "
+            f"got positional {' '.join(map(str, command['args']))}"
+        )
+    }
+
+class AgentCommandDispatcher:
+    """
+    Concurrent executor for parsed agent commands
+
+    Routes commands produced by AgentCommandParser to the GitHub, Docker
+    and Terraform tools or to registered agent handlers.
+
+    Execution Guarantees:
+    - Each backend runs on its own worker pool
+    - Commands for the same target (repository, container, stack) run serially
+    - Independent commands run in parallel
+    - Submission blocks once a backend has max_pending unfinished commands
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_pending: int = 64,
+        backends: Optional[Dict[str, CommandHandler]] = None,
+        worker_overrides: Optional[Dict[str, int]] = None,
+        cache: Optional[ToolResultCache] = None
+    ):
+        """
+        Initialize dispatcher
+
+        Args:
+            max_workers: Worker threads per backend
+            max_pending: Unfinished commands allowed per backend before submission blocks
+            backends: Handlers keyed by agent name (defaults to the tool interfaces)
+            worker_overrides: Per-backend worker counts overriding max_workers
+            cache: Optional result cache shared by the default tool handlers
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.worker_overrides = worker_overrides or {}
+        self.handlers: Dict[str, CommandHandler] = backends if backends is not None else {
+            'GitHub': _tool_handler(github_tool, cache),
+            'Docker': _tool_handler(docker_tool, cache),
+            'Terraform': _tool_handler(terraform_tool, cache)
+        }
+
+        self._lock = threading.Lock()
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lanes: Dict[Tuple[str, str], deque] = {}
+        self._closed = False
+
+    def register_agent(self, name: str, handler: CommandHandler) -> None:
+        """
+        Route commands addressed to an agent to a handler
+
+        Example:
+            dispatcher.register_agent('Scribe', lambda command: scribe.run(command['raw']))
+        """
+        self.handlers[name] = handler
+
+    def dispatch(self, command: Dict[str, Any], timeout: Optional[float] = None) -> Future:
+        """
+        Submit a parsed command for execution
+
+        Args:
+            command: Output of AgentCommandParser.parse
+            timeout: Seconds to wait for a free slot (None waits indefinitely)
+
+        Returns:
+            Future resolving to the handler's result dict
+
+        Raises:
+            TimeoutError: The backend stayed saturated for the whole timeout
+        """
+        future: Future = Future()
+        backend = command.get('agent')
+        handler = self.handlers.get(backend)
+
+        if handler is None:
+            future.set_result({
+                'status': 'error',
+                'error_message': f'No handler registered for agent: {backend}'
+            })
+            return future
+
+        pool, slots = self._backend(backend)
+        if not slots.acquire(timeout=timeout):
+            raise TimeoutError(f'Backend {backend} has {self.max_pending} pending commands')
+
+        target = self._target_for(backend, command)
+        if target is None:
+            pool.submit(self._execute, backend, handler, command, future)
+            return future
+
+        key = (backend, target)
+        with self._lock:
+            lane = self._lanes.setdefault(key, deque())
+            lane.append((handler, command, future))
+            start_lane = len(lane) == 1
+
+        if start_lane:
+            pool.submit(self._drain_lane, key)
+        return future
+
+    def dispatch_many(self, commands: Iterable[Dict[str, Any]]) -> List[Future]:
+        """
+        Submit a batch of parsed commands, preserving per-target order
+        """
+        return [self.dispatch(command) for command in commands]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop all worker pools
+        """
+        with self._lock:
+            self._closed = True
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.shutdown(wait=wait)
+
+    def __enter__(self) -> 'AgentCommandDispatcher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def _backend(self, backend: str) -> Tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+        """
+        Lazily create the worker pool and backpressure slots for a backend
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Dispatcher has been shut down')
+            if backend not in self._pools:
+                self._pools[backend] = ThreadPoolExecutor(
+                    max_workers=self.worker_overrides.get(backend, self.max_workers),
+                    thread_name_prefix=f'dispatch-{backend}'
+                )
+                self._slots[backend] = threading.BoundedSemaphore(self.max_pending)
+            return self._pools[backend], self._slots[backend]
+
+    def _target_for(self, backend: str, command: Dict[str, Any]) -> Optional[str]:
+        """
+        Resolve the resource a command operates on
+        """
+        kwargs = command.get('kwargs', {})
+        for key in TARGET_KEYS.get(backend, ()):
+            if kwargs.get(key) is not None:
+                return str(kwargs[key])
+
+        if backend in DEFAULT_TARGETS:
+            return DEFAULT_TARGETS[backend]
+
+        # Agents without a tool backend process their own commands in order
+        return None if backend in TARGET_KEYS else backend
+
+    def _execute(
+        self,
+        backend: str,
+        handler: CommandHandler,
+        command: Dict[str, Any],
+        future: Future
+    ) -> None:
+        """
+        Run a single command and resolve its future
+        """
+        try:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = handler(command)
+            except Exception as e:
+                result = {
+                    'status': 'error',
+                    'error_message': str(e)
+                }
+            future.set_result(result)
+        finally:
+            self._slots[backend].release()
+
+    def _drain_lane(self, key: Tuple[str, str]) -> None:
+        """
+        Execute a target lane's commands in order until it is empty
+        """
+        backend = key[0]
+        while True:
+            with self._lock:
+                handler, command, future = self._lanes[key][0]
+
+            self._execute(backend, handler, command, future)
+
+            with self._lock:
+                lane = self._lanes[key]
+                lane.popleft()
+                if not lane:
+                    del self._lanes[key]
+                    return
@@ -0,0 +1,129 @@
+import re
+from typing import Dict, Any, Optional, Iterable, Iterator, List
+
+DEFAULT_AGENTS = (
+    'Scribe',
+    'Keeper',
+    'Watcher',
+    'Seer',
+    'GitHub',
+    'Docker',
+    'Terraform'
+)
+
+class AgentCommandParser:
+    """
+    Precompiled parser for @-mention agent commands
+
+    Syntax: @AgentName command [positional ...] [key=value ...]
+
+    Values may be single- or double-quoted to include whitespace. Integer
+    and boolean values are coerced; everything else stays a string.
+    Messages addressed to agents missing from the lookup table are
+    rejected before any tokenizing takes place.
+    """
+
+    _COMMAND_PATTERN = re.compile(r'^\s*@(\w+)\s+(\S+)(?:\s+(.*?))?\s*$', re.DOTALL)
+    _TOKEN_PATTERN = re.compile(
+        r'''([A-Za-z_][\w.-]*)=("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|\S*)'''
+        r'''|("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|\S+)'''
+    )
+    _INT_PATTERN = re.compile(r'^[+-]?\d+$')
+    _ESCAPE_PATTERN = re.compile(r'\\(.)')
+    _BOOLEANS = {'true': True, 'false': False}
+
+    def __init__(self, agents: Optional[Iterable[str]] = None):
+        """
+        Initialize parser with an agent lookup table
+
+        Args:
+            agents: Agent names accepted by the parser (defaults to DEFAULT_AGENTS)
+        """
+        self.agents: Dict[str, str] = {}
+        for agent in agents if agents is not None else DEFAULT_AGENTS:
+            self.register_agent(agent)
+
+    def register_agent(self, name: str) -> None:
+        """
+        Add an agent to the lookup table (matching is case-insensitive)
+        """
+        self.agents[name.lower()] = name
+
+    def parse(self, message: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse a single message into a structured command
+
+        Example:
+            parser.parse("@GitHub add_comment repo_name=owner/repo issue_number=42")
+            # {'agent': 'GitHub', 'command': 'add_comment', 'args': [],
+            #  'kwargs': {'repo_name': 'owner/repo', 'issue_number': 42},
+            #  'raw': 'add_comment repo_name=owner/repo issue_number=42'}
+
+        Returns:
+            Parsed command, or None when the message is not a command for a known agent
+        """
+        match = self._COMMAND_PATTERN.match(message)
+        if not match:
+            return None
+
+        agent = self.agents.get(match.group(1).lower())
+        if agent is None:
+            return None
+
+        command = match.group(2)
+        remainder = match.group(3)
+        args: List[Any] = []
+        kwargs: Dict[str, Any] = {}
+
+        if remainder:
+            coerce = self._coerce
+            for key, value, positional in self._TOKEN_PATTERN.findall(remainder):
+                if key:
+                    kwargs[key] = coerce(value)
+                else:
+                    args.append(coerce(positional))
+
+        return {
+            'agent': agent,
+            'command': command,
+            'args': args,
+            'kwargs': kwargs,
+            'raw': message[match.start(2):match.end(match.lastindex)]
+        }
+
+    def parse_many(
+        self,
+        messages: Iterable[str],
+        skip_invalid: bool = True
+    ) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Lazily parse an iterable or stream of messages
+
+        Args:
+            messages: Any iterable of messages (list, generator, open file, ...)
+            skip_invalid: Drop non-command messages instead of yielding None
+
+        Example:
+            with open('chat.log') as stream:
+                for command in parser.parse_many(stream):
+                    ...
+        """
+        parse = self.parse
+        if skip_invalid:
+            for message in messages:
+                parsed = parse(message)
+                if parsed is not None:
+                    yield parsed
+        else:
+            for message in messages:
+                yield parse(message)
+
+    def _coerce(self, token: str) -> Any:
+        """
+        Strip quotes and convert integer/boolean literals
+        """
+        if len(token) >= 2 and token[0] == token[-1] and token[0] in '"\'':
+            return self._ESCAPE_PATTERN.sub(r'\1', token[1:-1])
+        if self._INT_PATTERN.match(token):
+            return int(token)
+        return self._BOOLEANS.get(token.lower(), token)
@@ -1,12 +1,20 @@
 import os
 import re
 import json
-import subprocess
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterable, Iterator
 from github import Github, GithubException
 import terraform_py
 import docker
 
+from tools.github_token_pool import GitHubTokenPool
+from tools.instrumentation import backend_timer, instrumented
+from tools.job_queue import JobQueue
+from tools.output_capture import run_captured
+from .command_parser import AgentCommandParser
+from .workflow import Step, Workflow, WorkflowCache, WorkflowRunner
+
+AGENT_PATTERN = re.compile(r'^@(\w+)\s+(.+)$')
+
 class AgentIntegrationToolkit:
     """
     Comprehensive agent integration and interaction toolkit
@@ -26,11 +34,31 @@ class AgentIntegrationToolkit:
         - github_token
         - terraform_path
         - docker_socket
+        
+        Optional Configuration:
+        - github_tokens: Additional tokens; calls rotate to the one with the most quota left
+        - github_app: {'app_id', 'private_key', 'installations': {account: installation_id}}
+        - job_database: SQLite file of the durable job queue used by submit_job
+        - workflow_cache_dir: Directory persisting run_workflow step results
+        - output_spill_dir: Directory for spilled terraform output (defaults to the temp directory)
         """
         self.config = config
-        self.github_client = Github(config.get('github_token'))
+        self.github_pool = GitHubTokenPool.from_config(config)
         self.docker_client = docker.from_env()
+        self._job_queue: Optional[JobQueue] = None
+        self._workflow_cache: Optional[WorkflowCache] = None
+    
+    @property
+    def github_client(self) -> Github:
+        """
+        Client of the pooled GitHub credential with the most headroom
+
+        Reading it does not reserve a request; toolkit methods go through
+        github_pool.call() instead.
+        """
+        return self.github_pool.client()
     
+    @instrumented('toolkit')
     def github_create_pr(
         self, 
         repo_name: str, 
@@ -52,25 +80,29 @@ class AgentIntegrationToolkit:
         Returns:
             Pull Request details
         """
-        try:
-            repo = self.github_client.get_repo(repo_name)
-            pr = repo.create_pull(
+        def create(client: Github):
+            return client.get_repo(repo_name).create_pull(
                 title=title,
                 body=body,
                 head=head_branch,
                 base=base_branch
             )
+        
+        try:
+            with backend_timer('network'):
+                pr = self.github_pool.call(create, owner=repo_name.split('/')[0])
             return {
                 'pr_number': pr.number,
                 'pr_url': pr.html_url,
                 'status': 'success'
             }
-        except GithubException as e:
+        except (GithubException, LookupError) as e:
             return {
                 'error': str(e),
                 'status': 'failed'
             }
     
+    @instrumented('toolkit')
     def github_add_comment(
         self, 
         repo_name: str, 
@@ -88,21 +120,24 @@ class AgentIntegrationToolkit:
         Returns:
             Comment submission status
         """
+        def create(client: Github):
+            return client.get_repo(repo_name).get_issue(issue_number).create_comment(comment)
+        
         try:
-            repo = self.github_client.get_repo(repo_name)
-            issue = repo.get_issue(issue_number)
-            comment_obj = issue.create_comment(comment)
+            with backend_timer('network'):
+                comment_obj = self.github_pool.call(create, owner=repo_name.split('/')[0])
             
             return {
                 'comment_id': comment_obj.id,
                 'status': 'success'
             }
-        except GithubException as e:
+        except (GithubException, LookupError) as e:
             return {
                 'error': str(e),
                 'status': 'failed'
             }
     
+    @instrumented('toolkit')
     def terraform_deploy(
         self, 
         terraform_dir: str, 
@@ -116,29 +151,31 @@ class AgentIntegrationToolkit:
             action: Terraform action (apply/plan/destroy)
         
         Returns:
-            Deployment operation results
+            Deployment operation results; outputs are CapturedOutput handles
+            holding the head and tail in memory and spilling the rest to disk
         """
+        spill_dir = self.config.get('output_spill_dir')
         try:
-            # Terraform initialization
-            init_result = subprocess.run(
-                ['terraform', 'init'], 
-                cwd=terraform_dir, 
-                capture_output=True, 
-                text=True
-            )
-            
-            # Terraform action execution
-            action_result = subprocess.run(
-                ['terraform', action, '-auto-approve'], 
-                cwd=terraform_dir, 
-                capture_output=True, 
-                text=True
-            )
+            with backend_timer('subprocess'):
+                # Terraform initialization
+                _, init_output, _ = run_captured(
+                    ['terraform', 'init'], 
+                    cwd=terraform_dir, 
+                    spill_dir=spill_dir
+                )
+                
+                # Terraform action execution (plan does not take -auto-approve)
+                approve = ['-auto-approve'] if action in ('apply', 'destroy') else []
+                returncode, action_output, _ = run_captured(
+                    ['terraform', action] + approve, 
+                    cwd=terraform_dir, 
+                    spill_dir=spill_dir
+                )
             
             return {
-                'init_output': init_result.stdout,
-                'action_output': action_result.stdout,
-                'status': 'success' if action_result.returncode == 0 else 'failed'
+                'init_output': init_output,
+                'action_output': action_output,
+                'status': 'success' if returncode == 0 else 'failed'
             }
         except Exception as e:
             return {
@@ -146,6 +183,7 @@ class AgentIntegrationToolkit:
                 'status': 'failed'
             }
     
+    @instrumented('toolkit')
     def docker_build_image(
         self, 
         dockerfile_path: str, 
@@ -164,10 +202,11 @@ class AgentIntegrationToolkit:
             Image build results
         """
         try:
-            image, build_logs = self.docker_client.images.build(
-                path=dockerfile_path,
-                tag=f"{image_name}:{tag}"
-            )
+            with backend_timer('socket'):
+                image, build_logs = self.docker_client.images.build(
+                    path=dockerfile_path,
+                    tag=f"{image_name}:{tag}"
+                )
             
             return {
                 'image_id': image.id,
@@ -180,6 +219,7 @@ class AgentIntegrationToolkit:
                 'status': 'failed'
             }
     
+    @instrumented('toolkit')
     def docker_deploy_container(
         self, 
         image_name: str, 
@@ -196,10 +236,11 @@ class AgentIntegrationToolkit:
             Container deployment results
         """
         try:
-            container = self.docker_client.containers.run(
-                image=image_name,
-                **container_config
-            )
+            with backend_timer('socket'):
+                container = self.docker_client.containers.run(
+                    image=image_name,
+                    **container_config
+                )
             
             return {
                 'container_id': container.id,
@@ -211,10 +252,104 @@ class AgentIntegrationToolkit:
                 'status': 'failed'
             }
 
+    @property
+    def job_queue(self) -> JobQueue:
+        """
+        Durable job queue at config['job_database'], opened on first use
+        """
+        if self._job_queue is None:
+            if not self.config.get('job_database'):
+                raise ValueError('job_database is not configured')
+            self._job_queue = JobQueue(self.config['job_database'])
+        return self._job_queue
+    
+    @instrumented('toolkit')
+    def submit_job(
+        self, 
+        kind: str, 
+        params: Dict[str, Any], 
+        priority: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Queue a long-running operation instead of blocking on it
+        
+        Jobs are executed by a JobWorkerPool (for example inside the
+        project-overseer daemon) serving the same database. Kinds mirror
+        the blocking methods: 'terraform.deploy' takes terraform_dir and
+        action like terraform_deploy, 'docker.build' takes
+        dockerfile_path, image_name and tag like docker_build_image, and
+        'terraform.apply' takes directory and variables like TerraformTool.apply.
+        
+        Returns:
+            Job id to poll with job_status
+        """
+        try:
+            job_id = self.job_queue.submit(kind, params, priority=priority)
+        except Exception as e:
+            return {
+                'error': str(e),
+                'status': 'failed'
+            }
+        return {
+            'job_id': job_id,
+            'status': 'success'
+        }
+    
+    def job_status(self, job_id: str, after: int = 0) -> Dict[str, Any]:
+        """
+        Current state of a submitted job plus progress events after seq `after`
+        """
+        job = self.job_queue.get(job_id)
+        if job is None:
+            return {
+                'error': f'Unknown job: {job_id}',
+                'status': 'failed'
+            }
+        return {
+            'job': job,
+            'events': self.job_queue.events(job_id, after),
+            'status': 'success'
+        }
+
+    @property
+    def workflow_cache(self) -> WorkflowCache:
+        """
+        Step result cache shared by run_workflow calls on this toolkit
+        """
+        if self._workflow_cache is None:
+            self._workflow_cache = WorkflowCache(self.config.get('workflow_cache_dir'))
+        return self._workflow_cache
+    
+    def run_workflow(
+        self, 
+        workflow: Workflow, 
+        max_workers: int = 4, 
+        force: Iterable[str] = ()
+    ) -> Dict[str, Any]:
+        """
+        Run a DAG of toolkit steps
+        
+        Independent steps run concurrently and steps with cache=True whose
+        inputs and sources are unchanged since a successful run are served
+        from workflow_cache. See WorkflowRunner.
+        
+        Args:
+            workflow: Steps naming toolkit methods (or callables) to run
+            max_workers: Steps allowed to run at the same time
+            force: Step names to execute even when cached
+        
+        Returns:
+            Overall status and per-step results
+        """
+        runner = WorkflowRunner(self, cache=self.workflow_cache, max_workers=max_workers)
+        return runner.run(workflow, force=force)
+
 class AgentCommunicationHandler:
     """
     Agent communication and invocation framework
     """
+    parser = AgentCommandParser()
+
     @staticmethod
     def parse_agent_command(message: str) -> Optional[Dict[str, Any]]:
         """
@@ -222,8 +357,7 @@ class AgentCommunicationHandler:
         
         Syntax: @AgentName command [parameters]
         """
-        agent_pattern = r'^@(\w+)\s+(.+)$'
-        match = re.match(agent_pattern, message.strip())
+        match = AGENT_PATTERN.match(message.strip())
         
         if match:
             agent_name = match.group(1)
@@ -236,6 +370,24 @@ class AgentCommunicationHandler:
         
         return None
 
+    @classmethod
+    def parse_structured_command(cls, message: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse agent invocation into structured arguments
+        
+        Syntax: @AgentName command [positional ...] [key=value ...]
+        
+        Messages addressed to unknown agents return None.
+        """
+        return cls.parser.parse(message)
+
+    @classmethod
+    def parse_many(cls, messages: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Parse a batch or stream of messages, skipping non-commands
+        """
+        return cls.parser.parse_many(messages)
+
 # Example configuration and usage
 def example_usage():
     config = {
@@ -246,27 +398,56 @@ def example_usage():
     
     toolkit = AgentIntegrationToolkit(config)
     
-    # GitHub PR creation example
-    pr_result = toolkit.github_create_pr(
-        repo_name='owner/repo',
-        base_branch='main',
-        head_branch='feature/new-implementation',
-        title='Autonomous Agent Update',
-        body='Automated changes by Project Overseer'
-    )
-    
-    # Terraform deployment example
-    terraform_result = toolkit.terraform_deploy(
-        terraform_dir='/path/to/infrastructure',
-        action='apply'
-    )
+    # Image build and terraform plan run concurrently; apply waits for the
+    # plan and the PR for both. Re-running skips the build and the plan
+    # when their inputs and source trees are unchanged; apply and the PR
+    # have side effects, so they are never served from the cache.
+    workflow = Workflow([
+        Step(
+            'image',
+            'docker_build_image',
+            {
+                'dockerfile_path': '.',
+                'image_name': 'project-overseer',
+                'tag': 'latest'
+            },
+            outputs=['image_id'],
+            sources=['.'],
+            cache=True
+        ),
+        Step(
+            'plan',
+            'terraform_deploy',
+            {'terraform_dir': '/path/to/infrastructure', 'action': 'plan'},
+            outputs=['action_output'],
+            sources=['/path/to/infrastructure'],
+            cache=True
+        ),
+        Step(
+            'apply',
+            'terraform_deploy',
+            {'terraform_dir': '/path/to/infrastructure', 'action': 'apply'},
+            after=['plan'],
+            sources=['/path/to/infrastructure']
+        ),
+        Step(
+            'pull_request',
+            'github_create_pr',
+            {
+                'repo_name': 'owner/repo',
+                'base_branch': 'main',
+                'head_branch': 'feature/new-implementation',
+                'title': 'Autonomous Agent Update',
+                'body': 'Automated changes by Project Overseer'
+            },
+            outputs=['pr_url'],
+            after=['image', 'apply']
+        )
+    ])
     
-    # Docker image build example
-    docker_build = toolkit.docker_build_image(
-        dockerfile_path='./Dockerfile',
-        image_name='project-overseer',
-        tag='latest'
-    )
+    result = toolkit.run_workflow(workflow)
+    for name, step in result['steps'].items():
+        print(f"{name}: {step['status']}{' (cached)' if step['cached'] else ''}")
 
 if __name__ == "__main__":
     example_usage()
@@ -1,5 +1,44 @@
+from functools import lru_cache
+from inspect import cleandoc
 from crewai import Agent, Task
-from typing import Optional, List
+from typing import Optional, List, Iterable, Iterator, Tuple
+
+from . import changeset_review
+from .code_review import CodeReviewEngine, format_finding
+
+# Shared across agents so the content-hash cache is reused between reviews
+review_engine = CodeReviewEngine()
+
+# Rendered once at import; dedenting drops whitespace tokens from every prompt
+DEFAULT_BACKSTORY = cleandoc("""
+    You are an expert software engineer with deep knowledge of
+    best practices, design patterns, and clean code principles.
+    Your mission is to create robust, efficient, and well-documented code.
+""")
+
+CODE_TASK_EXPECTED_OUTPUT = "Clean, well-documented Python code"
+
+CODE_TASK_PREFIX_TEMPLATE = cleandoc("""
+    You are generating one of several related code changes that share the
+    context below. Follow the shared conventions exactly and keep each
+    change self-contained.
+
+    ## Shared context
+    {shared_context}
+
+    ## Task
+""")
+
+@lru_cache(maxsize=128)
+def render_task_prefix(shared_context: str) -> str:
+    """
+    Render the prompt prefix shared by a batch of code tasks.
+
+    The prefix is byte-identical for every task in a batch and always comes
+    first in the task description, so provider-side prompt caching can
+    reuse it; only the short per-task suffix is new input.
+    """
+    return CODE_TASK_PREFIX_TEMPLATE.format(shared_context=shared_context.strip()) + "\n"
 
 class ScribeAgent(Agent):
     """
@@ -11,16 +50,10 @@ class ScribeAgent(Agent):
         goal: str = "Generate high-quality, maintainable code",
         backstory: Optional[str] = None
     ):
-        backstory = backstory or """
-        You are an expert software engineer with deep knowledge of 
-        best practices, design patterns, and clean code principles. 
-        Your mission is to create robust, efficient, and well-documented code.
-        """
-        
         super().__init__(
             role=role,
             goal=goal,
-            backstory=backstory,
+            backstory=backstory or DEFAULT_BACKSTORY,
             verbose=True
         )
 
@@ -37,20 +70,94 @@ class ScribeAgent(Agent):
         return Task(
             description=description,
             agent=self,
-            expected_output="Clean, well-documented Python code"
+            expected_output=CODE_TASK_EXPECTED_OUTPUT
         )
 
+    def create_code_tasks(
+        self,
+        descriptions: Iterable[str],
+        shared_context: str = ""
+    ) -> List[Task]:
+        """
+        Create a batch of code generation tasks sharing one prompt prefix.
+        
+        The shared context (conventions, architecture notes, relevant code)
+        is rendered once and placed ahead of each task's own description,
+        so it is neither re-rendered per task nor re-billed as fresh input
+        when the provider caches prompt prefixes.
+        
+        Args:
+            descriptions (Iterable[str]): Per-task descriptions
+            shared_context (str): Context common to every task in the batch
+        
+        Returns:
+            List[Task]: One CrewAI task per description, in order
+        """
+        if not shared_context:
+            return [self.create_code_task(description) for description in descriptions]
+        
+        prefix = render_task_prefix(shared_context)
+        return [
+            Task(
+                description=prefix + description,
+                agent=self,
+                expected_output=CODE_TASK_EXPECTED_OUTPUT
+            ) for description in descriptions
+        ]
+
     def review_code(self, code: str) -> List[str]:
         """
         Review generated code for potential improvements.
         
+        Runs the local static checks (complexity, unused names, bare excepts,
+        dangerous calls); results are cached by content hash. Only issues
+        these checks cannot detect need an LLM review.
+        
         Args:
             code (str): Code to be reviewed
         
         Returns:
             List[str]: List of suggested improvements or potential issues
         """
-        # Placeholder for code review logic
-        suggestions = []
-        # TODO: Implement sophisticated code review mechanisms
-        return suggestions
+        return [format_finding(finding) for finding in review_engine.review(code)]
+
+    def review_files(
+        self,
+        paths: Iterable[str],
+        max_workers: Optional[int] = None
+    ) -> Iterator[Tuple[str, List[str]]]:
+        """
+        Review many files in parallel worker processes.
+        
+        Args:
+            paths (Iterable[str]): Files to review
+            max_workers (Optional[int]): Worker processes (defaults to CPU count)
+        
+        Returns:
+            Iterator[Tuple[str, List[str]]]: (path, suggestions) as each file finishes
+        """
+        for path, findings in changeset_review.review_files(paths, max_workers=max_workers):
+            yield path, [format_finding(finding) for finding in findings]
+
+    def review_changeset(
+        self,
+        repo_dir: str,
+        base: str = 'HEAD',
+        max_workers: Optional[int] = None
+    ) -> Iterator[Tuple[str, List[str]]]:
+        """
+        Review Python files changed since a base revision.
+        
+        Only findings inside changed hunks are reported.
+        
+        Args:
+            repo_dir (str): Git working tree to review
+            base (str): Revision to diff against
+            max_workers (Optional[int]): Worker processes (defaults to CPU count)
+        
+        Returns:
+            Iterator[Tuple[str, List[str]]]: (path, suggestions) as each file finishes
+        """
+        changes = changeset_review.review_changeset(repo_dir, base=base, max_workers=max_workers)
+        for path, findings in changes:
+            yield path, [format_finding(finding) for finding in findings]
@@ -0,0 +1,375 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Any, Optional, Callable, Iterable, List, Union
+
+from tools.instrumentation import record_event
+from tools.output_capture import json_default
+
+StepAction = Union[str, Callable[..., Dict[str, Any]]]
+
+# Directories never part of a step's source fingerprint
+IGNORED_SOURCE_DIRS = frozenset({'.git', '.terraform', '__pycache__', 'node_modules'})
+
+class Output:
+    """
+    Reference to an output of another workflow step
+
+    Using one as a step input makes the step depend on the producer and
+    receive the value once it is available.
+    """
+
+    def __init__(self, step: str, key: str):
+        self.step = step
+        self.key = key
+
+    def __repr__(self) -> str:
+        return f'Output({self.step!r}, {self.key!r})'
+
+class Step:
+    """
+    One node of a workflow
+
+    Attributes:
+        name: Unique step name
+        action: AgentIntegrationToolkit method name or a callable taking the inputs
+        inputs: Keyword arguments for the action; Output values are resolved first
+        outputs: Result keys exposed to downstream steps
+        after: Steps that must succeed first without passing data
+        sources: Files or directories whose content is part of the cache key
+        cache: Reuse a previous successful result when the key is unchanged.
+            Off by default so steps with side effects (terraform apply,
+            deployments, opening pull requests) run every time; turn it on
+            for builds, plans and reads.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        action: StepAction,
+        inputs: Optional[Dict[str, Any]] = None,
+        outputs: Iterable[str] = (),
+        after: Iterable[str] = (),
+        sources: Iterable[str] = (),
+        cache: bool = False
+    ):
+        self.name = name
+        self.action = action
+        self.inputs = inputs or {}
+        self.outputs = tuple(outputs)
+        self.after = tuple(after)
+        self.sources = tuple(sources)
+        self.cache = cache
+
+    @property
+    def dependencies(self) -> List[str]:
+        """
+        Upstream step names, from Output inputs and `after`
+        """
+        upstream = [value.step for value in self.inputs.values() if isinstance(value, Output)]
+        return list(dict.fromkeys(upstream + list(self.after)))
+
+class Workflow:
+    """
+    Validated DAG of steps
+
+    Raises ValueError for duplicate names, references to unknown steps or
+    undeclared outputs, and cycles.
+    """
+
+    def __init__(self, steps: Iterable[Step]):
+        self.steps: Dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f'Duplicate workflow step: {step.name}')
+            self.steps[step.name] = step
+
+        for step in self.steps.values():
+            for dependency in step.dependencies:
+                if dependency not in self.steps:
+                    raise ValueError(f'Step {step.name} depends on unknown step {dependency}')
+            for value in step.inputs.values():
+                if isinstance(value, Output) and value.key not in self.steps[value.step].outputs:
+                    raise ValueError(
+                        f'Step {step.name} uses {value.key!r}, which {value.step} does not output'
+                    )
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        remaining = {name: set(step.dependencies) for name, step in self.steps.items()}
+        order = []
+        while remaining:
+            ready = [name for name, dependencies in remaining.items() if not dependencies]
+            if not ready:
+                raise ValueError(f'Workflow has a cycle through: {", ".join(sorted(remaining))}')
+            for name in ready:
+                del remaining[name]
+                order.append(name)
+            for dependencies in remaining.values():
+                dependencies.difference_update(ready)
+        return order
+
+def fingerprint_source(path: str) -> str:
+    """
+    Content hash of a file or directory tree (names and bytes, not mtimes)
+    """
+    digest = hashlib.sha256()
+    if os.path.isfile(path):
+        files = [(os.path.basename(path), path)]
+    elif os.path.isdir(path):
+        files = []
+        for root, dirs, names in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d not in IGNORED_SOURCE_DIRS)
+            for name in sorted(names):
+                full_path = os.path.join(root, name)
+                files.append((os.path.relpath(full_path, path), full_path))
+    else:
+        return 'missing'
+
+    for relative_path, full_path in files:
+        digest.update(relative_path.encode('utf-8') + b'\0')
+        with open(full_path, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b''):
+                digest.update(chunk)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+class WorkflowCache:
+    """
+    Content-addressed store of successful step results
+
+    Keys are sha256 digests of a step's action, resolved inputs and source
+    fingerprints. Results live in memory and, with a directory, in one
+    JSON file per key so later processes can reuse them.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+        if result is None and self.directory:
+            try:
+                with open(self._path(key), encoding='utf-8') as handle:
+                    result = json.load(handle)
+            except (OSError, ValueError):
+                result = None
+            if result is not None:
+                with self._lock:
+                    self._entries[key] = result
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = result
+        if not self.directory:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(result, handle)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith('.json'):
+                    os.unlink(os.path.join(self.directory, name))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+class WorkflowRunner:
+    """
+    Executes a Workflow against an AgentIntegrationToolkit
+
+    Steps start as soon as every dependency has succeeded, so independent
+    steps (an image build and a terraform plan, say) run concurrently on
+    a thread pool. A step that opts into caching and whose cache key
+    matches a stored successful result is not executed; its stored
+    result and outputs are reused.
+    When a step fails, everything downstream of it is skipped while
+    unrelated branches finish.
+
+    Example:
+        workflow = Workflow([
+            Step('image', 'docker_build_image',
+                 {'dockerfile_path': '.', 'image_name': 'app'},
+                 outputs=['image_id'], sources=['.'], cache=True),
+            Step('plan', 'terraform_deploy',
+                 {'terraform_dir': 'infra', 'action': 'plan'}, sources=['infra'], cache=True),
+            Step('deploy', 'docker_deploy_container',
+                 {'image_name': Output('image', 'image_id'), 'container_config': {}},
+                 after=['plan'])
+        ])
+        WorkflowRunner(toolkit).run(workflow)
+    """
+
+    def __init__(
+        self,
+        toolkit: Any,
+        cache: Optional[WorkflowCache] = None,
+        max_workers: int = 4
+    ):
+        """
+        Initialize runner
+
+        Args:
+            toolkit: Object whose methods string actions name
+            cache: Step result cache (defaults to an in-memory WorkflowCache)
+            max_workers: Steps allowed to run at the same time
+        """
+        self.toolkit = toolkit
+        self.cache = cache if cache is not None else WorkflowCache()
+        self.max_workers = max_workers
+
+    def run(self, workflow: Workflow, force: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        Run every step of a workflow
+
+        Args:
+            workflow: Steps to run
+            force: Step names to execute even when a cached result exists
+
+        Returns:
+            Overall status and, per step, status, cached flag, cache key,
+            outputs, the action's result dict and elapsed seconds
+        """
+        force = set(force)
+        results: Dict[str, Dict[str, Any]] = {}
+        waiting = {name: set(workflow.steps[name].dependencies) for name in workflow.order}
+        running = {}
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix='workflow'
+        ) as pool:
+            while waiting or running:
+                for name in [name for name in workflow.order if not waiting.get(name, True)]:
+                    del waiting[name]
+                    step = workflow.steps[name]
+                    failed = [d for d in step.dependencies if results[d]['status'] != 'success']
+                    if failed:
+                        results[name] = self._skipped(failed)
+                        self._finished(name, waiting)
+                    else:
+                        running[pool.submit(self._run_step, step, results, name in force)] = name
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    self._finished(name, waiting)
+
+        return {
+            'status': 'success' if all(
+                result['status'] == 'success' for result in results.values()
+            ) else 'failed',
+            'steps': {name: results[name] for name in workflow.order}
+        }
+
+    def step_key(self, step: Step, inputs: Dict[str, Any]) -> str:
+        """
+        Content address of a step: action, resolved inputs and source fingerprints
+        """
+        action = step.action if isinstance(step.action, str) else (
+            f'{step.action.__module__}.{step.action.__qualname__}'
+        )
+        material = {
+            'action': action,
+            'inputs': inputs,
+            'sources': {path: fingerprint_source(path) for path in step.sources}
+        }
+        encoded = json.dumps(material, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def _run_step(
+        self,
+        step: Step,
+        results: Dict[str, Dict[str, Any]],
+        force: bool
+    ) -> Dict[str, Any]:
+        start = time.perf_counter()
+        inputs = {
+            name: results[value.step]['outputs'][value.key] if isinstance(value, Output) else value
+            for name, value in step.inputs.items()
+        }
+        key = self.step_key(step, inputs)
+
+        result = self.cache.get(key) if step.cache and not force else None
+        cached = result is not None
+        if cached:
+            record_event('workflow', 'cache_hit')
+        else:
+            record_event('workflow', 'executed')
+            try:
+                action = getattr(self.toolkit, step.action) if isinstance(step.action, str) \
+                    else step.action
+                result = action(**inputs)
+                if not isinstance(result, dict):
+                    raise TypeError(
+                        f'Step action returned {type(result).__name__}, expected a result dict'
+                    )
+                # Normalize to what a persisted cache entry would return
+                result = json.loads(json.dumps(result, default=json_default))
+            except Exception as e:
+                result = {
+                    'error': str(e),
+                    'status': 'failed'
+                }
+            if step.cache and result.get('status') == 'success':
+                self.cache.put(key, result)
+
+        return {
+            'status': 'success' if result.get('status') == 'success' else 'failed',
+            'cached': cached,
+            'key': key,
+            'outputs': {name: result.get(name) for name in step.outputs},
+            'result': result,
+            'seconds': time.perf_counter() - start
+        }
+
+    @staticmethod
+    def _skipped(failed: List[str]) -> Dict[str, Any]:
+        return {
+            'status': 'skipped',
+            'cached': False,
+            'key': None,
+            'outputs': {},
+            'result': {
+                'error': f'Upstream step failed: {", ".join(failed)}',
+                'status': 'failed'
+            },
+            'seconds': 0.0
+        }
+
+    @staticmethod
+    def _finished(name: str, waiting: Dict[str, set]) -> None:
+        for dependencies in waiting.values():
+            dependencies.discard(name)
@@ -0,0 +1,23 @@
+from .scoring import (
+    INTENT_FACTORS,
+    LONG_TERM_FACTORS,
+    RECOMMENDATION_STRATEGIES,
+    RISK_LEVELS,
+    RISK_THRESHOLDS,
+    SCENARIO_SCORE_DTYPE,
+    SHORT_TERM_FACTORS,
+    ScenarioScoringEngine,
+    assess_intent_risk
+)
+
+__all__ = [
+    'ScenarioScoringEngine',
+    'assess_intent_risk',
+    'SCENARIO_SCORE_DTYPE',
+    'RISK_LEVELS',
+    'RISK_THRESHOLDS',
+    'RECOMMENDATION_STRATEGIES',
+    'INTENT_FACTORS',
+    'SHORT_TERM_FACTORS',
+    'LONG_TERM_FACTORS'
+]
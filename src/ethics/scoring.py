@@ -0,0 +1,108 @@
+import time
+from typing import Dict, Any, Optional, Union, Sequence
+
+import numpy as np
+
+RISK_LEVELS = np.array(['low', 'moderate', 'high'])
+# Risk score upper bounds for 'low' and 'moderate'; anything above is 'high'
+RISK_THRESHOLDS = np.array([0.4, 0.7])
+
+RECOMMENDATION_STRATEGIES = np.array([
+    'Additional human oversight',
+    'Implement safety constraints',
+    'Conduct comprehensive review',
+    'Modify design approach'
+])
+
+INTENT_FACTORS = ('project_complexity', 'potential_misuse', 'context_sensitivity')
+SHORT_TERM_FACTORS = ('immediate_risk', 'resource_utilization', 'system_stability')
+LONG_TERM_FACTORS = ('societal_impact', 'technological_evolution', 'ethical_complexity')
+
+SCENARIO_SCORE_DTYPE = np.dtype(
+    [(name, np.float32) for name in INTENT_FACTORS]
+    + [('risk_score', np.float32), ('risk_level', np.int8), ('recommendation', np.int8)]
+    + [(name, np.float32) for name in SHORT_TERM_FACTORS + LONG_TERM_FACTORS]
+)
+
+def assess_intent_risk(factors: Dict[str, float]) -> str:
+    """
+    Risk level of assessed intent factors (each in [0, 1])
+
+    The risk score is the mean of INTENT_FACTORS, bucketed by
+    RISK_THRESHOLDS exactly as ScenarioScoringEngine does for drawn factors.
+
+    Raises:
+        ValueError: A factor is missing
+    """
+    missing = [name for name in INTENT_FACTORS if name not in factors]
+    if missing:
+        raise ValueError(f'Missing intent factors: {", ".join(missing)}')
+    risk_score = np.mean([factors[name] for name in INTENT_FACTORS])
+    return str(RISK_LEVELS[np.digitize(risk_score, RISK_THRESHOLDS, right=True)])
+
+class ScenarioScoringEngine:
+    """
+    Vectorized scoring of many scenarios at once
+
+    All random factors for a batch come from one draw of an
+    (n, factors) matrix from a seeded numpy Generator, so a seed fully
+    determines the results. Risk levels are derived with vectorized
+    thresholds and everything is returned as one structured array
+    (SCENARIO_SCORE_DTYPE), one row per scenario.
+    """
+
+    # Uniform columns: intent factors, impact factors, recommendation draw
+    FACTOR_COLUMNS = len(INTENT_FACTORS) + len(SHORT_TERM_FACTORS) + len(LONG_TERM_FACTORS) + 1
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = np.random.default_rng(seed)
+
+    def score(self, scenarios: Union[int, Sequence[Dict[str, Any]]]) -> np.ndarray:
+        """
+        Score a batch of scenarios (or a scenario count)
+
+        Returns:
+            Structured array with SCENARIO_SCORE_DTYPE
+        """
+        n = scenarios if isinstance(scenarios, int) else len(scenarios)
+        draws = self.rng.random((n, self.FACTOR_COLUMNS), dtype=np.float32)
+        intent = draws[:, :len(INTENT_FACTORS)]
+
+        scores = np.empty(n, dtype=SCENARIO_SCORE_DTYPE)
+        for column, name in enumerate(INTENT_FACTORS + SHORT_TERM_FACTORS + LONG_TERM_FACTORS):
+            scores[name] = draws[:, column]
+        scores['risk_score'] = intent.mean(axis=1)
+        scores['risk_level'] = np.digitize(scores['risk_score'], RISK_THRESHOLDS, right=True)
+        scores['recommendation'] = (draws[:, -1] * len(RECOMMENDATION_STRATEGIES)).astype(np.int8)
+        return scores
+
+    def monte_carlo_sweep(
+        self,
+        n_scenarios: int = 100_000,
+        chunk_size: int = 262_144
+    ) -> Dict[str, Any]:
+        """
+        Score n_scenarios generated scenarios in chunks and summarize the distribution
+
+        Returns:
+            Risk level shares, mean risk score and impact factor means, and elapsed seconds
+        """
+        start = time.perf_counter()
+        level_counts = np.zeros(len(RISK_LEVELS), dtype=np.int64)
+        factor_sums = dict.fromkeys(('risk_score',) + SHORT_TERM_FACTORS + LONG_TERM_FACTORS, 0.0)
+
+        for offset in range(0, n_scenarios, chunk_size):
+            scores = self.score(min(chunk_size, n_scenarios - offset))
+            level_counts += np.bincount(scores['risk_level'], minlength=len(RISK_LEVELS))
+            for name in factor_sums:
+                factor_sums[name] += float(scores[name].sum(dtype=np.float64))
+
+        return {
+            'scenarios': n_scenarios,
+            'risk_levels': {
+                level: count / n_scenarios
+                for level, count in zip(RISK_LEVELS.tolist(), level_counts.tolist())
+            },
+            'means': {name: total / n_scenarios for name, total in factor_sums.items()},
+            'seconds': time.perf_counter() - start
+        }
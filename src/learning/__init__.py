@@ -0,0 +1,26 @@
+from .systems import RapidAdaptiveLearningSystem
+from .embedding import SentenceTransformerEmbedder, HashingEmbedder
+from .vector_store import NumPyVectorStore
+from .ann import IVFIndex
+from .embedding_cache import EmbeddingCache, CachedEmbedder
+from .batching import MicroBatchingEmbedder
+from .persistence import PersistentEventStore, MappedVectorStore
+from .metadata_index import MetadataIndex
+from .quantization import QuantizedIndex
+from .ingestion import IngestionPipeline
+
+__all__ = [
+    'RapidAdaptiveLearningSystem',
+    'SentenceTransformerEmbedder',
+    'HashingEmbedder',
+    'NumPyVectorStore',
+    'IVFIndex',
+    'EmbeddingCache',
+    'CachedEmbedder',
+    'MicroBatchingEmbedder',
+    'PersistentEventStore',
+    'MappedVectorStore',
+    'MetadataIndex',
+    'QuantizedIndex',
+    'IngestionPipeline'
+]
@@ -0,0 +1,312 @@
+import os
+import threading
+from typing import Optional, List, Tuple
+
+import numpy as np
+
+from .vector_store import NumPyVectorStore, RowIdList
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbour index over a NumPyVectorStore
+
+    Vectors are partitioned into n_lists clusters by spherical k-means;
+    a query scores only the nprobe clusters whose centroids are closest,
+    trading recall for latency. Until train_threshold vectors exist the
+    index answers exactly by brute force.
+
+    Incremental inserts are assigned to their nearest centroid. Once the
+    corpus has grown retrain_growth times past the size it was trained on,
+    centroids are retrained and every vector reassigned. Training runs on
+    a background thread without holding the index lock: inserts and
+    searches keep using the current lists (or brute force before the
+    first training), and the new index is swapped in once it has caught
+    up with the rows added meanwhile. wait_for_training() blocks until then.
+
+    Metadata pre-filters are passed as candidate row ids: small candidate
+    sets are scored exactly, larger ones are intersected with the probed lists.
+
+    save() and load() persist the centroids and inverted lists, so an index
+    over stored vectors is reopened without retraining.
+    """
+
+    def __init__(
+        self,
+        store: NumPyVectorStore,
+        n_lists: Optional[int] = None,
+        nprobe: int = 16,
+        train_threshold: int = 20_000,
+        retrain_growth: float = 4.0,
+        exact_candidate_limit: int = 20_000,
+        kmeans_iterations: int = 10,
+        seed: int = 0
+    ):
+        """
+        Initialize IVF index
+
+        Args:
+            store: Vector store holding the normalized vectors
+            n_lists: Number of clusters (defaults to sqrt(n) at training time)
+            nprobe: Clusters scored per query; higher raises recall and latency
+            train_threshold: Vectors required before clustering (exact search below)
+            retrain_growth: Corpus growth factor that triggers retraining
+            exact_candidate_limit: Filters matching at most this many rows are searched exactly
+            kmeans_iterations: Lloyd iterations when training
+            seed: Seed for centroid initialization and training samples
+        """
+        self.store = store
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.retrain_growth = retrain_growth
+        self.exact_candidate_limit = exact_candidate_limit
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+
+        self._lock = threading.Lock()
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[RowIdList] = []
+        self._trained_size = 0
+        # Rows handed to add() so far; training covers exactly these
+        self._indexed = 0
+        self._training: Optional[threading.Thread] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    def add(self, rows: np.ndarray) -> None:
+        """
+        Index rows that were just appended to the store
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        with self._lock:
+            if len(rows):
+                self._indexed = max(self._indexed, int(rows.max()) + 1)
+            if self._centroids is not None:
+                _assign(self.store.vectors, self._centroids, self._lists, rows)
+            if self._training is not None:
+                return
+            if self._centroids is None:
+                due = self._indexed >= self.train_threshold
+            else:
+                due = self._indexed >= self._trained_size * self.retrain_growth
+            if due:
+                self._training = threading.Thread(
+                    target=self._background_train,
+                    args=(self._indexed,),
+                    name='ivf-train',
+                    daemon=True
+                )
+                self._training.start()
+
+    def wait_for_training(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a running (re)training has been swapped in
+
+        Returns:
+            False if training is still running after timeout seconds
+        """
+        training = self._training
+        if training is not None:
+            training.join(timeout)
+            return not training.is_alive()
+        return True
+
+    def save(self, path: str) -> bool:
+        """
+        Atomically write the centroids and inverted lists to an .npz file
+
+        Returns:
+            False (and nothing is written) while the index is untrained
+        """
+        with self._lock:
+            if self._centroids is None:
+                return False
+            state = {
+                'centroids': self._centroids,
+                'sizes': np.array([ids.size for ids in self._lists], dtype=np.int64),
+                'rows': np.concatenate([ids.view() for ids in self._lists]),
+                'trained_size': np.int64(self._trained_size)
+            }
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'wb') as handle:
+            np.savez(handle, **state)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+        return True
+
+    def load(self, path: str) -> int:
+        """
+        Restore centroids and inverted lists written by save()
+
+        A file that is unreadable, was built with a different n_lists or
+        covers rows the store does not have is ignored.
+
+        Returns:
+            Rows covered by the restored lists (0 if nothing was loaded);
+            later rows still have to be passed to add()
+        """
+        try:
+            with np.load(path) as state:
+                centroids = state['centroids']
+                sizes = state['sizes']
+                rows = state['rows']
+                trained_size = int(state['trained_size'])
+        except (OSError, KeyError, ValueError):
+            return 0
+        if self.n_lists is not None and len(centroids) != min(self.n_lists, trained_size):
+            return 0
+        if len(rows) > len(self.store) or centroids.shape[1:] != self.store.vectors.shape[1:]:
+            return 0
+
+        lists = []
+        for ids in np.split(rows, np.cumsum(sizes)[:-1]):
+            posting = RowIdList(max(len(ids), 64))
+            posting.extend(ids)
+            lists.append(posting)
+        with self._lock:
+            self._centroids = centroids.astype(np.float32)
+            self._lists = lists
+            self._trained_size = trained_size
+            self._indexed = max(self._indexed, len(rows))
+        return len(rows)
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        candidates: Optional[np.ndarray] = None,
+        nprobe: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k search by cosine similarity
+
+        Args:
+            query: Query vector
+            top_k: Number of results
+            candidates: Optional sorted row ids allowed in the result (pre-filter)
+            nprobe: Override the configured number of probed clusters
+
+        Returns:
+            (row indices, similarities), best first
+        """
+        centroids = self._centroids
+        if centroids is None:
+            return self.store.search(query, top_k, candidates)
+        if candidates is not None and len(candidates) <= self.exact_candidate_limit:
+            return self.store.search(query, top_k, candidates)
+
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        with self._lock:
+            centroids, lists = self._centroids, self._lists
+            probes = min(nprobe or self.nprobe, len(centroids))
+            centroid_scores = centroids @ query
+            probed = np.argpartition(-centroid_scores, probes - 1)[:probes]
+            rows = np.concatenate([lists[i].view() for i in probed])
+        if candidates is not None:
+            rows = rows[np.isin(rows, candidates, assume_unique=True)]
+            if len(rows) < top_k:
+                # The filter is too selective for the probed clusters; answer exactly
+                return self.store.search(query, top_k, candidates)
+
+        return self.store.search(query, top_k, np.sort(rows))
+
+    def _background_train(self, size: int) -> None:
+        try:
+            self._train(size)
+        finally:
+            with self._lock:
+                self._training = None
+
+    def _train(self, size: int) -> None:
+        """
+        Cluster the first size rows with spherical k-means, then swap in the new lists
+
+        Runs without the index lock; only the catch-up with rows added
+        during training and the swap itself hold it.
+        """
+        vectors = self.store.vectors[:size]
+        n_lists = self.n_lists or max(1, int(np.sqrt(size)))
+        n_lists = min(n_lists, size)
+        rng = np.random.default_rng(self.seed)
+
+        sample_size = min(size, 32 * n_lists)
+        sample = vectors[np.sort(rng.choice(size, sample_size, replace=False))]
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+        for _ in range(self.kmeans_iterations):
+            labels = _nearest(sample, centroids)
+            order = np.argsort(labels, kind='stable')
+            sorted_labels = labels[order]
+            starts = np.flatnonzero(np.r_[True, np.diff(sorted_labels) != 0])
+            # Re-seed empty clusters from random sample points
+            sums = sample[rng.choice(sample_size, n_lists)].copy()
+            sums[sorted_labels[starts]] = np.add.reduceat(sample[order], starts, axis=0)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = (sums / np.where(norms > 0, norms, 1.0)).astype(np.float32)
+
+        lists = [RowIdList() for _ in range(n_lists)]
+        _assign(vectors, centroids, lists, np.arange(size, dtype=np.int64))
+
+        with self._lock:
+            _assign(
+                self.store.vectors, centroids, lists,
+                np.arange(size, self._indexed, dtype=np.int64)
+            )
+            self._centroids = centroids
+            self._lists = lists
+            self._trained_size = size
+
+def _assign(
+    vectors: np.ndarray,
+    centroids: np.ndarray,
+    lists: List[RowIdList],
+    rows: np.ndarray,
+    chunk: int = 65_536
+) -> None:
+    """
+    Append rows to the inverted list of their nearest centroid
+    """
+    for start in range(0, len(rows), chunk):
+        batch = rows[start:start + chunk]
+        if not len(batch):
+            continue
+        labels = _nearest(vectors[batch], centroids)
+        order = np.argsort(labels, kind='stable')
+        labels, batch = labels[order], batch[order]
+        bounds = np.flatnonzero(np.diff(labels)) + 1
+        starts = np.concatenate(([0], bounds))
+        for label, ids in zip(labels[starts], np.split(batch, bounds)):
+            lists[int(label)].extend(ids)
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 16_384) -> np.ndarray:
+    """
+    Index of the most similar centroid for each vector
+    """
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk):
+        labels[start:start + chunk] = np.argmax(vectors[start:start + chunk] @ centroids.T, axis=1)
+    return labels
+
+def synthetic_vectors(
+    n: int,
+    dimension: int,
+    n_clusters: int = 256,
+    noise: float = 0.6,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Deterministic clustered float32 vectors resembling embedding distributions
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dimension)).astype(np.float32)
+    vectors = np.empty((n, dimension), dtype=np.float32)
+    for start in range(0, n, 100_000):
+        end = min(n, start + 100_000)
+        labels = rng.integers(0, n_clusters, end - start)
+        vectors[start:end] = centers[labels] + noise * rng.standard_normal(
+            (end - start, dimension), dtype=np.float32
+        )
+    return vectors
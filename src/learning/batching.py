@@ -0,0 +1,132 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_STOP = object()
+
+class MicroBatchingEmbedder:
+    """
+    Coalesces concurrent embed() calls into one forward pass
+
+    Callers block while a background worker collects requests for up to
+    max_wait seconds (or until max_batch_size texts are queued) and embeds
+    them together. Transformer models are far cheaper per text in a batch,
+    so concurrent record_learning_event calls share one model invocation.
+    A lone caller pays at most max_wait extra latency.
+
+    close() (or leaving a with block) embeds what is already queued and
+    stops the worker thread.
+    """
+
+    def __init__(self, embedder: Any, max_batch_size: int = 64, max_wait: float = 0.005):
+        """
+        Initialize micro-batcher
+
+        Args:
+            embedder: Wrapped embedder with embed(texts) -> float32 array
+            max_batch_size: Texts that trigger an immediate batch
+            max_wait: Seconds to wait for more requests after the first arrives
+        """
+        self.embedder = embedder
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: queue.Queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.batches = 0
+
+    @property
+    def dimension(self) -> int:
+        return self.embedder.dimension
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        texts = list(texts)
+        if not texts:
+            return self.embedder.embed(texts)
+
+        future: Future = Future()
+        # Enqueue under the lock so nothing lands behind the stop sentinel
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('MicroBatchingEmbedder has been closed')
+            self._ensure_worker()
+            self._queue.put((texts, future))
+        return future.result()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Embed already queued requests and stop the worker thread
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            worker = self._worker
+            if worker is not None:
+                self._queue.put(_STOP)
+        if worker is not None:
+            worker.join(timeout)
+
+    def __enter__(self) -> 'MicroBatchingEmbedder':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _ensure_worker(self) -> None:
+        # Called with self._lock held
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._run,
+                name='embedding-batcher',
+                daemon=True
+            )
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            size = len(first[0])
+            stopping = False
+            deadline = time.monotonic() + self.max_wait
+
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    # Past the deadline, still take whatever is already queued
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else \
+                        self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            self._embed_batch(batch)
+            if stopping:
+                return
+
+    def _embed_batch(self, batch: List[Tuple[List[str], Future]]) -> None:
+        texts = [text for request_texts, _ in batch for text in request_texts]
+        try:
+            vectors = self.embedder.embed(texts)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        offset = 0
+        for request_texts, future in batch:
+            future.set_result(vectors[offset:offset + len(request_texts)])
+            offset += len(request_texts)
@@ -0,0 +1,90 @@
+import hashlib
+import re
+from typing import Optional, Sequence
+
+import numpy as np
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+class SentenceTransformerEmbedder:
+    """
+    Batch text embedder backed by sentence-transformers
+
+    The model is loaded on first use, so constructing a learning system
+    does not pay the model load cost until something is embedded.
+    Embeddings are returned as L2-normalized float32 rows.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, device: Optional[str] = None):
+        """
+        Initialize embedder
+
+        Args:
+            model_name: sentence-transformers model name or path
+            device: Torch device (defaults to the library's choice)
+        """
+        self.model_name = model_name
+        self.device = device
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name, device=self.device)
+        return self._model
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed a batch of texts in a single forward pass
+
+        Returns:
+            Array of shape (len(texts), dimension), dtype float32
+        """
+        vectors = self.model.encode(
+            list(texts),
+            batch_size=max(len(texts), 1),
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+class HashingEmbedder:
+    """
+    Deterministic, dependency-free embedder using signed feature hashing
+
+    Hashes word and character-trigram features into a fixed number of
+    dimensions. It captures lexical rather than semantic similarity, which
+    makes it suitable for offline use, tests and benchmarks.
+    """
+
+    _TOKEN_PATTERN = re.compile(r'[A-Za-z]+|\d+')
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], 'little') % self.dimension
+                vectors[row, bucket] += 1.0 if digest[4] & 1 else -1.0
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+    def _features(self, text: str):
+        # Split identifiers such as process_user_data / UserDataProcessor into words
+        spaced = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
+        for token in self._TOKEN_PATTERN.findall(spaced.lower()):
+            yield f'w:{token}'
+            padded = f'#{token}#'
+            for i in range(len(padded) - 2):
+                yield f'c:{padded[i:i + 3]}'
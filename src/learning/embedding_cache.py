@@ -0,0 +1,159 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+class EmbeddingCache:
+    """
+    Content-hash keyed cache of embedding vectors
+
+    Vectors are kept in an in-memory LRU and, when a directory is given,
+    also written to disk as one .npy file per key so they survive restarts
+    and can be shared between processes. Keys include the embedder's
+    identity, so switching models never returns stale vectors.
+    """
+
+    def __init__(self, max_entries: int = 10_000, directory: Optional[str] = None):
+        """
+        Initialize embedding cache
+
+        Args:
+            max_entries: Vectors kept in memory
+            directory: Optional directory for the persistent cache
+        """
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'disk_hits': 0, 'misses': 0}
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(namespace: str, text: str) -> str:
+        return hashlib.sha256(f'{namespace}\0{text}'.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Look up a vector in memory, then on disk
+        """
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return vector
+
+        vector = self._load(key)
+        with self._lock:
+            if vector is None:
+                self._stats['misses'] += 1
+                return None
+            self._stats['disk_hits'] += 1
+            self._remember(key, vector)
+        return vector
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        """
+        Store a vector in memory and, if configured, on disk
+        """
+        vector = np.array(vector, dtype=np.float32)
+        vector.flags.writeable = False
+        with self._lock:
+            self._remember(key, vector)
+        self._store(key, vector)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, 'entries': len(self._entries)}
+
+    def clear(self) -> None:
+        """
+        Drop the in-memory entries (the on-disk cache is kept)
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f'{key}.npy')
+
+    def _load(self, key: str) -> Optional[np.ndarray]:
+        if not self.directory:
+            return None
+        try:
+            vector = np.load(self._path(key), allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        vector.flags.writeable = False
+        return vector
+
+    def _store(self, key: str, vector: np.ndarray) -> None:
+        if not self.directory:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so concurrent readers never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                np.save(handle, vector, allow_pickle=False)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+class CachedEmbedder:
+    """
+    Embedder wrapper that only embeds texts missing from an EmbeddingCache
+
+    Duplicate texts within one call are embedded once.
+    """
+
+    def __init__(self, embedder: Any, cache: Optional[EmbeddingCache] = None):
+        self.embedder = embedder
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self.namespace = _namespace(embedder)
+
+    @property
+    def dimension(self) -> int:
+        return self.embedder.dimension
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return self.embedder.embed(texts)
+
+        keys = [self.cache.key(self.namespace, text) for text in texts]
+        found = {key: self.cache.get(key) for key in set(keys)}
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if found[key] is None:
+                missing.setdefault(key, text)
+        if missing:
+            vectors = self.embedder.embed(list(missing.values()))
+            for key, vector in zip(missing, vectors):
+                self.cache.put(key, vector)
+                found[key] = vector
+
+        return np.ascontiguousarray(np.stack([found[key] for key in keys]), dtype=np.float32)
+
+def _namespace(embedder: Any) -> str:
+    # Identify the innermost embedder when wrapped (e.g. by a micro-batcher)
+    while hasattr(embedder, 'embedder'):
+        embedder = embedder.embedder
+    # Avoid reading `dimension` on model-backed embedders; it would load the model
+    model_name = getattr(embedder, 'model_name', None)
+    if model_name:
+        return f'{type(embedder).__name__}:{model_name}'
+    return f"{type(embedder).__name__}:{getattr(embedder, 'dimension', '')}"
@@ -0,0 +1,171 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class IngestionPipeline:
+    """
+    Fire-and-forget ingestion of learning events
+
+    submit() only enqueues an already-validated event on a bounded queue.
+    A background worker drains the queue in batches: one embedding call
+    per batch, then one batched write to the backend. flush() is a
+    barrier: it returns once everything submitted before it was written.
+
+    When the queue is full, submit() blocks (backpressure) for up to
+    put_timeout seconds and then raises queue.Full.
+    """
+
+    def __init__(
+        self,
+        embedder: Any,
+        backend: Any,
+        max_queue: int = 10_000,
+        batch_size: int = 256,
+        max_wait: float = 0.01,
+        put_timeout: Optional[float] = None
+    ):
+        """
+        Initialize ingestion pipeline
+
+        Args:
+            embedder: Object with embed(texts) -> float32 array
+            backend: Storage backend with add(events, vectors)
+            max_queue: Events that may be pending before submit() blocks
+            batch_size: Maximum events per embedding call and backend write
+            max_wait: Seconds the worker waits to fill a batch
+            put_timeout: Seconds submit() blocks on a full queue (None waits forever)
+        """
+        self.embedder = embedder
+        self.backend = backend
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.put_timeout = put_timeout
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._done = threading.Condition()
+        self._submitted = 0
+        self._completed = 0
+        # Submits between the closed check and their queue.put()
+        self._enqueuing = 0
+        self._stats = {'ingested': 0, 'failed': 0, 'batches': 0}
+        self._errors: deque = deque(maxlen=1000)
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name='learning-ingestion', daemon=True)
+        self._worker.start()
+
+    def submit(self, event: Dict[str, Any]) -> str:
+        """
+        Queue an event for embedding and storage
+
+        Returns:
+            The event id
+        """
+        with self._done:
+            if self._closed:
+                raise RuntimeError('Ingestion pipeline is closed')
+            self._enqueuing += 1
+        queued = False
+        try:
+            self._queue.put(event, timeout=self.put_timeout)
+            queued = True
+        finally:
+            with self._done:
+                # Counted only once queued: flush() must never wait for an event that never was
+                if queued:
+                    self._submitted += 1
+                self._enqueuing -= 1
+                self._done.notify_all()
+        return event['id']
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every event submitted before this call has been written
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._done:
+            target = self._submitted
+            return self._done.wait_for(lambda: self._completed >= target, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Flush pending events and stop the worker
+
+        Submits that passed the closed check before this call are queued
+        ahead of the stop sentinel, so every accepted event is written.
+        """
+        with self._done:
+            if self._closed:
+                return
+            self._closed = True
+            self._done.wait_for(lambda: self._enqueuing == 0)
+        self._queue.put(_STOP)
+        self._worker.join(timeout)
+
+    def errors(self) -> List[Dict[str, Any]]:
+        """
+        Most recent events that failed to ingest, with the error message
+        """
+        with self._done:
+            return list(self._errors)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._done:
+            return {
+                **self._stats,
+                # The worker may finish an event before submit() has counted it
+                'pending': max(0, self._submitted - self._completed),
+                'queued': self._queue.qsize()
+            }
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            stopping = False
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else \
+                        self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        error = None
+        try:
+            vectors = self.embedder.embed([event['content'] for event in batch])
+            self.backend.add(batch, vectors)
+        except Exception as e:
+            logger.exception('Failed to ingest %d learning events', len(batch))
+            error = e
+
+        with self._done:
+            self._stats['batches'] += 1
+            if error is None:
+                self._stats['ingested'] += len(batch)
+            else:
+                self._stats['failed'] += len(batch)
+                self._errors.extend({'id': event['id'], 'error': str(error)} for event in batch)
+            self._completed += len(batch)
+            self._done.notify_all()
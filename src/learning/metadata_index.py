@@ -0,0 +1,178 @@
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .vector_store import RowIdList
+
+class MetadataIndex:
+    """
+    Inverted index from metadata (key, value) pairs to event rows
+
+    Rows are appended in increasing order, so every posting list is a
+    sorted array without extra work. An exact-match filter resolves to the
+    intersection of one posting per key, smallest first, before any
+    vectors are scored; the more selective the filter, the cheaper the query.
+
+    Values compare like Python equality (1 == 1.0 == True), matching the
+    previous scan. Unhashable values (lists, dicts) are keyed by their
+    canonical JSON encoding.
+
+    save() and load() persist the postings, and remap() carries them over
+    to a compacted store, so the event log is not parsed again to rebuild them.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Any, RowIdList]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, start_row: int, metadatas: Iterable[Dict[str, Any]]) -> None:
+        """
+        Index the metadata of consecutive rows beginning at start_row
+        """
+        batch: Dict[Tuple[str, Any], List[int]] = defaultdict(list)
+        row = start_row - 1
+        for row, metadata in enumerate(metadatas, start_row):
+            for key, value in metadata.items():
+                batch[(key, _index_value(value))].append(row)
+
+        with self._lock:
+            for (key, value), rows in batch.items():
+                values = self._postings.setdefault(key, {})
+                if value not in values:
+                    values[value] = RowIdList(max(len(rows), 16))
+                values[value].extend(np.asarray(rows, dtype=np.int64))
+            self._size = max(self._size, row + 1)
+
+    def candidates(self, filter_metadata: Dict[str, Any]) -> np.ndarray:
+        """
+        Sorted rows whose metadata has every key/value in filter_metadata
+        """
+        with self._lock:
+            postings = []
+            for key, value in filter_metadata.items():
+                posting = self._postings.get(key, {}).get(_index_value(value))
+                if posting is None:
+                    return np.empty(0, dtype=np.int64)
+                postings.append(posting.view())
+
+        postings.sort(key=len)
+        rows = postings[0]
+        for posting in postings[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, posting, assume_unique=True)
+        return rows
+
+    def remap(self, live: np.ndarray) -> 'MetadataIndex':
+        """
+        Index for a compacted store whose row i was row live[i] (sorted) of this one
+        """
+        remapped = MetadataIndex()
+        with self._lock:
+            for key, values in self._postings.items():
+                for value, posting in values.items():
+                    rows = posting.view()
+                    rows = np.searchsorted(live, rows[np.isin(rows, live, assume_unique=True)])
+                    if len(rows):
+                        remapped._postings.setdefault(key, {})[value] = _posting(rows)
+            remapped._size = int(np.searchsorted(live, self._size))
+        return remapped
+
+    def save(self, path: str) -> bool:
+        """
+        Atomically write the postings to an .npz file
+
+        Returns:
+            False (and nothing is written) if a value cannot be encoded as JSON
+        """
+        with self._lock:
+            entries = [
+                (key, value, posting.view())
+                for key, values in self._postings.items()
+                for value, posting in values.items()
+            ]
+            size = self._size
+        try:
+            keys = [json.dumps([key, _encode_value(value)]) for key, value, _ in entries]
+        except (TypeError, ValueError):
+            return False
+
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'wb') as handle:
+            np.savez(
+                handle,
+                keys=np.array(keys, dtype=np.str_),
+                sizes=np.array([len(rows) for _, _, rows in entries], dtype=np.int64),
+                rows=np.concatenate([rows for _, _, rows in entries] or [np.empty(0, np.int64)]),
+                size=np.int64(size)
+            )
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+        return True
+
+    @classmethod
+    def load(cls, path: str, max_rows: int) -> Optional['MetadataIndex']:
+        """
+        Restore an index written by save()
+
+        Returns:
+            None if the file is unreadable or covers more than max_rows rows
+        """
+        try:
+            with np.load(path) as state:
+                keys = state['keys'].tolist()
+                sizes = state['sizes']
+                rows = state['rows']
+                size = int(state['size'])
+        except (OSError, KeyError, ValueError):
+            return None
+        if size > max_rows:
+            return None
+
+        index = cls()
+        for encoded, posting in zip(keys, np.split(rows, np.cumsum(sizes)[:-1])):
+            key, value = json.loads(encoded)
+            index._postings.setdefault(key, {})[_decode_value(value)] = _posting(posting)
+        index._size = size
+        return index
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'rows': self._size,
+                'keys': len(self._postings),
+                'postings': sum(len(values) for values in self._postings.values())
+            }
+
+def _posting(rows: np.ndarray) -> RowIdList:
+    posting = RowIdList(max(len(rows), 16))
+    posting.extend(np.asarray(rows, dtype=np.int64))
+    return posting
+
+def _encode_value(value: Any) -> List[Any]:
+    if isinstance(value, tuple):
+        if len(value) == 2 and value[0] == 'json':
+            return ['json', value[1]]
+        # Events read back from the log hold tuples as lists, which are keyed by JSON
+        return ['json', json.dumps(value, sort_keys=True, default=str)]
+    return ['value', value]
+
+def _decode_value(encoded: List[Any]) -> Any:
+    kind, value = encoded
+    return ('json', value) if kind == 'json' else value
+
+def _index_value(value: Any) -> Any:
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return ('json', json.dumps(value, sort_keys=True, default=str))
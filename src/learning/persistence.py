@@ -0,0 +1,483 @@
+import fcntl
+import json
+import os
+import threading
+from typing import Dict, Any, Optional, Iterator, List
+
+import numpy as np
+
+from .vector_store import NumPyVectorStore
+
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = 'writer.lock'
+FORMAT_VERSION = 1
+
+def _fsync_path(path: str) -> None:
+    """
+    Flush a file's (or a directory's) data and metadata to stable storage
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class MappedVectorStore(NumPyVectorStore):
+    """
+    NumPyVectorStore whose matrix is a memory-mapped float32 file
+
+    The file holds raw row-major float32 rows, preallocated geometrically
+    like the in-memory store. Opening maps the file instead of reading it,
+    so startup cost does not depend on corpus size, and read-only maps in
+    several processes share the same page-cache pages.
+    """
+
+    def __init__(self, path: str, dimension: int, size: int = 0, readonly: bool = False):
+        """
+        Map a vector file
+
+        Args:
+            path: Vector segment file (created if missing)
+            dimension: Embedding dimension
+            size: Committed rows; anything beyond is preallocated or uncommitted
+            readonly: Map read-only; add() is rejected
+        """
+        self.path = path
+        self.dimension = dimension
+        self.readonly = readonly
+        self._size = size
+        self._lock = threading.Lock()
+        self._vectors = self._map(max(size, 1))
+
+    def add(self, vectors: np.ndarray) -> np.ndarray:
+        if self.readonly:
+            raise PermissionError('Vector store is mapped read-only')
+        return super().add(vectors)
+
+    def resize(self, size: int) -> None:
+        """
+        Expose rows committed by another process
+        """
+        with self._lock:
+            if size > len(self._vectors):
+                self._vectors = self._map(size)
+            self._size = size
+
+    def flush(self) -> None:
+        if not self.readonly and isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+            _fsync_path(self.path)
+
+    def _grow(self, capacity: int) -> None:
+        self.flush()
+        self._vectors = self._map(capacity)
+
+    def _map(self, rows: int) -> np.ndarray:
+        row_bytes = self.dimension * 4
+        if self.readonly:
+            available = os.path.getsize(self.path) // row_bytes if os.path.exists(self.path) else 0
+            if available == 0:
+                return np.empty((0, self.dimension), dtype=np.float32)
+            shape = (available, self.dimension)
+            return np.memmap(self.path, dtype=np.float32, mode='r', shape=shape)
+
+        with open(self.path, 'ab') as handle:
+            if handle.tell() < rows * row_bytes:
+                handle.truncate(rows * row_bytes)
+        rows = os.path.getsize(self.path) // row_bytes
+        return np.memmap(self.path, dtype=np.float32, mode='r+', shape=(rows, self.dimension))
+
+class EventLog:
+    """
+    Append-only JSON-lines log of learning events, addressed by row
+
+    A companion int64 file stores the byte offset of every row, so event
+    `row` is one positioned read; nothing is parsed until it is requested.
+
+    Readers that use a log outside the owner's lock pin it with acquire()
+    and release(). close() while the log is pinned only stops appends; the
+    read descriptor stays open until the last reader releases it, so the
+    reads still see this generation even after its files were deleted.
+    """
+
+    def __init__(self, log_path: str, offsets_path: str, rows: int, log_bytes: int,
+                 readonly: bool = False):
+        self.log_path = log_path
+        self.offsets_path = offsets_path
+        self.readonly = readonly
+        self._size = 0
+        self._log_bytes = 0
+        self._offsets = np.empty(max(rows, 1024), dtype=np.int64)
+        self._readers = 0
+        self._closed = False
+        self._readers_lock = threading.Lock()
+
+        if not readonly:
+            # Drop anything written after the last commit (e.g. a crash mid-append)
+            for path, length in ((log_path, log_bytes), (offsets_path, rows * 8)):
+                with open(path, 'ab') as handle:
+                    handle.truncate(length)
+        self._fd = os.open(log_path, os.O_RDONLY)
+        self._append = None if readonly else open(log_path, 'ab')
+        self._append_offsets = None if readonly else open(offsets_path, 'ab')
+        self.resize(rows, log_bytes)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, row: int) -> Dict[str, Any]:
+        return json.loads(self.read_raw(row))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_range(0, self._size)
+
+    def iter_range(self, start: int, stop: int) -> Iterator[Dict[str, Any]]:
+        """
+        Parse rows [start, stop) with one sequential read
+        """
+        stop = min(stop, self._size)
+        if start >= stop:
+            return
+        # Through the open descriptor, so a compacted (deleted) generation stays readable
+        with os.fdopen(os.dup(self._fd), 'rb') as handle:
+            handle.seek(int(self._offsets[start]))
+            for _ in range(start, stop):
+                yield json.loads(handle.readline())
+
+    @property
+    def log_bytes(self) -> int:
+        return self._log_bytes
+
+    def read_raw(self, row: int) -> bytes:
+        """
+        Encoded log line of one event, including its newline
+        """
+        if not 0 <= row < self._size:
+            raise IndexError(row)
+        start = int(self._offsets[row])
+        end = int(self._offsets[row + 1]) if row + 1 < self._size else self._log_bytes
+        return os.pread(self._fd, end - start, start)
+
+    def append(self, events: List[Dict[str, Any]]) -> None:
+        lines = [
+            json.dumps(event, separators=(',', ':'), default=str).encode('utf-8') + b'\n'
+            for event in events
+        ]
+        offsets = self._log_bytes + np.cumsum([0] + [len(line) for line in lines[:-1]])
+        self._append.write(b''.join(lines))
+        self._append_offsets.write(np.asarray(offsets, dtype=np.int64).tobytes())
+        for handle in (self._append, self._append_offsets):
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._extend(offsets, self._log_bytes + sum(len(line) for line in lines))
+
+    def resize(self, rows: int, log_bytes: int) -> None:
+        """
+        Load offsets for rows committed since the last call
+        """
+        if rows > self._size:
+            with open(self.offsets_path, 'rb') as handle:
+                handle.seek(self._size * 8)
+                offsets = np.fromfile(handle, dtype=np.int64, count=rows - self._size)
+            self._extend(offsets, log_bytes)
+        self._log_bytes = log_bytes
+
+    def acquire(self) -> None:
+        """
+        Pin the log for reading; close() defers releasing the file until release()
+        """
+        with self._readers_lock:
+            self._readers += 1
+
+    def release(self) -> None:
+        with self._readers_lock:
+            self._readers -= 1
+            if self._closed and self._readers == 0:
+                os.close(self._fd)
+
+    def close(self) -> None:
+        for handle in (self._append, self._append_offsets):
+            if handle is not None:
+                handle.close()
+        self._append = self._append_offsets = None
+        with self._readers_lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._readers == 0:
+                os.close(self._fd)
+
+    def _extend(self, offsets: np.ndarray, log_bytes: int) -> None:
+        end = self._size + len(offsets)
+        if end > len(self._offsets):
+            grown = np.empty(max(end, 2 * len(self._offsets)), dtype=np.int64)
+            grown[:self._size] = self._offsets[:self._size]
+            self._offsets = grown
+        self._offsets[self._size:end] = offsets
+        self._size = end
+        self._log_bytes = log_bytes
+
+class PersistentEventStore:
+    """
+    On-disk learning events: a mapped vector segment plus an append-only event log
+
+    Directory layout, for generation g:
+        manifest.json      committed row count, log length, deletions, generation
+        vectors.g.f32      memory-mapped float32 rows (see MappedVectorStore)
+        events.g.log       JSON-lines events, row order
+        events.g.idx       int64 byte offset of each event
+        deleted.g.i64      rows removed since the last compaction
+        index.g.npz        saved ANN index state (optional, see index_path)
+        metadata.g.npz     saved metadata index postings (optional, see index_path)
+
+    Appends write and fsync data first and commit by atomically replacing
+    the fsynced manifest, so a crash loses at most the uncommitted batch;
+    bytes past the committed lengths are truncated on the next open. Compaction
+    rewrites live rows into generation g+1, switches the manifest and
+    deletes generation g. Readers keep using their old mappings and open
+    descriptors until they refresh(); in-process readers pin the old
+    EventLog (see EventLog.acquire) for as long as they read from it.
+
+    One writer per directory is enforced with a lock file; any number of
+    read-only instances (in other processes) may open the same directory.
+    """
+
+    def __init__(self, directory: str, readonly: bool = False):
+        """
+        Open or create a store
+
+        Args:
+            directory: Storage directory
+            readonly: Open without the writer lock; appends are rejected
+        """
+        self.directory = directory
+        self.readonly = readonly
+        self._lock_handle = None
+        if not readonly:
+            os.makedirs(directory, exist_ok=True)
+            self._lock_handle = open(os.path.join(directory, LOCK_NAME), 'w')
+            try:
+                fcntl.flock(self._lock_handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError as e:
+                self._lock_handle.close()
+                raise RuntimeError(f'{directory} is already open for writing') from e
+
+        self.vectors: Optional[MappedVectorStore] = None
+        self.events: Optional[EventLog] = None
+        self.deleted: set = set()
+        self._manifest: Dict[str, Any] = {}
+        self._open(self._read_manifest())
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return self._manifest.get('dimension')
+
+    @property
+    def generation(self) -> int:
+        return self._manifest.get('generation', 0)
+
+    def __len__(self) -> int:
+        return self._manifest.get('rows', 0)
+
+    def append(self, events: List[Dict[str, Any]], vectors: np.ndarray) -> np.ndarray:
+        """
+        Append and commit events with their vectors
+
+        Returns:
+            Row indices of the new events
+        """
+        self._check_writable()
+        if self.vectors is None:
+            self._manifest['dimension'] = int(vectors.shape[1])
+            self._open(self._manifest)
+
+        # Events first, so a row is never visible in the mapping without its event
+        self.events.append(events)
+        rows = self.vectors.add(vectors)
+        self.vectors.flush()
+        self._commit(rows=len(self.vectors), log_bytes=self.events.log_bytes)
+        return rows
+
+    def delete(self, rows: List[int]) -> None:
+        """
+        Record rows as deleted; their data stays on disk until compact()
+        """
+        self._check_writable()
+        rows = [row for row in rows if row not in self.deleted]
+        if not rows:
+            return
+        with open(self._path('deleted', 'i64'), 'ab') as handle:
+            handle.write(np.asarray(rows, dtype=np.int64).tobytes())
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.deleted.update(rows)
+        self._commit(deleted=len(self.deleted))
+
+    def needs_compaction(self, ratio: float = 0.25) -> bool:
+        return len(self) > 0 and len(self.deleted) / len(self) >= ratio
+
+    def compact(self) -> np.ndarray:
+        """
+        Rewrite live rows into a new generation and drop deleted ones
+
+        Returns:
+            Old row numbers of the surviving rows; new row i was live[i]
+        """
+        self._check_writable()
+        if self.vectors is None:
+            return np.empty(0, dtype=np.int64)
+
+        old_generation = self.generation
+        live = np.setdiff1d(
+            np.arange(len(self), dtype=np.int64),
+            np.fromiter(self.deleted, dtype=np.int64)
+        )
+        new_generation = old_generation + 1
+        manifest = {**self._manifest, 'generation': new_generation}
+
+        vectors = MappedVectorStore(
+            self._path('vectors', 'f32', new_generation),
+            self.dimension,
+            size=0
+        )
+        for start in range(0, len(live), 65_536):
+            vectors.add(self.vectors.vectors[live[start:start + 65_536]])
+        vectors.flush()
+
+        offsets = []
+        log_bytes = 0
+        with open(self._path('events', 'log', new_generation), 'wb') as handle:
+            for row in live:
+                data = self.events.read_raw(int(row))
+                offsets.append(log_bytes)
+                handle.write(data)
+                log_bytes += len(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        with open(self._path('events', 'idx', new_generation), 'wb') as handle:
+            handle.write(np.asarray(offsets, dtype=np.int64).tobytes())
+            handle.flush()
+            os.fsync(handle.fileno())
+        open(self._path('deleted', 'i64', new_generation), 'wb').close()
+        del vectors
+
+        manifest.update(rows=len(live), log_bytes=log_bytes, deleted=0)
+        self.events.close()
+        self._write_manifest(manifest)
+        self._open(manifest)
+        for kind, suffix in (('vectors', 'f32'), ('events', 'log'), ('events', 'idx'),
+                             ('deleted', 'i64'), ('index', 'npz'), ('metadata', 'npz')):
+            path = self._path(kind, suffix, old_generation)
+            if os.path.exists(path):
+                os.remove(path)
+        return live
+
+    def refresh(self) -> bool:
+        """
+        Pick up commits made by the writer process
+
+        Returns:
+            True if the store changed
+        """
+        manifest = self._read_manifest()
+        if manifest == self._manifest:
+            return False
+        if manifest.get('generation', 0) != self.generation or self.vectors is None:
+            if self.events is not None:
+                self.events.close()
+            self._open(manifest)
+            return True
+
+        self.vectors.resize(manifest['rows'])
+        self.events.resize(manifest['rows'], manifest['log_bytes'])
+        self._load_deleted(manifest.get('deleted', 0))
+        self._manifest = manifest
+        return True
+
+    def index_path(self, kind: str = 'index') -> str:
+        """
+        File for a saved index of the current generation (row numbers are per generation)
+
+        Args:
+            kind: 'index' for the ANN index, 'metadata' for the metadata index
+        """
+        return self._path(kind, 'npz')
+
+    def close(self) -> None:
+        if self.events is not None:
+            self.events.close()
+        if self._lock_handle is not None:
+            self._lock_handle.close()
+            self._lock_handle = None
+
+    def _open(self, manifest: Dict[str, Any]) -> None:
+        self._manifest = dict(manifest)
+        self.deleted = set()
+        if not self.readonly:
+            # Drop deletions recorded after the last commit, like EventLog does for events
+            with open(self._path('deleted', 'i64'), 'ab') as handle:
+                handle.truncate(manifest.get('deleted', 0) * 8)
+        dimension = manifest.get('dimension')
+        if dimension is None:
+            self.vectors = self.events = None
+            return
+
+        rows = manifest.get('rows', 0)
+        self.vectors = MappedVectorStore(
+            self._path('vectors', 'f32'),
+            dimension,
+            size=rows,
+            readonly=self.readonly
+        )
+        if not self.readonly:
+            open(self._path('events', 'log'), 'ab').close()
+            open(self._path('events', 'idx'), 'ab').close()
+        self.events = EventLog(
+            self._path('events', 'log'),
+            self._path('events', 'idx'),
+            rows,
+            manifest.get('log_bytes', 0),
+            readonly=self.readonly
+        )
+        self._load_deleted(manifest.get('deleted', 0))
+
+    def _load_deleted(self, count: int) -> None:
+        path = self._path('deleted', 'i64')
+        if count and os.path.exists(path):
+            self.deleted = set(np.fromfile(path, dtype=np.int64, count=count).tolist())
+        else:
+            self.deleted = set()
+
+    def _commit(self, **changes: Any) -> None:
+        manifest = {**self._manifest, **changes}
+        self._write_manifest(manifest)
+        self._manifest = manifest
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.directory, MANIFEST_NAME), encoding='utf-8') as handle:
+                manifest = json.load(handle)
+        except FileNotFoundError:
+            return {'version': FORMAT_VERSION, 'generation': 0, 'rows': 0, 'log_bytes': 0}
+        if manifest.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported storage format version {manifest.get('version')}")
+        return manifest
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            json.dump(manifest, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+        # Make the rename itself durable
+        _fsync_path(self.directory)
+
+    def _path(self, kind: str, suffix: str, generation: Optional[int] = None) -> str:
+        generation = self.generation if generation is None else generation
+        return os.path.join(self.directory, f'{kind}.{generation}.{suffix}')
+
+    def _check_writable(self) -> None:
+        if self.readonly:
+            raise PermissionError('Event store is open read-only')
@@ -0,0 +1,3 @@
+from .adaptive import RapidAdaptiveLearningSystem
+
+__all__ = ['RapidAdaptiveLearningSystem']
@@ -0,0 +1,518 @@
+import os
+import tempfile
+import threading
+import uuid
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, Any, Optional, List, Sequence, Set, Tuple
+
+import numpy as np
+
+from ..ann import IVFIndex
+from ..batching import MicroBatchingEmbedder
+from ..embedding import SentenceTransformerEmbedder
+from ..embedding_cache import CachedEmbedder, EmbeddingCache
+from ..ingestion import IngestionPipeline
+from ..metadata_index import MetadataIndex
+from ..persistence import EventLog, MappedVectorStore, PersistentEventStore
+from ..quantization import QUANTIZATION_MODES, QuantizedIndex
+from ..vector_store import NumPyVectorStore
+
+class LocalVectorBackend:
+    """
+    In-process learning event storage on a NumPy vector store
+
+    Events live in a Python list whose positions match the store's rows.
+    With index_type='ivf' queries go through an IVFIndex instead of a
+    brute-force scan once the corpus is large enough to train it.
+    index_type='int8' or 'binary' scans compressed codes (QuantizedIndex)
+    and keeps the float32 vectors in a memory-mapped temporary file, so
+    only the codes and the rescored rows occupy memory.
+    Metadata filters are resolved through an inverted MetadataIndex that
+    is updated on every add; rows it has not seen (those committed by
+    another process, or after a saved index) are caught up on the next
+    filtered query.
+
+    With storage_dir set, events and vectors are kept in a
+    PersistentEventStore instead: the vectors are memory-mapped and events
+    are read from the log on demand, so reopening is near-instant and
+    read-only instances in other processes share the same pages. A trained
+    IVF index and the metadata index are saved next to the store on close
+    and reloaded on open; compaction carries the metadata index over.
+    """
+
+    INDEX_TYPES = ('flat', 'ivf') + QUANTIZATION_MODES
+
+    def __init__(
+        self,
+        index_type: str = 'flat',
+        index_options: Optional[Dict[str, Any]] = None,
+        storage_dir: Optional[str] = None,
+        readonly: bool = False,
+        compaction_ratio: float = 0.25
+    ):
+        if index_type not in self.INDEX_TYPES:
+            raise ValueError(f'index_type must be one of {self.INDEX_TYPES}, got {index_type!r}')
+        self.index_type = index_type
+        self.index_options = dict(index_options or {})
+        self.compaction_ratio = compaction_ratio
+        self.store: Optional[NumPyVectorStore] = None
+        self.index: Any = None
+        self._spill_dir: Optional[tempfile.TemporaryDirectory] = None
+        self.events: Sequence[Dict[str, Any]] = []
+        self.storage: Optional[PersistentEventStore] = None
+        self.metadata_index = MetadataIndex()
+        self._deleted: Set[int] = set()
+        # Event id -> row of live events, built on the first forget() after (re)attaching
+        self._rows_by_id: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+
+        if storage_dir:
+            self.storage = PersistentEventStore(storage_dir, readonly=readonly)
+            self._attach_storage()
+
+    @property
+    def deleted(self) -> Set[int]:
+        return self.storage.deleted if self.storage is not None else self._deleted
+
+    def add(self, events: List[Dict[str, Any]], vectors: np.ndarray) -> None:
+        with self._lock:
+            if self.storage is not None:
+                rows = self.storage.append(events, vectors)
+                if self.store is None:
+                    self._attach_storage()
+                elif self.index is not None:
+                    self.index.add(rows)
+            else:
+                if self.store is None:
+                    self.store = self._create_store(vectors.shape[1])
+                    self.index = self._create_index(self.store)
+                # Events first, so every row visible to a concurrent query has its event
+                self.events.extend(events)
+                rows = self.store.add(vectors)
+                if self.index is not None:
+                    self.index.add(rows)
+            with self._index_lock:
+                # Skipped when behind; the next filtered query catches up instead
+                if len(rows) and len(self.metadata_index) == rows[0]:
+                    self.metadata_index.add(int(rows[0]), (event['metadata'] for event in events))
+            if self._rows_by_id is not None:
+                self._rows_by_id.update(
+                    (event['id'], int(row)) for event, row in zip(events, rows)
+                )
+
+    def forget(self, event_id: str) -> bool:
+        """
+        Delete an event; persistent storage is compacted once enough rows are deleted
+
+        Returns:
+            True if the event existed
+        """
+        with self._lock:
+            if self._rows_by_id is None:
+                deleted = self.deleted
+                self._rows_by_id = {
+                    event['id']: row
+                    for row, event in enumerate(_iter_rows(self.events, 0, len(self.events)))
+                    if row not in deleted
+                }
+            row = self._rows_by_id.pop(event_id, None)
+            if row is None:
+                return False
+
+            if self.storage is None:
+                self._deleted.add(row)
+                return True
+
+            self.storage.delete([row])
+            if self.storage.needs_compaction(self.compaction_ratio):
+                rows_by_id, metadata_index = self._rows_by_id, self.metadata_index
+                live = self.storage.compact()
+                self._attach_storage()
+                with self._index_lock:
+                    self.metadata_index = metadata_index.remap(live)
+                # Surviving rows keep their order, so new row numbers are ranks in `live`
+                new_rows = np.searchsorted(live, np.fromiter(rows_by_id.values(), np.int64))
+                self._rows_by_id = dict(zip(rows_by_id, new_rows.tolist()))
+            return True
+
+    def query(
+        self,
+        vector: np.ndarray,
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        if self.storage is not None and self.storage.readonly:
+            self._refresh()
+
+        with self._lock:
+            store, events, index = self.store, self.events, self.index
+            metadata_index = self.metadata_index
+            deleted = np.fromiter(self.deleted, dtype=np.int64, count=len(self.deleted))
+            # Pin the log: forget() may compact and close this generation meanwhile
+            pinned = events if isinstance(events, EventLog) else None
+            if pinned is not None:
+                pinned.acquire()
+        try:
+            if store is None:
+                return []
+
+            size = len(store)
+            candidates = None
+            if filter_metadata:
+                with self._index_lock:
+                    indexed = len(metadata_index)
+                    if indexed < size:
+                        metadata_index.add(
+                            indexed,
+                            (event['metadata'] for event in _iter_rows(events, indexed, size))
+                        )
+                candidates = metadata_index.candidates(filter_metadata)
+                candidates = candidates[:np.searchsorted(candidates, size)]
+            if len(deleted):
+                if candidates is None:
+                    candidates = np.arange(size, dtype=np.int64)
+                candidates = np.setdiff1d(candidates, deleted, assume_unique=True)
+            if candidates is not None and not len(candidates):
+                return []
+
+            if index is not None:
+                rows, scores = index.search(vector, top_k, candidates)
+            else:
+                rows, scores = store.search(vector, top_k, candidates)
+            return [(events[row], float(score)) for row, score in zip(rows, scores)]
+        finally:
+            if pinned is not None:
+                pinned.release()
+
+    def close(self) -> None:
+        if self.storage is not None:
+            if not self.storage.readonly and isinstance(self.index, IVFIndex):
+                self.index.wait_for_training()
+                self.index.save(self.storage.index_path())
+            if not self.storage.readonly and len(self.metadata_index):
+                self.metadata_index.save(self.storage.index_path('metadata'))
+            self.storage.close()
+        if self._spill_dir is not None:
+            self.store = self.index = None
+            self._spill_dir.cleanup()
+            self._spill_dir = None
+
+    def index_stats(self) -> Dict[str, Any]:
+        """
+        Statistics of the active index (compression and measured recall when quantized)
+        """
+        if self.index is None or not hasattr(self.index, 'stats'):
+            return {'index_type': self.index_type, 'events': len(self)}
+        return {'index_type': self.index_type, 'events': len(self), **self.index.stats()}
+
+    def __len__(self) -> int:
+        return len(self.events) - len(self.deleted)
+
+    def _attach_storage(self) -> None:
+        # (Re)bind to the storage's current generation; row numbers may have changed
+        self.store = self.storage.vectors
+        self.events = self.storage.events if self.storage.events is not None else []
+        self.metadata_index = MetadataIndex()
+        self._rows_by_id = None
+        self.index = None
+        if self.store is not None:
+            saved = MetadataIndex.load(self.storage.index_path('metadata'), len(self.store))
+            if saved is not None:
+                self.metadata_index = saved
+            self.index = self._create_index(self.store)
+            if self.index is not None:
+                # A saved IVF index only needs the rows committed after it was written
+                indexed = self.index.load(self.storage.index_path()) \
+                    if isinstance(self.index, IVFIndex) else 0
+                self.index.add(np.arange(indexed, len(self.store)))
+
+    def _create_store(self, dimension: int) -> NumPyVectorStore:
+        if self.index_type not in QUANTIZATION_MODES:
+            return NumPyVectorStore(dimension)
+        # Quantized search only reads float32 rows to rescore; keep them off the heap
+        self._spill_dir = tempfile.TemporaryDirectory(prefix='learning-vectors-')
+        return MappedVectorStore(os.path.join(self._spill_dir.name, 'vectors.f32'), dimension)
+
+    def _create_index(self, store: NumPyVectorStore) -> Any:
+        if self.index_type == 'ivf':
+            return IVFIndex(store, **self.index_options)
+        if self.index_type in QUANTIZATION_MODES:
+            return QuantizedIndex(store, mode=self.index_type, **self.index_options)
+        return None
+
+    def _refresh(self) -> None:
+        with self._lock:
+            generation, rows = self.storage.generation, len(self.storage)
+            if not self.storage.refresh():
+                return
+            if self.storage.generation != generation or self.store is None:
+                self._attach_storage()
+            elif self.index is not None:
+                self.index.add(np.arange(rows, len(self.storage)))
+
+class PineconeVectorBackend:
+    """
+    Learning event storage in a Pinecone index
+
+    Requires the optional pinecone client; every add and query is a network round-trip.
+    """
+
+    def __init__(self, api_key: str, index_name: str):
+        try:
+            from pinecone import Pinecone
+        except ImportError as e:
+            raise ImportError('The Pinecone backend requires the pinecone-client package') from e
+        self.index = Pinecone(api_key=api_key).Index(index_name)
+
+    def add(self, events: List[Dict[str, Any]], vectors: np.ndarray) -> None:
+        self.index.upsert(vectors=[
+            {
+                'id': event['id'],
+                'values': vector.tolist(),
+                'metadata': {
+                    **event['metadata'],
+                    '_content': event['content'],
+                    '_feedback_type': event['feedback_type'],
+                    '_timestamp': event['timestamp']
+                }
+            } for event, vector in zip(events, vectors)
+        ])
+
+    def query(
+        self,
+        vector: np.ndarray,
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        response = self.index.query(
+            vector=vector.tolist(),
+            top_k=top_k,
+            filter={key: {'$eq': value} for key, value in (filter_metadata or {}).items()} or None,
+            include_metadata=True
+        )
+        results = []
+        for match in response['matches']:
+            metadata = dict(match['metadata'] or {})
+            event = {
+                'id': match['id'],
+                'content': metadata.pop('_content', ''),
+                'feedback_type': metadata.pop('_feedback_type', None),
+                'timestamp': metadata.pop('_timestamp', None),
+                'metadata': metadata
+            }
+            results.append((event, float(match['score'])))
+        return results
+
+    def forget(self, event_id: str) -> bool:
+        self.index.delete(ids=[event_id])
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def index_stats(self) -> Dict[str, Any]:
+        return {'index_type': 'pinecone'}
+
+def _iter_rows(events: Sequence[Dict[str, Any]], start: int, stop: int):
+    if isinstance(events, EventLog):
+        return events.iter_range(start, stop)
+    return islice(events, start, stop)
+
+class RapidAdaptiveLearningSystem:
+    """
+    Records learning events and retrieves semantically similar ones
+
+    By default events are embedded locally and stored in an in-process
+    NumPy index, so recording and querying need no network. Passing a
+    Pinecone API key switches storage to a Pinecone index. For large local
+    corpora, index_type='ivf' trades a little recall for sublinear queries,
+    and index_type='int8' or 'binary' cuts vector memory 4x or 32x while
+    rescoring the top candidates at full precision.
+
+    Embeddings are cached by content hash, so repeated content is embedded
+    once. With batch_window set, concurrent record_learning_event calls are
+    embedded together in one forward pass.
+
+    Local events are kept in memory unless storage_dir is given, in which
+    case they persist across restarts (see PersistentEventStore). Other
+    processes can open the same directory with readonly=True.
+
+    With async_ingestion=True, record_learning_event only validates and
+    enqueues the event; a background worker embeds and stores it in
+    batches. Call flush() before querying when the new events must be visible.
+
+    Example:
+        learning_system = RapidAdaptiveLearningSystem()
+        learning_system.record_learning_event(
+            content="def process_data(input_params):",
+            metadata={'agent': 'ScribeAgent'},
+            feedback_type='code_generation'
+        )
+        learning_system.find_similar_events("data processing function", top_k=3)
+    """
+
+    def __init__(
+        self,
+        pinecone_api_key: Optional[str] = None,
+        embedder: Any = None,
+        index_name: str = 'project-overseer-learning',
+        index_type: str = 'flat',
+        index_options: Optional[Dict[str, Any]] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        batch_window: Optional[float] = None,
+        storage_dir: Optional[str] = None,
+        readonly: bool = False,
+        async_ingestion: bool = False,
+        ingestion_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize learning system
+
+        Args:
+            pinecone_api_key: Use a Pinecone index instead of local storage
+            embedder: Object with embed(texts) -> float32 array (defaults to sentence-transformers)
+            index_name: Pinecone index name
+            index_type: Local index: 'flat' (exact), 'ivf', 'int8' or 'binary'
+            index_options: Keyword arguments for IVFIndex or QuantizedIndex
+                (e.g. nprobe, or target_recall for the accuracy bound)
+            embedding_cache: Embedding cache (defaults to an in-memory LRU)
+            batch_window: Seconds to collect concurrent embeds into one batch (off when None)
+            storage_dir: Directory for persistent local storage (in-memory when None)
+            readonly: Open storage_dir as a reader of another process's store
+            async_ingestion: Record events through a background IngestionPipeline
+            ingestion_options: Keyword arguments for IngestionPipeline (max_queue, batch_size, ...)
+        """
+        if pinecone_api_key is not None and not isinstance(pinecone_api_key, str):
+            raise TypeError('pinecone_api_key must be a string')
+
+        embedder = embedder or SentenceTransformerEmbedder()
+        self._batcher: Optional[MicroBatchingEmbedder] = None
+        if batch_window is not None:
+            embedder = self._batcher = MicroBatchingEmbedder(embedder, max_wait=batch_window)
+        self.embedder = CachedEmbedder(embedder, embedding_cache)
+        if pinecone_api_key:
+            self.backend = PineconeVectorBackend(pinecone_api_key, index_name)
+        else:
+            self.backend = LocalVectorBackend(
+                index_type,
+                index_options,
+                storage_dir=storage_dir,
+                readonly=readonly
+            )
+
+        self.ingestion: Optional[IngestionPipeline] = None
+        if async_ingestion:
+            self.ingestion = IngestionPipeline(
+                self.embedder,
+                self.backend,
+                **(ingestion_options or {})
+            )
+
+    def record_learning_event(
+        self,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        feedback_type: str = 'general'
+    ) -> str:
+        """
+        Embed and store a learning event
+
+        With async ingestion the event is validated and queued; it becomes
+        searchable once the background worker has written it (see flush()).
+
+        Returns:
+            Identifier of the recorded event
+        """
+        event = self._build_event(content, metadata, feedback_type)
+        if self.ingestion is not None:
+            return self.ingestion.submit(event)
+        vectors = self.embedder.embed([content])
+        self.backend.add([event], vectors)
+        return event['id']
+
+    def find_similar_events(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the recorded events most similar to a query
+
+        Args:
+            query: Text to compare against recorded content
+            top_k: Maximum number of results
+            filter_metadata: Only consider events whose metadata has these exact values
+
+        Returns:
+            Events (id, content, metadata, feedback_type, timestamp) with a
+            cosine 'similarity', most similar first
+        """
+        if not isinstance(query, str) or not query.strip():
+            raise ValueError('query must be a non-empty string')
+        if top_k <= 0:
+            return []
+
+        vector = self.embedder.embed([query])[0]
+        return [
+            {**event, 'similarity': score}
+            for event, score in self.backend.query(vector, top_k, filter_metadata)
+        ]
+
+    def forget_event(self, event_id: str) -> bool:
+        """
+        Delete a recorded event
+
+        Returns:
+            True if the event was deleted
+        """
+        return self.backend.forget(event_id)
+
+    def index_stats(self) -> Dict[str, Any]:
+        """
+        Report the local index configuration, compression and measured recall
+        """
+        return self.backend.index_stats()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every event recorded so far is stored and searchable
+
+        Returns:
+            False if the timeout expired first
+        """
+        if self.ingestion is None:
+            return True
+        return self.ingestion.flush(timeout)
+
+    def close(self) -> None:
+        """
+        Write pending events, then stop the batcher and release storage files
+        and the writer lock
+        """
+        if self.ingestion is not None:
+            self.ingestion.close()
+        if self._batcher is not None:
+            self._batcher.close()
+        self.backend.close()
+
+    def _build_event(
+        self,
+        content: str,
+        metadata: Optional[Dict[str, Any]],
+        feedback_type: str
+    ) -> Dict[str, Any]:
+        if not isinstance(content, str):
+            raise TypeError('content must be a string')
+        if not content.strip():
+            raise ValueError('content must not be empty')
+
+        return {
+            'id': uuid.uuid4().hex,
+            'content': content,
+            'metadata': dict(metadata or {}),
+            'feedback_type': feedback_type,
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        }
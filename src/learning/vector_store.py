@@ -0,0 +1,138 @@
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+class NumPyVectorStore:
+    """
+    In-process vector store on a contiguous float32 matrix
+
+    Rows are L2-normalized on insert, so cosine similarity is a single
+    matrix-vector product. Capacity grows geometrically, keeping inserts
+    amortized O(dimension). Top-k selection uses argpartition (O(n))
+    and only sorts the k winners.
+    """
+
+    def __init__(self, dimension: int, initial_capacity: int = 1024):
+        """
+        Initialize vector store
+
+        Args:
+            dimension: Embedding dimension
+            initial_capacity: Rows preallocated before the first resize
+        """
+        self.dimension = dimension
+        self._vectors = np.empty((max(initial_capacity, 1), dimension), dtype=np.float32)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """
+        View of the stored (normalized) vectors
+        """
+        return self._vectors[:self._size]
+
+    def add(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Append vectors
+
+        Args:
+            vectors: Array of shape (n, dimension) or (dimension,)
+
+        Returns:
+            Row indices assigned to the new vectors
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if vectors.shape[1] != self.dimension:
+            raise ValueError(
+                f'Expected vectors of dimension {self.dimension}, got {vectors.shape[1]}'
+            )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1.0)
+
+        with self._lock:
+            start = self._size
+            end = start + len(vectors)
+            if end > len(self._vectors):
+                self._grow(max(end, 2 * len(self._vectors)))
+            self._vectors[start:end] = vectors
+            self._size = end
+        return np.arange(start, end)
+
+    def _grow(self, capacity: int) -> None:
+        grown = np.empty((capacity, self.dimension), dtype=np.float32)
+        grown[:self._size] = self._vectors[:self._size]
+        self._vectors = grown
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        candidates: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the rows most similar to a query by cosine similarity
+
+        Args:
+            query: Query vector of shape (dimension,)
+            top_k: Number of results
+            candidates: Optional row indices to restrict the search to
+
+        Returns:
+            (row indices, similarities), best first
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        matrix = self.vectors
+        if candidates is not None:
+            candidates = np.asarray(candidates, dtype=np.int64)
+            if 3 * len(candidates) > len(matrix):
+                # Gathering most rows costs more than scoring all of them
+                scores = (matrix @ query)[candidates]
+            else:
+                scores = matrix[candidates] @ query
+        else:
+            scores = matrix @ query
+
+        k = min(top_k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        rows = candidates[top] if candidates is not None else top
+        return rows, scores[top]
+
+class RowIdList:
+    """
+    Growable int64 buffer of row ids (an inverted-list posting)
+    """
+
+    __slots__ = ('buffer', 'size')
+
+    def __init__(self, capacity: int = 64):
+        self.buffer = np.empty(capacity, dtype=np.int64)
+        self.size = 0
+
+    def extend(self, ids: np.ndarray) -> None:
+        end = self.size + len(ids)
+        if end > len(self.buffer):
+            grown = np.empty(max(end, 2 * len(self.buffer)), dtype=np.int64)
+            grown[:self.size] = self.buffer[:self.size]
+            self.buffer = grown
+        self.buffer[self.size:end] = ids
+        self.size = end
+
+    def view(self) -> np.ndarray:
+        return self.buffer[:self.size]
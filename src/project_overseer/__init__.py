@@ -0,0 +1,5 @@
+# The daemon is imported lazily (from .daemon import OverseerDaemon) so
+# the CLI client does not load the tool libraries
+from .client import OverseerClient, default_socket_path
+
+__all__ = ['OverseerClient', 'default_socket_path']
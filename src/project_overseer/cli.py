@@ -0,0 +1,151 @@
+"""
+project-overseer command line interface
+
+    project-overseer serve                      # start the daemon (foreground)
+    project-overseer run @GitHub list_repositories org_name=acme
+    project-overseer submit terraform.apply directory=/infra/prod --priority 5 --watch
+    project-overseer job <id> [--watch] | jobs | cancel <id>
+    project-overseer ping | stats | stop
+
+Everything except serve is a thin client: it forwards the command over
+the daemon's unix socket and prints the JSON result, so it never imports
+the GitHub, Docker or Terraform libraries itself.
+"""
+import argparse
+import json
+import logging
+import sys
+from typing import Dict, Any, Optional, List
+
+from .client import OverseerClient, default_socket_path
+
+def _print(result: Dict[str, Any]) -> int:
+    # Already plain JSON: the daemon encoded output handles with json_default
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+    return 0 if result.get('status') == 'success' else 1
+
+def _params(pairs: List[str]) -> Dict[str, Any]:
+    """
+    key=value pairs; values are parsed as JSON when possible (numbers, lists, objects)
+    """
+    params = {}
+    for pair in pairs:
+        key, separator, value = pair.partition('=')
+        if not separator:
+            raise SystemExit(f'Expected key=value, got {pair!r}')
+        try:
+            params[key] = json.loads(value)
+        except ValueError:
+            params[key] = value
+    return params
+
+def _watch(client: OverseerClient, job_id: str) -> int:
+    for event in client.watch_job(job_id):
+        data = event['data']
+        if event['kind'] == 'log':
+            print(data['line'])
+        elif event['kind'] == 'progress':
+            print(f"==> {data['message']}", file=sys.stderr)
+    response = client.job(job_id)
+    _print(response)
+    return 0 if response.get('job', {}).get('status') == 'succeeded' else 1
+
+def _serve(args: argparse.Namespace) -> int:
+    # Deferred: only the daemon pays for importing the tool libraries
+    from .daemon import OverseerDaemon, config_from_env, default_jobs_path
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+    daemon = OverseerDaemon(
+        socket_path=args.socket,
+        config=config_from_env(),
+        max_workers=args.workers,
+        auto_init=not args.no_auto_init,
+        job_database=args.jobs_db or default_jobs_path(),
+        job_workers=args.job_workers
+    )
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='project-overseer', description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument(
+        '--socket', default=None, help=f'Daemon socket (default {default_socket_path()})'
+    )
+    commands = parser.add_subparsers(dest='action', required=True)
+
+    serve = commands.add_parser('serve', help='Run the daemon in the foreground')
+    serve.add_argument('--workers', type=int, default=4, help='Worker threads per backend')
+    serve.add_argument(
+        '--no-auto-init', action='store_true',
+        help='Do not run terraform init before the first plan/apply/destroy of a workspace'
+    )
+    serve.add_argument('--jobs-db', default=None, help='SQLite job database')
+    serve.add_argument('--job-workers', type=int, default=2, help='Concurrent jobs')
+
+    run = commands.add_parser('run', help='Execute an agent command, e.g. @Docker list_images')
+    run.add_argument('message', nargs='+')
+    run.add_argument('--timeout', type=float, default=None, help='Seconds to wait for the result')
+
+    submit = commands.add_parser(
+        'submit', help='Queue a long-running job, e.g. terraform.apply directory=/infra'
+    )
+    submit.add_argument('kind')
+    submit.add_argument('params', nargs='*', help='key=value job parameters')
+    submit.add_argument('--priority', type=int, default=0)
+    submit.add_argument('--watch', action='store_true', help='Stream progress until it finishes')
+
+    job = commands.add_parser('job', help='Show a job')
+    job.add_argument('job_id')
+    job.add_argument('--watch', action='store_true', help='Stream progress until it finishes')
+
+    jobs = commands.add_parser('jobs', help='List recent jobs')
+    jobs.add_argument('--status', default=None)
+
+    cancel = commands.add_parser('cancel', help='Cancel a queued or running job')
+    cancel.add_argument('job_id')
+
+    commands.add_parser('ping', help='Check that the daemon is running')
+    commands.add_parser('stats', help='Show daemon, cache and per-tool latency statistics')
+    commands.add_parser('stop', help='Shut the daemon down')
+
+    args = parser.parse_args(argv)
+    if args.action == 'serve':
+        return _serve(args)
+
+    try:
+        with OverseerClient(args.socket) as client:
+            if args.action == 'run':
+                return _print(client.run(' '.join(args.message), timeout=args.timeout))
+            if args.action == 'submit':
+                response = client.submit_job(
+                    args.kind, _params(args.params), priority=args.priority
+                )
+                if not args.watch or response.get('status') != 'success':
+                    return _print(response)
+                print(response['job_id'], file=sys.stderr)
+                return _watch(client, response['job_id'])
+            if args.action == 'job':
+                return _watch(client, args.job_id) if args.watch else _print(
+                    client.job(args.job_id)
+                )
+            if args.action == 'jobs':
+                return _print(client.jobs(args.status))
+            if args.action == 'cancel':
+                return _print(client.cancel_job(args.job_id))
+            if args.action == 'ping':
+                return _print(client.ping())
+            if args.action == 'stats':
+                return _print(client.stats())
+            return _print(client.shutdown())
+    except ConnectionError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
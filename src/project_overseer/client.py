@@ -0,0 +1,158 @@
+import json
+import os
+import socket
+import tempfile
+import time
+from typing import Dict, Any, Optional, Iterator
+
+TERMINAL_JOB_STATUSES = ('succeeded', 'failed', 'cancelled')
+
+def default_socket_path() -> str:
+    """
+    Daemon socket path: $OVERSEER_SOCKET, else under $XDG_RUNTIME_DIR or the temp directory
+    """
+    if os.getenv('OVERSEER_SOCKET'):
+        return os.environ['OVERSEER_SOCKET']
+    runtime_dir = os.getenv('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'project-overseer.sock')
+    return os.path.join(tempfile.gettempdir(), f'project-overseer-{os.getuid()}', 'overseer.sock')
+
+class OverseerClient:
+    """
+    Thin client for the overseer daemon
+
+    Only uses the standard library, so importing it costs nothing beyond
+    the interpreter start. One connection is reused for every request.
+
+    Example:
+        with OverseerClient() as client:
+            client.run('@GitHub list_repositories org_name=acme')
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        Initialize client
+
+        Args:
+            socket_path: Daemon socket (defaults to default_socket_path())
+            timeout: Socket timeout in seconds (None waits for long-running commands)
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._reader = None
+
+    def request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send one protocol request and wait for its response
+
+        Raises:
+            ConnectionError: The daemon is not running or closed the connection
+        """
+        if self._socket is None:
+            self._connect()
+        self._socket.sendall(json.dumps(payload).encode('utf-8') + b'\n')
+        line = self._reader.readline()
+        if not line:
+            self.close()
+            raise ConnectionError('Overseer daemon closed the connection')
+        return json.loads(line)
+
+    def run(self, message: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Execute an agent command message, e.g. '@Terraform plan directory=/infra'
+        """
+        return self.request({'op': 'run', 'message': message, 'timeout': timeout})
+
+    def call(self, agent: str, command: str, **kwargs) -> Dict[str, Any]:
+        """
+        Execute a tool method with structured arguments
+        """
+        return self.request({'op': 'call', 'agent': agent, 'command': command, 'kwargs': kwargs})
+
+    def submit_job(
+        self,
+        kind: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue a long-running job, e.g. submit_job('terraform.apply', {'directory': '/infra'})
+
+        max_attempts defaults to the queue's per-kind default (see JobQueue.submit).
+        """
+        return self.request({
+            'op': 'submit',
+            'kind': kind,
+            'params': params or {},
+            'priority': priority,
+            'max_attempts': max_attempts
+        })
+
+    def job(self, job_id: str) -> Dict[str, Any]:
+        return self.request({'op': 'job', 'job_id': job_id})
+
+    def jobs(self, status: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+        return self.request({'op': 'jobs', 'status': status, 'limit': limit})
+
+    def cancel_job(self, job_id: str) -> Dict[str, Any]:
+        return self.request({'op': 'cancel', 'job_id': job_id})
+
+    def watch_job(
+        self,
+        job_id: str,
+        after: int = 0,
+        poll_interval: float = 0.5
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a job's progress events until it finishes
+        """
+        while True:
+            response = self.request({'op': 'events', 'job_id': job_id, 'after': after})
+            if response.get('status') != 'success':
+                raise RuntimeError(response.get('error_message'))
+            for event in response['events']:
+                after = event['seq']
+                yield event
+            if response['events']:
+                continue
+            if response['job_status'] in TERMINAL_JOB_STATUSES + (None,):
+                return
+            time.sleep(poll_interval)
+
+    def ping(self) -> Dict[str, Any]:
+        return self.request({'op': 'ping'})
+
+    def stats(self) -> Dict[str, Any]:
+        return self.request({'op': 'stats'})
+
+    def shutdown(self) -> Dict[str, Any]:
+        return self.request({'op': 'shutdown'})
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+        if self._socket is not None:
+            self._socket.close()
+        self._socket = self._reader = None
+
+    def __enter__(self) -> 'OverseerClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            sock.close()
+            raise ConnectionError(
+                f'No overseer daemon on {self.socket_path} (start one with: project-overseer serve)'
+            ) from e
+        self._socket = sock
+        self._reader = sock.makefile('rb')
@@ -0,0 +1,453 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import Dict, Any, Optional, Callable
+
+from agents.command_dispatcher import (
+    AgentCommandDispatcher,
+    CommandHandler,
+    positional_args_error
+)
+from agents.command_parser import AgentCommandParser
+from tools import github_tool, docker_tool, terraform_tool
+from tools.docker_tool import DockerTool
+from tools.github_tool import GitHubTool
+from tools.github_token_pool import GitHubTokenPool
+from tools.instrumentation import get_instrumentation
+from tools.job_queue import JobHandler, JobQueue, JobWorkerPool, default_job_handlers
+from tools.output_capture import json_default
+from tools.result_cache import ToolResultCache
+from tools.terraform_tool import TerraformTool
+from tools.transport import transport_stats
+from .client import default_socket_path
+
+logger = logging.getLogger(__name__)
+
+# Terraform actions that need an initialized working directory
+TERRAFORM_WORKSPACE_ACTIONS = frozenset({'plan', 'apply', 'destroy'})
+
+class WarmClients:
+    """
+    Long-lived tool instances shared by every request the daemon serves
+
+    GitHub clients are kept per token (the configured tokens and GitHub App
+    installations share one rotating GitHubTokenPool), Docker clients per socket and
+    Terraform tools per working directory. Each Terraform workspace is
+    initialized once (on first use, or by an explicit init) rather than
+    before every plan or apply.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self._lock = threading.Lock()
+        self._github: Dict[Optional[str], GitHubTool] = {}
+        self._docker: Dict[Optional[str], DockerTool] = {}
+        self._terraform: Dict[str, TerraformTool] = {}
+        self._workspace_locks: Dict[str, threading.Lock] = {}
+        self._initialized: Dict[str, float] = {}
+
+    def github(self, token: Optional[str] = None) -> GitHubTool:
+        with self._lock:
+            if token not in self._github:
+                self._github[token] = GitHubTool(github_token=token) if token else GitHubTool(
+                    pool=GitHubTokenPool.from_config(self.config)
+                )
+            return self._github[token]
+
+    def docker(self, docker_socket: Optional[str] = None) -> DockerTool:
+        docker_socket = docker_socket or self.config.get('docker_socket')
+        with self._lock:
+            if docker_socket not in self._docker:
+                self._docker[docker_socket] = DockerTool(docker_socket=docker_socket)
+            return self._docker[docker_socket]
+
+    def terraform(self, directory: Optional[str] = None) -> TerraformTool:
+        directory = os.path.abspath(directory or self.config.get('terraform_path') or os.getcwd())
+        with self._lock:
+            if directory not in self._terraform:
+                self._terraform[directory] = TerraformTool(terraform_dir=directory)
+                self._workspace_locks[directory] = threading.Lock()
+            return self._terraform[directory]
+
+    def ensure_initialized(self, directory: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Run terraform init for a workspace the first time it is used
+
+        Returns:
+            The failed init result, or None when the workspace is ready
+        """
+        tool = self.terraform(directory)
+        with self._workspace_locks[tool.default_dir]:
+            if tool.default_dir in self._initialized:
+                return None
+            result = tool.init()
+            if result.get('status') != 'success':
+                return result
+            self._initialized[tool.default_dir] = time.time()
+            return None
+
+    def mark_initialized(self, directory: Optional[str] = None) -> None:
+        self._initialized[self.terraform(directory).default_dir] = time.time()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'github_clients': len(self._github),
+                'github_quota': self._github[None].pool.stats() if None in self._github else {},
+                'docker_clients': len(self._docker),
+                'terraform_workspaces': sorted(self._terraform),
+                'initialized_workspaces': sorted(self._initialized)
+            }
+
+class OverseerDaemon:
+    """
+    Long-running tool server behind a local unix socket
+
+    Keeps tool clients, the command parser, the result cache and the
+    dispatcher's worker pools alive between commands, so a CLI call only
+    pays for one socket round trip plus the backend work itself.
+
+    Protocol: one JSON object per line in each direction. Requests carry
+    an 'op' ('run', 'call', 'ping', 'stats' or 'shutdown'); responses are
+    the tool's result dict. A connection may send any number of requests.
+
+    With a job_database, long-running operations (terraform.apply,
+    terraform.deploy, docker.build, ...) are submitted to a durable
+    JobQueue instead ('submit', 'job', 'jobs', 'events', 'cancel' ops)
+    and executed by a worker pool inside the daemon.
+
+    Example:
+        daemon = OverseerDaemon(config={'github_token': os.getenv('GITHUB_TOKEN')})
+        daemon.serve_forever()
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None,
+        max_workers: int = 4,
+        cache: Optional[ToolResultCache] = None,
+        backends: Optional[Dict[str, CommandHandler]] = None,
+        auto_init: bool = True,
+        job_database: Optional[str] = None,
+        job_workers: int = 2,
+        job_handlers: Optional[Dict[str, JobHandler]] = None
+    ):
+        """
+        Initialize daemon
+
+        Args:
+            socket_path: Unix socket to listen on (defaults to default_socket_path())
+            config: Toolkit-style configuration (github_token, docker_socket, terraform_path)
+            max_workers: Worker threads per backend
+            cache: Result cache shared by all clients (a fresh one by default)
+            backends: Handlers keyed by agent name (defaults to the warm tool handlers)
+            auto_init: Initialize Terraform workspaces before their first plan/apply/destroy
+            job_database: SQLite file for the durable job queue (None disables jobs)
+            job_workers: Jobs executed concurrently
+            job_handlers: Job handlers keyed by kind (defaults to default_job_handlers())
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.config = config or {}
+        self.cache = cache if cache is not None else ToolResultCache()
+        self.auto_init = auto_init
+        self.clients = WarmClients(self.config)
+        self.parser = AgentCommandParser()
+        self.dispatcher = AgentCommandDispatcher(
+            max_workers=max_workers,
+            backends=backends if backends is not None else {
+                'GitHub': self._github,
+                'Docker': self._docker,
+                'Terraform': self._terraform
+            }
+        )
+        self.jobs: Optional[JobQueue] = None
+        self.job_pool: Optional[JobWorkerPool] = None
+        if job_database:
+            self.jobs = JobQueue(job_database)
+            if job_handlers is None:
+                job_handlers = default_job_handlers(
+                    docker_client=lambda: self.clients.docker().client
+                )
+            self.job_pool = JobWorkerPool(self.jobs, job_handlers, workers=job_workers)
+        self.started = time.time()
+        self.requests = 0
+        self._server: Optional[socketserver.UnixStreamServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ops: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            'run': self._run,
+            'call': self._call,
+            'ping': lambda request: {'status': 'success', 'pid': os.getpid()},
+            'stats': lambda request: self.stats(),
+            'shutdown': self._shutdown,
+            'submit': self._submit_job,
+            'job': self._job,
+            'jobs': self._list_jobs,
+            'events': self._job_events,
+            'cancel': self._cancel_job
+        }
+
+    def start(self) -> None:
+        """
+        Bind the socket and serve requests on a background thread
+        """
+        server = self._bind()
+        self._thread = threading.Thread(
+            target=self._serve, args=(server,), name='overseer-daemon', daemon=True
+        )
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        """
+        Bind the socket and serve requests until a shutdown request or close()
+        """
+        self._serve(self._bind())
+
+    def close(self) -> None:
+        """
+        Stop serving, shut down worker pools and remove the socket file
+        """
+        server = self._server
+        if server is not None:
+            server.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _serve(self, server: socketserver.UnixStreamServer) -> None:
+        if self.job_pool is not None:
+            self.job_pool.start()
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self.dispatcher.shutdown(wait=False)
+            if self.job_pool is not None:
+                # Unfinished jobs keep their lease and are resumed by the next daemon
+                self.job_pool.stop(timeout=5)
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+            self._server = None
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute one protocol request
+        """
+        self.requests += 1
+        op = self._ops.get(request.get('op', 'run'))
+        if op is None:
+            return {
+                'status': 'error',
+                'error_message': f"Invalid op: {request.get('op')}"
+            }
+        try:
+            return op(request)
+        except Exception as e:
+            logger.exception('Overseer request failed')
+            return {
+                'status': 'error',
+                'error_message': str(e)
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        instrumentation = get_instrumentation()
+        return {
+            'status': 'success',
+            'pid': os.getpid(),
+            'uptime_seconds': time.time() - self.started,
+            'requests': self.requests,
+            'cache': self.cache.stats(),
+            'clients': self.clients.stats(),
+            'jobs': self.jobs.stats() if self.jobs is not None else None,
+            'tools': instrumentation.snapshot() if instrumentation is not None else {},
+            'events': instrumentation.events() if instrumentation is not None else {},
+            'transports': transport_stats()
+        }
+
+    def _bind(self) -> socketserver.UnixStreamServer:
+        if self._server is not None:
+            raise RuntimeError('Overseer daemon is already running')
+        _remove_stale_socket(self.socket_path)
+        os.makedirs(os.path.dirname(self.socket_path) or '.', mode=0o700, exist_ok=True)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                    except ValueError as e:
+                        response = {'status': 'error', 'error_message': f'Invalid request: {e}'}
+                    else:
+                        response = daemon.handle(request)
+                    encoded = json.dumps(response, default=json_default)
+                    self.wfile.write(encoded.encode('utf-8') + b'\n')
+                    self.wfile.flush()
+
+        # Owner-only socket: anyone who can connect can act with the daemon's credentials
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = _ThreadingUnixServer(self.socket_path, Handler)
+        finally:
+            os.umask(previous_umask)
+        logger.info('Overseer daemon listening on %s', self.socket_path)
+        return self._server
+
+    def _run(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        command = self.parser.parse(request.get('message', ''))
+        if command is None:
+            return {
+                'status': 'error',
+                'error_message': f"Not a command for a known agent: {request.get('message')!r}"
+            }
+        return self.dispatcher.dispatch(command).result(request.get('timeout'))
+
+    def _call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        command = {
+            'agent': request.get('agent'),
+            'command': request.get('command'),
+            'args': [],
+            'kwargs': request.get('kwargs') or {}
+        }
+        return self.dispatcher.dispatch(command).result(request.get('timeout'))
+
+    def _shutdown(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        # shutdown() blocks until the serve loop exits, so it cannot run on a handler thread
+        server = self._server
+        if server is not None:
+            threading.Thread(target=server.shutdown, daemon=True).start()
+        return {'status': 'success', 'pid': os.getpid()}
+
+    def _job_queue(self) -> JobQueue:
+        if self.jobs is None:
+            raise RuntimeError('Job queue is disabled (start the daemon with a job database)')
+        return self.jobs
+
+    def _submit_job(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        job_id = self._job_queue().submit(
+            request['kind'],
+            request.get('params') or {},
+            priority=request.get('priority', 0),
+            max_attempts=request.get('max_attempts')
+        )
+        return {'status': 'success', 'job_id': job_id}
+
+    def _job(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        job = self._job_queue().get(request['job_id'])
+        if job is None:
+            return {'status': 'error', 'error_message': f"Unknown job: {request['job_id']}"}
+        return {'status': 'success', 'job': job}
+
+    def _list_jobs(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        jobs = self._job_queue().list(request.get('status'), request.get('limit', 100))
+        return {'status': 'success', 'jobs': jobs}
+
+    def _job_events(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        queue = self._job_queue()
+        job = queue.get(request['job_id'])
+        events = queue.events(request['job_id'], request.get('after', 0))
+        return {
+            'status': 'success',
+            'events': events,
+            'job_status': job['status'] if job is not None else None
+        }
+
+    def _cancel_job(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if not self._job_queue().cancel(request['job_id']):
+            return {'status': 'error', 'error_message': 'Job not found or already finished'}
+        return {'status': 'success', 'job_id': request['job_id']}
+
+    def _github(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        error = positional_args_error(command)
+        if error is not None:
+            return error
+        kwargs = dict(command.get('kwargs', {}))
+        tool = self.clients.github(kwargs.pop('github_token', None))
+        return github_tool(command['command'], cache=self.cache, instance=tool, **kwargs)
+
+    def _docker(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        error = positional_args_error(command)
+        if error is not None:
+            return error
+        kwargs = command.get('kwargs', {})
+        tool = self.clients.docker(kwargs.get('docker_socket'))
+        return docker_tool(command['command'], cache=self.cache, instance=tool, **kwargs)
+
+    def _terraform(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        error = positional_args_error(command)
+        if error is not None:
+            return error
+        kwargs = command.get('kwargs', {})
+        directory = kwargs.get('directory')
+        tool = self.clients.terraform(directory)
+        if self.auto_init and command['command'] in TERRAFORM_WORKSPACE_ACTIONS:
+            failed = self.clients.ensure_initialized(directory)
+            if failed is not None:
+                return failed
+        result = terraform_tool(command['command'], cache=self.cache, instance=tool, **kwargs)
+        if command['command'] == 'init' and result.get('status') == 'success':
+            self.clients.mark_initialized(directory)
+        return result
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def _remove_stale_socket(path: str) -> None:
+    """
+    Remove a socket file left by a dead daemon; refuse to replace a live one
+    """
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f'An overseer daemon is already listening on {path}')
+
+def default_jobs_path() -> str:
+    """
+    Job database: $OVERSEER_STATE_DIR/jobs.sqlite3, else ~/.local/state/project-overseer
+    """
+    state_dir = os.getenv('OVERSEER_STATE_DIR') or os.path.join(
+        os.path.expanduser('~'), '.local', 'state', 'project-overseer'
+    )
+    return os.path.join(state_dir, 'jobs.sqlite3')
+
+def config_from_env() -> Dict[str, Any]:
+    """
+    Daemon configuration from the environment (same keys as AgentIntegrationToolkit)
+    """
+    config = {
+        'github_token': os.getenv('GITHUB_TOKEN'),
+        'github_tokens': [
+            token.strip() for token in os.getenv('GITHUB_TOKENS', '').split(',') if token.strip()
+        ],
+        'docker_socket': os.getenv('DOCKER_HOST'),
+        'terraform_path': os.getenv('TERRAFORM_PATH')
+    }
+    # GitHub App: GITHUB_APP_INSTALLATIONS is a comma-separated list of account=installation_id
+    if os.getenv('GITHUB_APP_ID') and os.getenv('GITHUB_APP_PRIVATE_KEY_PATH'):
+        with open(os.environ['GITHUB_APP_PRIVATE_KEY_PATH'], encoding='utf-8') as handle:
+            private_key = handle.read()
+        installations = dict(
+            pair.strip().split('=', 1)
+            for pair in os.getenv('GITHUB_APP_INSTALLATIONS', '').split(',') if '=' in pair
+        )
+        config['github_app'] = {
+            'app_id': int(os.environ['GITHUB_APP_ID']),
+            'private_key': private_key,
+            'installations': {account: int(value) for account, value in installations.items()}
+        }
+    return config
@@ -1,5 +1,39 @@
 from .github_tool import github_tool
 from .docker_tool import docker_tool
 from .terraform_tool import terraform_tool
+from .result_cache import ToolResultCache
+from .instrumentation import ToolInstrumentation, get_instrumentation, set_instrumentation
+from .job_queue import JobQueue, JobWorkerPool, default_job_handlers
+from .output_capture import CapturedOutput, json_default
+from .github_token_pool import GitHubQuotaExhausted, GitHubTokenPool
+from .transport import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    Transport,
+    configure_transport,
+    transport_stats
+)
 
-__all__ = ['github_tool', 'docker_tool', 'terraform_tool']
+__all__ = [
+    'github_tool',
+    'docker_tool',
+    'terraform_tool',
+    'ToolResultCache',
+    'ToolInstrumentation',
+    'get_instrumentation',
+    'set_instrumentation',
+    'JobQueue',
+    'JobWorkerPool',
+    'default_job_handlers',
+    'CapturedOutput',
+    'json_default',
+    'GitHubTokenPool',
+    'GitHubQuotaExhausted',
+    'Transport',
+    'RetryPolicy',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'configure_transport',
+    'transport_stats'
+]
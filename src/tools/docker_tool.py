@@ -1,14 +1,35 @@
 import os
 from typing import Dict, Any, Optional
 import docker
+import requests
 from docker.models.images import Image
 from docker.models.containers import Container
 
+from .instrumentation import backend_timer, instrumented_call
+from .result_cache import CachePolicy, ToolResultCache
+from .transport import CircuitOpenError, get_transport
+
+def docker_retryable(error: BaseException) -> bool:
+    """
+    Transient Docker failures: daemon 5xx and socket connection errors
+    """
+    if isinstance(error, docker.errors.APIError):
+        return error.is_server_error()
+    return isinstance(error, (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        ConnectionError
+    ))
+
 class DockerTool:
     """
     Comprehensive Docker management tool
     
     Provides atomic, tool-like operations for container and image management
+    
+    Daemon calls go through a transport per docker socket: reads are
+    retried with jittered backoff, builds and container changes are
+    attempted once, and all calls fail fast while its breaker is open.
     """
     
     def __init__(self, docker_socket: Optional[str] = None):
@@ -19,6 +40,7 @@ class DockerTool:
             docker_socket: Custom Docker socket path
         """
         self.client = docker.from_env() if not docker_socket else docker.DockerClient(base_url=docker_socket)
+        self.transport = get_transport(f"docker:{docker_socket or 'default'}", docker_retryable)
     
     def build_image(
         self, 
@@ -37,11 +59,12 @@ class DockerTool:
             )
         """
         try:
-            image, build_logs = self.client.images.build(
-                path=dockerfile_path,
-                tag=tag or 'latest',
-                buildargs=build_args or {}
-            )
+            with backend_timer('socket'):
+                image, build_logs = self.transport.call(lambda: self.client.images.build(
+                    path=dockerfile_path,
+                    tag=tag or 'latest',
+                    buildargs=build_args or {}
+                ), idempotent=False)
             
             return {
                 'status': 'success',
@@ -49,7 +72,7 @@ class DockerTool:
                 'image_tags': image.tags,
                 'build_logs': list(build_logs)
             }
-        except docker.errors.BuildError as e:
+        except (docker.errors.BuildError, CircuitOpenError) as e:
             return {
                 'status': 'error',
                 'error_message': str(e)
@@ -75,20 +98,21 @@ class DockerTool:
             )
         """
         try:
-            container = self.client.containers.run(
-                image=image,
-                command=command,
-                detach=detach,
-                ports=ports or {},
-                environment=environment or {}
-            )
+            with backend_timer('socket'):
+                container = self.transport.call(lambda: self.client.containers.run(
+                    image=image,
+                    command=command,
+                    detach=detach,
+                    ports=ports or {},
+                    environment=environment or {}
+                ), idempotent=False)
             
             return {
                 'status': 'success',
                 'container_id': container.id,
                 'container_name': container.name
             }
-        except docker.errors.ContainerError as e:
+        except (docker.errors.ContainerError, CircuitOpenError) as e:
             return {
                 'status': 'error',
                 'error_message': str(e)
@@ -102,7 +126,10 @@ class DockerTool:
             docker_tool.list_images(filter_options={'dangling': 'false'})
         """
         try:
-            images = self.client.images.list(filters=filter_options or {})
+            with backend_timer('socket'):
+                images = self.transport.call(
+                    lambda: self.client.images.list(filters=filter_options or {})
+                )
             
             return {
                 'status': 'success',
@@ -114,7 +141,7 @@ class DockerTool:
                     } for image in images
                 ]
             }
-        except docker.errors.APIError as e:
+        except (docker.errors.APIError, CircuitOpenError) as e:
             return {
                 'status': 'error',
                 'error_message': str(e)
@@ -128,8 +155,9 @@ class DockerTool:
             docker_tool.remove_container('container_id', force=True)
         """
         try:
-            container = self.client.containers.get(container_id)
-            container.remove(force=force)
+            with backend_timer('socket'):
+                container = self.transport.call(lambda: self.client.containers.get(container_id))
+                self.transport.call(lambda: container.remove(force=force), idempotent=False)
             
             return {
                 'status': 'success',
@@ -140,13 +168,27 @@ class DockerTool:
                 'status': 'error',
                 'error_message': f'Container {container_id} not found'
             }
-        except docker.errors.APIError as e:
+        except (docker.errors.APIError, CircuitOpenError) as e:
             return {
                 'status': 'error',
                 'error_message': str(e)
             }
 
-def docker_tool(method: str, **kwargs) -> Dict[str, Any]:
+# All calls against one daemon share a resource: builds and removals
+# change what list_images reports.
+CACHE_POLICY = CachePolicy(
+    namespace='docker',
+    ttls={'list_images': 10.0},
+    mutating=frozenset({'build_image', 'run_container', 'remove_container'}),
+    resource=lambda kwargs: kwargs.get('docker_socket') or 'default'
+)
+
+def docker_tool(
+    method: str,
+    cache: Optional[ToolResultCache] = None,
+    instance: Optional[DockerTool] = None,
+    **kwargs
+) -> Dict[str, Any]:
     """
     Unified interface for Docker tool operations
     
@@ -154,14 +196,14 @@ def docker_tool(method: str, **kwargs) -> Dict[str, Any]:
     docker_tool('build_image', dockerfile_path='./Dockerfile')
     docker_tool('run_container', image='my-app:latest')
     docker_tool('list_images')
+    docker_tool('list_images', cache=shared_cache)
+    docker_tool('list_images', instance=warm_tool)
     """
-    tool = DockerTool(docker_socket=kwargs.get('docker_socket'))
-    
     method_map = {
-        'build_image': tool.build_image,
-        'run_container': tool.run_container,
-        'list_images': tool.list_images,
-        'remove_container': tool.remove_container
+        'build_image': DockerTool.build_image,
+        'run_container': DockerTool.run_container,
+        'list_images': DockerTool.list_images,
+        'remove_container': DockerTool.remove_container
     }
     
     if method not in method_map:
@@ -170,4 +212,14 @@ def docker_tool(method: str, **kwargs) -> Dict[str, Any]:
             'error_message': f'Invalid method: {method}'
         }
     
-    return method_map[method](**{k: v for k, v in kwargs.items() if k != 'method'})
+    def execute() -> Dict[str, Any]:
+        tool = instance or DockerTool(docker_socket=kwargs.get('docker_socket'))
+        return method_map[method](
+            tool, **{k: v for k, v in kwargs.items() if k not in ('method', 'docker_socket')}
+        )
+    
+    if cache is None:
+        return instrumented_call('docker', method, execute)
+    return instrumented_call(
+        'docker', method, lambda: cache.call(CACHE_POLICY, method, kwargs, execute)
+    )
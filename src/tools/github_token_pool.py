@@ -0,0 +1,351 @@
+import threading
+import time
+from typing import Dict, Any, Optional, Callable, Iterable, List, TypeVar
+from github import Auth, Github, GithubException, GithubIntegration, RateLimitExceededException
+
+from .instrumentation import record_event
+
+T = TypeVar('T')
+
+# Quota assumed for a credential before its first response reports one
+DEFAULT_RATE_LIMIT = 5000
+
+class GitHubQuotaExhausted(LookupError):
+    """
+    Every credential that could serve a call has used up its rate-limit window
+
+    Attributes:
+        retry_after: Seconds until the earliest of those windows resets
+    """
+
+    def __init__(self, owner: Optional[str], retry_after: float):
+        super().__init__(
+            f'GitHub rate limit exhausted for every credential of {owner or "user"}; '
+            f'retry in {retry_after:.0f}s'
+        )
+        self.retry_after = retry_after
+
+class GitHubCredential:
+    """
+    One GitHub identity in a pool and its last observed rate-limit window
+
+    Attributes:
+        name: Label used in stats and metrics (never the token itself)
+        owner: Account an installation token is scoped to (None for personal tokens)
+        remaining: Requests left in the current window (None until observed)
+        limit: Window size (None until observed)
+        reset_at: Epoch seconds at which the window resets
+        expires_at: Epoch seconds at which an installation token expires
+    """
+
+    def __init__(
+        self,
+        name: str,
+        client: Optional[Github] = None,
+        owner: Optional[str] = None,
+        installation_id: Optional[int] = None
+    ):
+        self.name = name
+        self.client = client
+        self.owner = owner.lower() if owner else None
+        self.installation_id = installation_id
+        self.remaining: Optional[int] = None
+        self.limit: Optional[int] = None
+        self.reset_at = 0.0
+        self.expires_at: Optional[float] = None
+        self.refresh_lock = threading.Lock()
+
+    def headroom(self, now: float) -> int:
+        """
+        Requests this credential can still make, assuming a reset once reset_at has passed
+        """
+        if self.remaining is None or (self.reset_at and now >= self.reset_at):
+            return self.limit or DEFAULT_RATE_LIMIT
+        return self.remaining
+
+    def serves(self, owner: Optional[str]) -> bool:
+        """
+        Personal tokens serve every account; installation tokens only their own
+        """
+        return self.owner is None or (owner is not None and owner.lower() == self.owner)
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        return {
+            'owner': self.owner,
+            'remaining': self.remaining,
+            'limit': self.limit,
+            'headroom': self.headroom(now),
+            'reset_in': max(self.reset_at - now, 0.0) if self.reset_at else None,
+            'expires_in': self.expires_at - now if self.expires_at is not None else None
+        }
+
+class GitHubTokenPool:
+    """
+    Rotates GitHub calls across several credentials by remaining quota
+
+    Each personal token and each GitHub App installation has its own
+    rate-limit window, so spreading calls across N credentials gives
+    roughly N times the hourly budget. Every call goes to the eligible
+    credential with the most headroom, as last reported by the
+    X-RateLimit-* headers of its responses (a request is reserved up
+    front so concurrent calls spread out). A credential that hits its
+    primary or a secondary rate limit is parked until its window resets
+    (or for Retry-After) and the call is retried on the next one. Once
+    every eligible credential is parked, calls fail fast with
+    GitHubQuotaExhausted instead of spending a request that is certain
+    to be rejected.
+
+    Installation tokens are only used for repositories of the account
+    they are installed on. They are fetched on first use, cached, and
+    refreshed refresh_margin seconds before they expire.
+
+    Example:
+        pool = GitHubTokenPool(
+            tokens=[os.environ['GITHUB_TOKEN_A'], os.environ['GITHUB_TOKEN_B']],
+            app_id=1234, private_key=key_pem, installations={'acme': 5678}
+        )
+        repo = pool.call(lambda client: client.get_repo('acme/infra'), owner='acme')
+    """
+
+    def __init__(
+        self,
+        tokens: Iterable[str] = (),
+        app_id: Optional[int] = None,
+        private_key: Optional[str] = None,
+        installations: Optional[Dict[str, int]] = None,
+        refresh_margin: float = 300.0,
+        integration: Optional[GithubIntegration] = None,
+        client_factory: Optional[Callable[[Optional[str]], Github]] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize token pool
+
+        Args:
+            tokens: Personal access tokens
+            app_id: GitHub App id (with private_key, enables installation tokens)
+            private_key: GitHub App private key (PEM)
+            installations: Installation ids keyed by the account they are installed on
+            refresh_margin: Seconds before expiry at which installation tokens are renewed
+            integration: Preconfigured GithubIntegration (instead of app_id/private_key)
+            client_factory: Builds a client for a token (None for anonymous access)
+            clock: Wall-clock time source (rate-limit resets are epoch seconds)
+        """
+        self.refresh_margin = refresh_margin
+        self.clock = clock
+        self.client_factory = client_factory or _default_client
+        if integration is None and app_id is not None and private_key:
+            integration = GithubIntegration(auth=Auth.AppAuth(app_id, private_key))
+        self.integration = integration
+
+        self.credentials: List[GitHubCredential] = [
+            GitHubCredential(f'token-{index}', self.client_factory(token))
+            for index, token in enumerate(tokens)
+            if token
+        ]
+        if installations and self.integration is None:
+            raise ValueError('GitHub App installations need app_id and private_key')
+        for owner, installation_id in (installations or {}).items():
+            self.credentials.append(GitHubCredential(
+                f'installation:{owner}', owner=owner, installation_id=installation_id
+            ))
+        if not self.credentials:
+            # Unauthenticated access: 60 requests per hour, but calls still work
+            self.credentials.append(GitHubCredential('anonymous', self.client_factory(None)))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'GitHubTokenPool':
+        """
+        Build a pool from toolkit configuration
+
+        Reads github_token, github_tokens (a list) and github_app
+        ({'app_id', 'private_key', 'installations'}).
+        """
+        tokens = [config.get('github_token')] + list(config.get('github_tokens') or [])
+        app = config.get('github_app') or {}
+        return cls(
+            tokens=list(dict.fromkeys(token for token in tokens if token)),
+            app_id=app.get('app_id'),
+            private_key=app.get('private_key'),
+            installations=app.get('installations')
+        )
+
+    def acquire(
+        self,
+        owner: Optional[str] = None,
+        exclude: Iterable[GitHubCredential] = ()
+    ) -> GitHubCredential:
+        """
+        Reserve one request on the eligible credential with the most headroom
+
+        Args:
+            owner: Account the call touches (enables its installation token)
+            exclude: Credentials already tried for this call
+
+        Raises:
+            LookupError: No credential can serve the account
+            GitHubQuotaExhausted: Every credential that can has no requests left
+        """
+        now = self.clock()
+        with self._lock:
+            credential = self._best(owner, exclude, now)
+            headroom = credential.headroom(now)
+            if headroom <= 0:
+                candidates = [
+                    candidate for candidate in self.credentials
+                    if candidate.serves(owner) and candidate not in exclude
+                ]
+                retry_after = min(max(c.reset_at - now, 0.0) for c in candidates)
+                raise GitHubQuotaExhausted(owner, retry_after)
+            if credential.reset_at and now >= credential.reset_at:
+                credential.reset_at = 0.0
+            credential.remaining = headroom - 1
+        if credential.installation_id is not None:
+            self._ensure_installation_token(credential)
+        return credential
+
+    def client(self, owner: Optional[str] = None) -> Github:
+        """
+        Client of the eligible credential with the most headroom, without reserving a request
+
+        For ad-hoc use; prefer call(), which also observes quota and
+        rotates on rate limits.
+
+        Raises:
+            LookupError: No credential can serve the account
+        """
+        with self._lock:
+            credential = self._best(owner, (), self.clock())
+        if credential.installation_id is not None:
+            self._ensure_installation_token(credential)
+        return credential.client
+
+    def call(self, operation: Callable[[Github], T], owner: Optional[str] = None) -> T:
+        """
+        Run operation(client) on the best credential, rotating on rate limits
+
+        The operation should start from the client it is given (for
+        example client.get_repo(...)) so every request of the call uses
+        the same credential.
+        """
+        tried: List[GitHubCredential] = []
+        while True:
+            credential = self.acquire(owner, exclude=tried)
+            try:
+                result = operation(credential.client)
+            except GithubException as e:
+                self.observe(credential)
+                if not is_rate_limited(e):
+                    raise
+                self._park(credential, e)
+                tried.append(credential)
+                if not self._has_alternative(owner, tried):
+                    raise
+                record_event('github_pool', 'rotated')
+                continue
+            self.observe(credential)
+            return result
+
+    def observe(self, credential: GitHubCredential) -> None:
+        """
+        Update a credential's window from its client's last response headers
+        """
+        remaining, limit = credential.client.requester.rate_limiting
+        if limit < 0:
+            return
+        with self._lock:
+            credential.remaining = remaining
+            credential.limit = limit
+            credential.reset_at = float(credential.client.requester.rate_limiting_resettime)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Observed quota of every credential
+        """
+        now = self.clock()
+        with self._lock:
+            return {credential.name: credential.stats(now) for credential in self.credentials}
+
+    def headroom(self) -> int:
+        """
+        Aggregate requests left across all credentials
+        """
+        now = self.clock()
+        with self._lock:
+            return sum(credential.headroom(now) for credential in self.credentials)
+
+    def _best(
+        self,
+        owner: Optional[str],
+        exclude: Iterable[GitHubCredential],
+        now: float
+    ) -> GitHubCredential:
+        """
+        Eligible credential with the most headroom (called with self._lock held)
+        """
+        candidates = [
+            credential for credential in self.credentials
+            if credential.serves(owner) and credential not in exclude
+        ]
+        if not candidates:
+            raise LookupError(f'No GitHub credential available for {owner or "user"}')
+        return max(candidates, key=lambda candidate: candidate.headroom(now))
+
+    def _park(self, credential: GitHubCredential, error: GithubException) -> None:
+        """
+        Mark a rate-limited credential as exhausted until its window resets
+        """
+        headers = {key.lower(): value for key, value in (error.headers or {}).items()}
+        with self._lock:
+            credential.remaining = 0
+            if 'x-ratelimit-reset' in headers:
+                credential.reset_at = float(headers['x-ratelimit-reset'])
+            elif 'retry-after' in headers:
+                credential.reset_at = self.clock() + float(headers['retry-after'])
+            else:
+                credential.reset_at = self.clock() + 60
+        record_event('github_pool', 'exhausted')
+
+    def _has_alternative(self, owner: Optional[str], tried: List[GitHubCredential]) -> bool:
+        now = self.clock()
+        with self._lock:
+            return any(
+                credential.serves(owner) and credential not in tried
+                and credential.headroom(now) > 0
+                for credential in self.credentials
+            )
+
+    def _ensure_installation_token(self, credential: GitHubCredential) -> None:
+        """
+        Fetch or renew an installation token that expires within refresh_margin
+        """
+        with credential.refresh_lock:
+            if credential.client is not None and (
+                credential.expires_at - self.clock() > self.refresh_margin
+            ):
+                return
+            authorization = self.integration.get_access_token(credential.installation_id)
+            client = self.client_factory(authorization.token)
+            expires_at = authorization.expires_at.timestamp()
+            with self._lock:
+                credential.client = client
+                credential.expires_at = expires_at
+        record_event('github_pool', 'token_refreshed')
+
+def is_rate_limited(error: GithubException) -> bool:
+    """
+    Whether GitHub throttled the credential of a call
+
+    Covers the primary limit (quota used up) and secondary limits, which
+    ask the client to back off with Retry-After.
+    """
+    if isinstance(error, RateLimitExceededException):
+        return True
+    headers = {key.lower(): value for key, value in (error.headers or {}).items()}
+    return error.status in (403, 429) and (
+        headers.get('x-ratelimit-remaining') == '0' or 'retry-after' in headers
+    )
+
+def _default_client(token: Optional[str]) -> Github:
+    return Github(auth=Auth.Token(token)) if token else Github()
@@ -1,21 +1,76 @@
 from typing import Dict, Any, Optional
+import requests
 from github import Github, GithubException
 
+from .github_token_pool import GitHubTokenPool
+from .instrumentation import backend_timer, instrumented_call
+from .result_cache import CachePolicy, ToolResultCache
+from .transport import CircuitOpenError, get_transport
+
+def github_retryable(error: BaseException) -> bool:
+    """
+    Transient GitHub failures: 5xx and connection errors
+
+    Rate-limit responses (403/429) are not retried here: they come from a
+    healthy backend and concern one credential, so GitHubTokenPool parks
+    that credential and rotates instead.
+    """
+    if isinstance(error, GithubException):
+        return error.status is None or error.status >= 500
+    return isinstance(error, (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        ConnectionError,
+        TimeoutError
+    ))
+
+def github_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Seconds GitHub asked us to wait (Retry-After header), if any
+    """
+    headers = getattr(error, 'headers', None) or {}
+    value = headers.get('retry-after') or headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
 class GitHubTool:
     """
     Comprehensive GitHub interaction tool
     
     Provides atomic, tool-like operations for GitHub interactions
+    
+    API calls go through the shared 'github' transport: reads are retried
+    with jittered backoff, writes are attempted once, and all calls fail
+    fast while the circuit breaker is open.
+    
+    Each operation runs on the credential of a GitHubTokenPool with the
+    most remaining quota for the account it touches, moving to the next
+    credential when one is rate limited.
     """
     
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(
+        self, 
+        github_token: Optional[str] = None, 
+        pool: Optional[GitHubTokenPool] = None
+    ):
         """
         Initialize GitHub tool
         
         Args:
             github_token: GitHub Personal Access Token
+            pool: Token pool to rotate across (overrides github_token)
+        """
+        self.pool = pool or GitHubTokenPool(tokens=[github_token] if github_token else [])
+        self.transport = get_transport('github', github_retryable, github_retry_after)
+    
+    @property
+    def client(self) -> Github:
         """
-        self.client = Github(github_token) if github_token else Github()
+        Client of the credential with the most headroom (no request is reserved)
+        """
+        return self.pool.client()
     
     def create_pull_request(
         self, 
@@ -36,20 +91,24 @@ class GitHubTool:
                 title='Autonomous Agent Update'
             )
         """
-        try:
-            repo = self.client.get_repo(repo_name)
-            pr = repo.create_pull(
+        def create(client: Github):
+            repo = self.transport.call(lambda: client.get_repo(repo_name))
+            return self.transport.call(lambda: repo.create_pull(
                 title=title,
                 body=body,
                 head=head_branch,
                 base=base_branch
-            )
+            ), idempotent=False)
+        
+        try:
+            with backend_timer('network'):
+                pr = self.pool.call(create, owner=repo_name.split('/')[0])
             return {
                 'status': 'success',
                 'pr_number': pr.number,
                 'pr_url': pr.html_url
             }
-        except GithubException as e:
+        except (GithubException, CircuitOpenError, LookupError) as e:
             return {
                 'status': 'error',
                 'error_message': str(e)
@@ -71,16 +130,22 @@ class GitHubTool:
                 comment='Automated review complete'
             )
         """
+        def create(client: Github):
+            repo = self.transport.call(lambda: client.get_repo(repo_name))
+            issue = self.transport.call(lambda: repo.get_issue(issue_number))
+            return self.transport.call(
+                lambda: issue.create_comment(comment), idempotent=False
+            )
+        
         try:
-            repo = self.client.get_repo(repo_name)
-            issue = repo.get_issue(issue_number)
-            comment_obj = issue.create_comment(comment)
+            with backend_timer('network'):
+                comment_obj = self.pool.call(create, owner=repo_name.split('/')[0])
             
             return {
                 'status': 'success',
                 'comment_id': comment_obj.id
             }
-        except GithubException as e:
+        except (GithubException, CircuitOpenError, LookupError) as e:
             return {
                 'status': 'error',
                 'error_message': str(e)
@@ -102,28 +167,58 @@ class GitHubTool:
             github_tool.list_repositories(org_name='your-org')
         """
         try:
-            if org_name:
-                repos = self.client.get_organization(org_name).get_repos(type=type)
-            else:
-                repos = self.client.get_user().get_repos(type=type)
-            
-            return {
-                'status': 'success',
-                'repositories': [
+            # Repositories are paginated lazily, so the listing itself hits the network
+            def fetch(client: Github):
+                if org_name:
+                    repos = client.get_organization(org_name).get_repos(type=type)
+                else:
+                    repos = client.get_user().get_repos(type=type)
+                
+                return [
                     {
                         'name': repo.full_name,
                         'private': repo.private,
                         'url': repo.html_url
                     } for repo in repos
                 ]
+            
+            with backend_timer('network'):
+                repositories = self.pool.call(
+                    lambda client: self.transport.call(lambda: fetch(client)), owner=org_name
+                )
+            
+            return {
+                'status': 'success',
+                'repositories': repositories
             }
-        except GithubException as e:
+        except (GithubException, CircuitOpenError, LookupError) as e:
             return {
                 'status': 'error',
                 'error_message': str(e)
             }
 
-def github_tool(method: str, **kwargs) -> Dict[str, Any]:
+def _github_resource(kwargs: Dict[str, Any]) -> str:
+    """
+    Resolve the account (organization or user) a GitHub call touches
+    """
+    if kwargs.get('repo_name'):
+        return kwargs['repo_name'].split('/')[0]
+    return kwargs.get('org_name') or 'user'
+
+CACHE_POLICY = CachePolicy(
+    namespace='github',
+    ttls={'list_repositories': 30.0},
+    mutating=frozenset({'create_pull_request', 'add_comment'}),
+    resource=_github_resource,
+    credentials=frozenset({'github_token'})
+)
+
+def github_tool(
+    method: str,
+    cache: Optional[ToolResultCache] = None,
+    instance: Optional[GitHubTool] = None,
+    **kwargs
+) -> Dict[str, Any]:
     """
     Unified interface for GitHub tool operations
     
@@ -131,13 +226,13 @@ def github_tool(method: str, **kwargs) -> Dict[str, Any]:
     github_tool('create_pull_request', repo_name='...', ...)
     github_tool('add_comment', repo_name='...', ...)
     github_tool('list_repositories', org_name='...')
+    github_tool('list_repositories', org_name='...', cache=shared_cache)
+    github_tool('list_repositories', org_name='...', instance=warm_tool)
     """
-    tool = GitHubTool(github_token=kwargs.get('github_token'))
-    
     method_map = {
-        'create_pull_request': tool.create_pull_request,
-        'add_comment': tool.add_comment,
-        'list_repositories': tool.list_repositories
+        'create_pull_request': GitHubTool.create_pull_request,
+        'add_comment': GitHubTool.add_comment,
+        'list_repositories': GitHubTool.list_repositories
     }
     
     if method not in method_map:
@@ -146,4 +241,14 @@ def github_tool(method: str, **kwargs) -> Dict[str, Any]:
             'error_message': f'Invalid method: {method}'
         }
     
-    return method_map[method](**{k: v for k, v in kwargs.items() if k != 'method'})
+    def execute() -> Dict[str, Any]:
+        tool = instance or GitHubTool(github_token=kwargs.get('github_token'))
+        return method_map[method](
+            tool, **{k: v for k, v in kwargs.items() if k not in ('method', 'github_token')}
+        )
+    
+    if cache is None:
+        return instrumented_call('github', method, execute)
+    return instrumented_call(
+        'github', method, lambda: cache.call(CACHE_POLICY, method, kwargs, execute)
+    )
@@ -0,0 +1,437 @@
+import contextvars
+import functools
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Callable, Iterator, List, Tuple
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - optional dependency
+    otel_trace = None
+
+logger = logging.getLogger(__name__)
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of non-negative integer values
+
+    Values below 2**sub_bits are counted exactly; larger values fall into
+    2**(sub_bits - 1) buckets per power of two, bounding the relative error
+    at roughly 2**(1 - sub_bits) (about 6% for the default of 5 bits).
+    Buckets are stored sparsely, so memory grows with the value range seen.
+    """
+
+    def __init__(self, sub_bits: int = 5):
+        self.sub_bits = sub_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def record(self, value: int) -> None:
+        """
+        Count a single value
+        """
+        value = max(int(value), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> int:
+        """
+        Return the value at quantile q (0-100), accurate to the bucket resolution
+        """
+        if not self.count:
+            return 0
+        rank = max(1, int(round(q / 100.0 * self.count)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._midpoint(index), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return count, sum, min, max and common percentiles
+        """
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min or 0,
+            'max': self.max or 0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'p999': self.percentile(99.9)
+        }
+
+    def _index(self, value: int) -> int:
+        if value < (1 << self.sub_bits):
+            return value
+        shift = value.bit_length() - self.sub_bits
+        return (shift << (self.sub_bits - 1)) + (value >> shift)
+
+    def _midpoint(self, index: int) -> int:
+        if index < (1 << self.sub_bits):
+            return index
+        shift = (index >> (self.sub_bits - 1)) - 1
+        mantissa = index - (shift << (self.sub_bits - 1))
+        return (mantissa << shift) + (1 << shift) // 2
+
+class CallSpan:
+    """
+    Timing state for one in-flight tool call
+    """
+
+    __slots__ = (
+        'tool', 'method', 'start', 'start_ns', 'backend_seconds', 'backend_kind', 'retries'
+    )
+
+    def __init__(self, tool: str, method: str):
+        self.tool = tool
+        self.method = method
+        self.start_ns = time.time_ns()
+        self.start = time.perf_counter()
+        self.backend_seconds = 0.0
+        self.backend_kind: Optional[str] = None
+        self.retries = 0
+
+class MetricsSink:
+    """
+    Base class for instrumentation exporters
+    """
+
+    def export(self, record: Dict[str, Any], instrumentation: 'ToolInstrumentation') -> None:
+        """
+        Receive a completed call record
+        """
+
+    def flush(self, instrumentation: 'ToolInstrumentation') -> None:
+        """
+        Write any buffered state
+        """
+
+class PrometheusTextfileSink(MetricsSink):
+    """
+    Writes metrics in Prometheus text exposition format (node_exporter textfile collector)
+
+    The file is rewritten atomically at most once per interval.
+    """
+
+    def __init__(self, path: str, interval: float = 15.0):
+        self.path = path
+        self.interval = interval
+        self._last_write = 0.0
+
+    def export(self, record: Dict[str, Any], instrumentation: 'ToolInstrumentation') -> None:
+        now = time.monotonic()
+        if now - self._last_write >= self.interval:
+            self._last_write = now
+            self.flush(instrumentation)
+
+    def flush(self, instrumentation: 'ToolInstrumentation') -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.overseer-metrics-')
+        with os.fdopen(fd, 'w') as handle:
+            handle.write(render_prometheus(instrumentation.snapshot(), instrumentation.events()))
+        os.replace(tmp_path, self.path)
+
+class OpenTelemetrySink(MetricsSink):
+    """
+    Emits one OpenTelemetry span per tool call
+
+    Requires the optional opentelemetry-api package.
+    """
+
+    def __init__(self, tracer: Any = None):
+        if tracer is None:
+            if otel_trace is None:
+                raise ImportError('OpenTelemetrySink requires the opentelemetry-api package')
+            tracer = otel_trace.get_tracer('project-overseer.tools')
+        self.tracer = tracer
+
+    def export(self, record: Dict[str, Any], instrumentation: 'ToolInstrumentation') -> None:
+        span = self.tracer.start_span(
+            f"{record['tool']}.{record['method']}",
+            start_time=record['start_ns']
+        )
+        span.set_attributes({
+            'tool.name': record['tool'],
+            'tool.method': record['method'],
+            'tool.status': record['status'],
+            'tool.backend': record['backend'] or 'none',
+            'tool.backend_seconds': record['backend_seconds'],
+            'tool.retries': record['retries'],
+            'tool.payload_bytes': record['payload_bytes']
+        })
+        span.end(end_time=record['start_ns'] + int(record['wall_seconds'] * 1e9))
+
+class ToolInstrumentation:
+    """
+    Per-call latency and outcome metrics for tool dispatchers
+
+    Recorded per tool call:
+    - Wall time and backend (network, subprocess, socket) time in microsecond histograms
+    - Retries and result payload size
+    - Call counts by status
+
+    Also counts named events per scope, e.g. transport decisions per backend.
+
+    Example:
+        snapshot = get_instrumentation().snapshot()
+        snapshot['github.list_repositories']['wall_us']['p99']
+    """
+
+    def __init__(self, sinks: Optional[List[MetricsSink]] = None):
+        self.sinks: List[MetricsSink] = list(sinks or [])
+        self._lock = threading.Lock()
+        self._metrics: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._events: Dict[Tuple[str, str], int] = {}
+
+    def add_sink(self, sink: MetricsSink) -> None:
+        """
+        Register an exporter for completed call records
+        """
+        self.sinks.append(sink)
+
+    def record(self, span: CallSpan, status: str, payload_bytes: int = 0) -> Dict[str, Any]:
+        """
+        Complete a span and fold it into the histograms
+        """
+        wall_seconds = time.perf_counter() - span.start
+        record = {
+            'tool': span.tool,
+            'method': span.method,
+            'status': status,
+            'start_ns': span.start_ns,
+            'wall_seconds': wall_seconds,
+            'backend': span.backend_kind,
+            'backend_seconds': span.backend_seconds,
+            'retries': span.retries,
+            'payload_bytes': payload_bytes
+        }
+
+        with self._lock:
+            metrics = self._metrics.get((span.tool, span.method))
+            if metrics is None:
+                metrics = self._metrics[(span.tool, span.method)] = {
+                    'wall_us': LatencyHistogram(),
+                    'backend_us': LatencyHistogram(),
+                    'payload_bytes': LatencyHistogram(),
+                    'statuses': {},
+                    'retries': 0,
+                    'backend': span.backend_kind
+                }
+            metrics['wall_us'].record(wall_seconds * 1e6)
+            metrics['backend_us'].record(span.backend_seconds * 1e6)
+            metrics['payload_bytes'].record(payload_bytes)
+            metrics['statuses'][status] = metrics['statuses'].get(status, 0) + 1
+            metrics['retries'] += span.retries
+            metrics['backend'] = metrics['backend'] or span.backend_kind
+
+        for sink in self.sinks:
+            try:
+                sink.export(record, self)
+            except Exception:
+                logger.exception('Metrics sink %r failed', sink)
+        return record
+
+    def count_event(self, scope: str, event: str, count: int = 1) -> None:
+        """
+        Increment the counter of a named event, e.g. ('github', 'retry')
+        """
+        with self._lock:
+            self._events[(scope, event)] = self._events.get((scope, event), 0) + count
+
+    def events(self) -> Dict[str, int]:
+        """
+        Return event counters keyed by 'scope.event'
+        """
+        with self._lock:
+            return {f'{scope}.{event}': count for (scope, event), count in self._events.items()}
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return a point-in-time copy of all metrics keyed by 'tool.method'
+        """
+        with self._lock:
+            return {
+                f'{tool}.{method}': {
+                    'tool': tool,
+                    'method': method,
+                    'backend': metrics['backend'],
+                    'wall_us': metrics['wall_us'].summary(),
+                    'backend_us': metrics['backend_us'].summary(),
+                    'payload_bytes': metrics['payload_bytes'].summary(),
+                    'statuses': dict(metrics['statuses']),
+                    'retries': metrics['retries']
+                } for (tool, method), metrics in self._metrics.items()
+            }
+
+    def flush(self) -> None:
+        """
+        Ask every sink to write buffered state
+        """
+        for sink in self.sinks:
+            sink.flush(self)
+
+    def reset(self) -> None:
+        """
+        Discard all recorded metrics
+        """
+        with self._lock:
+            self._metrics.clear()
+            self._events.clear()
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar('tool_call_span', default=None)
+_instrumentation: Optional[ToolInstrumentation] = ToolInstrumentation()
+
+def get_instrumentation() -> Optional[ToolInstrumentation]:
+    """
+    Return the process-wide instrumentation (None when disabled)
+    """
+    return _instrumentation
+
+def set_instrumentation(instrumentation: Optional[ToolInstrumentation]) -> None:
+    """
+    Replace the process-wide instrumentation; pass None to disable it
+    """
+    global _instrumentation
+    _instrumentation = instrumentation
+
+@contextmanager
+def backend_timer(kind: str) -> Iterator[None]:
+    """
+    Attribute the enclosed block to backend time of the current tool call
+
+    Args:
+        kind: Backend category ('network', 'subprocess' or 'socket')
+    """
+    span = _current_span.get()
+    if span is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        span.backend_seconds += time.perf_counter() - start
+        span.backend_kind = kind
+
+def record_retry() -> None:
+    """
+    Count a retry against the current tool call
+    """
+    span = _current_span.get()
+    if span is not None:
+        span.retries += 1
+
+def record_event(scope: str, event: str) -> None:
+    """
+    Count a named event (e.g. a circuit breaker opening) when instrumentation is enabled
+    """
+    instrumentation = _instrumentation
+    if instrumentation is not None:
+        instrumentation.count_event(scope, event)
+
+def instrumented_call(tool: str, method: str, call: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Run a tool call inside a span and record its outcome
+    """
+    instrumentation = _instrumentation
+    if instrumentation is None:
+        return call()
+
+    span = CallSpan(tool, method)
+    token = _current_span.set(span)
+    try:
+        result = call()
+    except BaseException:
+        instrumentation.record(span, 'exception')
+        raise
+    finally:
+        _current_span.reset(token)
+
+    status = result.get('status', 'unknown') if isinstance(result, dict) else 'unknown'
+    instrumentation.record(span, status, payload_size(result))
+    return result
+
+def instrumented(tool: str) -> Callable:
+    """
+    Decorator instrumenting a method under its own name
+
+    Example:
+        @instrumented('toolkit')
+        def github_create_pr(self, ...): ...
+    """
+    def decorator(func: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return instrumented_call(tool, func.__name__, lambda: func(*args, **kwargs))
+        return wrapper
+    return decorator
+
+def payload_size(value: Any, depth: int = 2) -> int:
+    """
+    Cheaply estimate the serialized size of a result in bytes
+
+    Strings are measured exactly; containers are walked to a limited depth.
+    """
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if depth <= 0 or value is None:
+        return 0 if value is None else 8
+    if isinstance(value, dict):
+        return sum(len(str(k)) + payload_size(v, depth - 1) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(payload_size(item, depth - 1) for item in value)
+    return 8
+
+def render_prometheus(
+    snapshot: Dict[str, Dict[str, Any]],
+    events: Optional[Dict[str, int]] = None
+) -> str:
+    """
+    Render a snapshot (and optional event counters) in Prometheus text exposition format
+    """
+    lines = [
+        '# TYPE overseer_tool_calls_total counter',
+        '# TYPE overseer_events_total counter',
+        '# TYPE overseer_tool_retries_total counter',
+        '# TYPE overseer_tool_wall_seconds summary',
+        '# TYPE overseer_tool_backend_seconds summary',
+        '# TYPE overseer_tool_payload_bytes summary'
+    ]
+    for metrics in snapshot.values():
+        labels = f'tool="{metrics["tool"]}",method="{metrics["method"]}"'
+        for status, count in sorted(metrics['statuses'].items()):
+            lines.append(f'overseer_tool_calls_total{{{labels},status="{status}"}} {count}')
+        lines.append(f'overseer_tool_retries_total{{{labels}}} {metrics["retries"]}')
+
+        for name, key, scale in (
+            ('overseer_tool_wall_seconds', 'wall_us', 1e-6),
+            ('overseer_tool_backend_seconds', 'backend_us', 1e-6),
+            ('overseer_tool_payload_bytes', 'payload_bytes', 1)
+        ):
+            summary = metrics[key]
+            for quantile, field in (('0.5', 'p50'), ('0.9', 'p90'), ('0.99', 'p99')):
+                lines.append(
+                    f'{name}{{{labels},quantile="{quantile}"}} {summary[field] * scale:g}'
+                )
+            lines.append(f'{name}_sum{{{labels}}} {summary["sum"] * scale:g}')
+            lines.append(f'{name}_count{{{labels}}} {summary["count"]}')
+    for key, count in sorted((events or {}).items()):
+        scope, _, event = key.rpartition('.')
+        lines.append(f'overseer_events_total{{scope="{scope}",event="{event}"}} {count}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,823 @@
+import json
+import logging
+import os
+import signal
+import socket
+import sqlite3
+import subprocess
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, Any, Optional, Callable, Iterator, List, Tuple
+
+from .output_capture import CapturedOutput, json_default
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({'succeeded', 'failed', 'cancelled'})
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    resource TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, created_at);
+CREATE INDEX IF NOT EXISTS jobs_resource ON jobs (resource, status);
+CREATE TABLE IF NOT EXISTS job_events (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+'''
+
+def _terraform_resource(params: Dict[str, Any]) -> str:
+    directory = params.get('directory') or params.get('terraform_dir') or os.getcwd()
+    return 'terraform:' + os.path.abspath(directory)
+
+def _docker_resource(params: Dict[str, Any]) -> str:
+    return f"docker:{params.get('image_name')}:{params.get('tag', 'latest')}"
+
+# Resource each job kind locks: at most one running job per resource
+JOB_RESOURCES: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    'terraform.apply': _terraform_resource,
+    'terraform.destroy': _terraform_resource,
+    'terraform.deploy': _terraform_resource,
+    'docker.build': _docker_resource
+}
+
+# Kinds that change infrastructure: a run whose worker was lost may still be going,
+# so by default they are not retried
+SINGLE_ATTEMPT_KINDS = frozenset({'terraform.apply', 'terraform.destroy', 'terraform.deploy'})
+
+class JobQueue:
+    """
+    Durable, SQLite-backed queue for long-running infrastructure operations
+
+    Features:
+    - Jobs survive process restarts; status and progress can be queried
+      from any process that opens the same database
+    - Higher priority first, then submission order
+    - Per-resource locks: a job is only claimed while no other job on the
+      same resource (e.g. a Terraform stack) is running
+    - Leases: running jobs whose worker stopped heartbeating are requeued
+      (or failed once max_attempts is used up); the worker learns from its
+      next heartbeat that it lost the job and cancels it
+    - Progress events per job, readable incrementally or as a stream
+    - Spilled CapturedOutput values of a result are kept in
+      <path>.outputs/, so the paths recorded with the result stay readable
+
+    Example:
+        queue = JobQueue('/var/lib/overseer/jobs.sqlite3')
+        job_id = queue.submit('terraform.apply', {'directory': '/infra/prod'}, priority=10)
+        for event in queue.stream(job_id):
+            print(event['data'])
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 60.0):
+        """
+        Initialize job queue
+
+        Args:
+            path: SQLite database file (created if missing)
+            lease_seconds: Heartbeat age after which a running job counts as abandoned
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        self._changed = threading.Condition()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # executescript() commits on its own, so it runs outside _transaction()
+        self._db().executescript(_SCHEMA)
+
+    def submit(
+        self,
+        kind: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = 0,
+        resource: Optional[str] = None,
+        max_attempts: Optional[int] = None
+    ) -> str:
+        """
+        Enqueue a job
+
+        Args:
+            kind: Handler name, e.g. 'terraform.apply'
+            params: JSON-serializable handler arguments
+            priority: Larger runs first
+            resource: Lock name (defaults to JOB_RESOURCES[kind](params), if any)
+            max_attempts: Runs allowed before an abandoned job is failed
+                (defaults to 1 for SINGLE_ATTEMPT_KINDS, otherwise 3)
+
+        Returns:
+            The job id
+        """
+        params = params or {}
+        if max_attempts is None:
+            max_attempts = 1 if kind in SINGLE_ATTEMPT_KINDS else 3
+        if resource is None and kind in JOB_RESOURCES:
+            resource = JOB_RESOURCES[kind](params)
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                'INSERT INTO jobs (id, kind, params, resource, priority, status, max_attempts, '
+                'created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (job_id, kind, json.dumps(params), resource, priority, 'queued', max_attempts, now)
+            )
+            self._append(db, job_id, [('status', {'status': 'queued'}, now)])
+        self.notify()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Current state of a job, or None if it does not exist
+        """
+        row = self._db().execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return _job_dict(row) if row is not None else None
+
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Most recent jobs, optionally filtered by status
+        """
+        if status is None:
+            rows = self._db().execute(
+                'SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?', (limit,)
+            )
+        else:
+            rows = self._db().execute(
+                'SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?',
+                (status, limit)
+            )
+        return [_job_dict(row) for row in rows]
+
+    def events(self, job_id: str, after: int = 0, limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Progress events with a sequence number greater than after
+        """
+        rows = self._db().execute(
+            'SELECT seq, created_at, kind, data FROM job_events '
+            'WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?',
+            (job_id, after, limit)
+        )
+        return [
+            {'seq': seq, 'time': created_at, 'kind': kind, 'data': json.loads(data)}
+            for seq, created_at, kind, data in rows
+        ]
+
+    def stream(
+        self,
+        job_id: str,
+        after: int = 0,
+        poll_interval: float = 0.25,
+        timeout: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a job's events as they are written, until it finishes
+
+        Workers in this process wake the stream immediately; events written
+        by other processes are picked up every poll_interval.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            batch = self.events(job_id, after)
+            for event in batch:
+                after = event['seq']
+                yield event
+            if batch:
+                continue
+            job = self.get(job_id)
+            if job is None or job['status'] in TERMINAL_STATUSES:
+                # The final events commit together with the terminal status
+                yield from self.events(job_id, after)
+                return
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            self.wait_for_change(poll_interval)
+
+    def wait(
+        self,
+        job_id: str,
+        timeout: Optional[float] = None,
+        poll_interval: float = 0.25
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Block until a job finishes (or the timeout expires) and return its state
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job['status'] in TERMINAL_STATUSES:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return job
+            self.wait_for_change(poll_interval)
+
+    def wait_for_change(self, timeout: float) -> None:
+        """
+        Block until this process changes the queue (or notify() is called), at most timeout seconds
+        """
+        with self._changed:
+            self._changed.wait(timeout)
+
+    def notify(self) -> None:
+        """
+        Wake every thread blocked in wait_for_change(), stream() or wait()
+        """
+        with self._changed:
+            self._changed.notify_all()
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued job, or ask the worker running it to stop
+
+        Returns:
+            False if the job does not exist or already finished
+        """
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute('SELECT status FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None or row[0] in TERMINAL_STATUSES:
+                return False
+            if row[0] == 'queued':
+                db.execute(
+                    "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ?",
+                    (now, job_id)
+                )
+                self._append(db, job_id, [('status', {'status': 'cancelled'}, now)])
+            else:
+                db.execute('UPDATE jobs SET cancel_requested = 1 WHERE id = ?', (job_id,))
+                self._append(db, job_id, [('status', {'cancel_requested': True}, now)])
+        self.notify()
+        return True
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the best runnable job whose resource is free
+        """
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' AND (resource IS NULL OR resource "
+                "NOT IN (SELECT resource FROM jobs WHERE status = 'running' "
+                "AND resource IS NOT NULL)) ORDER BY priority DESC, created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            job = _job_dict(row)
+            db.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                'started_at = ?, heartbeat_at = ? WHERE id = ?',
+                (worker, now, now, job['id'])
+            )
+            running = {'status': 'running', 'worker': worker, 'attempt': job['attempts'] + 1}
+            self._append(db, job['id'], [('status', running, now)])
+        job.update(status='running', worker=worker, attempts=job['attempts'] + 1)
+        self.notify()
+        return job
+
+    def heartbeat(self, worker: str, job_ids: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Extend the leases of running jobs
+
+        Returns:
+            (cancelled, lost): ids among job_ids with a pending cancellation
+            request, and ids this worker no longer owns because its lease
+            expired and the job was requeued, failed or taken by another worker
+        """
+        if not job_ids:
+            return [], []
+        now = time.time()
+        marks = ','.join('?' * len(job_ids))
+        with self._transaction() as db:
+            db.execute(
+                f"UPDATE jobs SET heartbeat_at = ? WHERE status = 'running' AND worker = ? "
+                f'AND id IN ({marks})',
+                (now, worker, *job_ids)
+            )
+            owned = dict(db.execute(
+                f"SELECT id, cancel_requested FROM jobs WHERE status = 'running' AND worker = ? "
+                f'AND id IN ({marks})',
+                (worker, *job_ids)
+            ).fetchall())
+        cancelled = [job_id for job_id in job_ids if owned.get(job_id)]
+        lost = [job_id for job_id in job_ids if job_id not in owned]
+        return cancelled, lost
+
+    def finish(
+        self,
+        job_id: str,
+        worker: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> bool:
+        """
+        Record the outcome of a running job
+
+        Returns:
+            False if the job no longer belongs to this worker (its lease expired)
+        """
+        now = time.time()
+        if isinstance(result, dict):
+            result = self._persist_outputs(job_id, result)
+        with self._transaction() as db:
+            updated = db.execute(
+                'UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? '
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (status, now, json.dumps(result, default=json_default), error, job_id, worker)
+            ).rowcount
+            if updated:
+                self._append(db, job_id, [('status', {'status': status, 'error': error}, now)])
+        if not updated and isinstance(result, dict):
+            # Another worker owns the job now; its result keeps its own files
+            for value in result.values():
+                if isinstance(value, CapturedOutput) and value.spilled:
+                    os.unlink(value.path)
+        self.notify()
+        return bool(updated)
+
+    def add_events(self, job_id: str, events: List[Tuple[str, Dict[str, Any], float]]) -> None:
+        """
+        Append (kind, data, timestamp) progress events to a job
+        """
+        if not events:
+            return
+        with self._transaction() as db:
+            self._append(db, job_id, events)
+        self.notify()
+
+    def recover_expired(self) -> int:
+        """
+        Requeue running jobs whose lease expired; fail those out of attempts
+
+        Returns:
+            Number of jobs recovered
+        """
+        now = time.time()
+        cutoff = now - self.lease_seconds
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT id, attempts, max_attempts, cancel_requested FROM jobs "
+                "WHERE status = 'running' AND heartbeat_at < ?",
+                (cutoff,)
+            ).fetchall()
+            for job_id, attempts, max_attempts, cancel_requested in rows:
+                if cancel_requested:
+                    status, error = 'cancelled', None
+                elif attempts >= max_attempts:
+                    status, error = 'failed', 'Worker lost; no attempts left'
+                else:
+                    status, error = 'queued', None
+                db.execute(
+                    'UPDATE jobs SET status = ?, worker = NULL, error = ?, finished_at = ? '
+                    'WHERE id = ?',
+                    (status, error, None if status == 'queued' else now, job_id)
+                )
+                self._append(db, job_id, [
+                    ('status', {'status': status, 'recovered': True, 'error': error}, now)
+                ])
+        if rows:
+            self.notify()
+        return len(rows)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Job counts by status
+        """
+        rows = self._db().execute('SELECT status, COUNT(*) FROM jobs GROUP BY status')
+        return dict(rows.fetchall())
+
+    def close(self) -> None:
+        """
+        Close this thread's database connection
+        """
+        db = getattr(self._local, 'db', None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    def _persist_outputs(self, job_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Result with spilled outputs linked into <path>.outputs/, which the queue owns
+        """
+        # Unique per finish, so a stale worker cannot overwrite the files of the owner
+        prefix = os.path.join(f'{self.path}.outputs', f'{job_id}-{uuid.uuid4().hex[:8]}')
+        return {
+            key: value.persist(f'{prefix}-{key}')
+            if isinstance(value, CapturedOutput) and value.spilled else value
+            for key, value in result.items()
+        }
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+
+    def _transaction(self) -> '_Transaction':
+        return _Transaction(self._db())
+
+    @staticmethod
+    def _append(
+        db: sqlite3.Connection,
+        job_id: str,
+        events: List[Tuple[str, Dict[str, Any], float]]
+    ) -> None:
+        start = db.execute(
+            'SELECT COALESCE(MAX(seq), 0) FROM job_events WHERE job_id = ?', (job_id,)
+        ).fetchone()[0]
+        db.executemany(
+            'INSERT INTO job_events (job_id, seq, created_at, kind, data) VALUES (?, ?, ?, ?, ?)',
+            [
+                (job_id, start + offset, created_at, kind, json.dumps(data, default=str))
+                for offset, (kind, data, created_at) in enumerate(events, 1)
+            ]
+        )
+
+class _Transaction:
+    """
+    BEGIN IMMEDIATE ... COMMIT: takes the write lock up front so claims never race
+    """
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.db.execute('BEGIN IMMEDIATE')
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.db.execute('ROLLBACK' if exc_type is not None else 'COMMIT')
+
+def _job_dict(row: tuple) -> Dict[str, Any]:
+    (
+        job_id, kind, params, resource, priority, status, attempts, max_attempts,
+        cancel_requested, worker, created_at, started_at, heartbeat_at, finished_at,
+        result, error
+    ) = row
+    return {
+        'id': job_id,
+        'kind': kind,
+        'params': json.loads(params),
+        'resource': resource,
+        'priority': priority,
+        'status': status,
+        'attempts': attempts,
+        'max_attempts': max_attempts,
+        'cancel_requested': bool(cancel_requested),
+        'worker': worker,
+        'created_at': created_at,
+        'started_at': started_at,
+        'heartbeat_at': heartbeat_at,
+        'finished_at': finished_at,
+        'result': json.loads(result) if result else None,
+        'error': error
+    }
+
+class JobContext:
+    """
+    Handle given to a job handler for reporting progress
+
+    Events are buffered and written in batches (every flush_interval
+    seconds or max_buffer events) so chatty subprocess output does not
+    cost one SQLite commit per line.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        job: Dict[str, Any],
+        flush_interval: float = 0.5,
+        max_buffer: int = 200
+    ):
+        self.queue = queue
+        self.job = job
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: List[Tuple[str, Dict[str, Any], float]] = []
+        self._last_flush = time.monotonic()
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        True once cancellation was requested; handlers should stop promptly
+        """
+        return self._cancelled.is_set()
+
+    def progress(self, message: str, **data) -> None:
+        """
+        Report a milestone (flushed immediately)
+        """
+        self._buffer.append(('progress', {'message': message, **data}, time.time()))
+        self.flush()
+
+    def log(self, line: str, stream: str = 'stdout') -> None:
+        """
+        Report one line of output
+        """
+        self._buffer.append(('log', {'line': line, 'stream': stream}, time.time()))
+        if (
+            len(self._buffer) >= self.max_buffer
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        buffer, self._buffer = self._buffer, []
+        self._last_flush = time.monotonic()
+        self.queue.add_events(self.job['id'], buffer)
+
+JobHandler = Callable[[Dict[str, Any], JobContext], Dict[str, Any]]
+
+class JobWorkerPool:
+    """
+    Worker threads executing jobs from a JobQueue
+
+    Several pools (in one or more processes) may serve the same database;
+    resource locks and leases are enforced by the queue. A handler's
+    result dict decides the outcome: status 'success' marks the job
+    succeeded, anything else (or an exception) failed.
+
+    Example:
+        pool = JobWorkerPool(queue, default_job_handlers(), workers=4)
+        pool.start()
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        workers: int = 4,
+        poll_interval: float = 0.5,
+        worker_id: Optional[str] = None
+    ):
+        """
+        Initialize worker pool
+
+        Args:
+            queue: Queue to execute jobs from
+            handlers: Job handlers keyed by kind
+            workers: Concurrent jobs
+            poll_interval: Seconds between polls when the queue is idle
+            worker_id: Lease owner name (defaults to host:pid:random)
+        """
+        self.queue = queue
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or (
+            f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}'
+        )
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._running: Dict[str, JobContext] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Recover abandoned jobs and start the workers
+        """
+        recovered = self.queue.recover_expired()
+        if recovered:
+            logger.info('Recovered %d abandoned jobs', recovered)
+        self._threads = [
+            threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True)
+            for i in range(self.workers)
+        ]
+        self._threads.append(
+            threading.Thread(target=self._heartbeat, name='job-heartbeat', daemon=True)
+        )
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop claiming jobs and wait for the running ones to finish
+
+        Jobs still running after the timeout keep their lease until it
+        expires, then another pool picks them up.
+        """
+        self._stop.set()
+        self.queue.notify()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def running(self) -> List[str]:
+        with self._lock:
+            return list(self._running)
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim(self.worker_id)
+            except sqlite3.Error:
+                logger.exception('Failed to claim a job')
+                job = None
+            if job is None:
+                self.queue.wait_for_change(self.poll_interval)
+                continue
+            self._execute(job)
+        self.queue.close()
+
+    def _execute(self, job: Dict[str, Any]) -> None:
+        context = JobContext(self.queue, job)
+        with self._lock:
+            self._running[job['id']] = context
+
+        handler = self.handlers.get(job['kind'])
+        status, result, error = 'failed', None, None
+        try:
+            if handler is None:
+                error = f"No handler for job kind: {job['kind']}"
+            else:
+                result = handler(job['params'], context)
+                if context.cancelled:
+                    status = 'cancelled'
+                elif isinstance(result, dict) and result.get('status') == 'success':
+                    status = 'succeeded'
+                else:
+                    error = (result or {}).get('error_message') or (result or {}).get('error')
+        except Exception as e:
+            logger.exception('Job %s (%s) failed', job['id'], job['kind'])
+            error = str(e)
+        finally:
+            with self._lock:
+                del self._running[job['id']]
+            try:
+                context.flush()
+            finally:
+                if not self.queue.finish(job['id'], self.worker_id, status, result, error):
+                    logger.warning('Job %s finished after its lease was taken over', job['id'])
+
+    def _heartbeat(self) -> None:
+        # Also the latency of cancelling a running job
+        interval = min(max(self.queue.lease_seconds / 3, 0.05), 5.0)
+        while not self._stop.wait(interval):
+            try:
+                cancelled, lost = self.queue.heartbeat(self.worker_id, self.running())
+                # Other pools may have died: requeue what they abandoned
+                self.queue.recover_expired()
+            except sqlite3.Error:
+                logger.exception('Job heartbeat failed')
+                continue
+            for job_id in lost:
+                logger.warning('Lost the lease of job %s; stopping it', job_id)
+            with self._lock:
+                # A lost job may already run elsewhere: stop it like a cancelled one
+                for job_id in cancelled + lost:
+                    if job_id in self._running:
+                        self._running[job_id]._cancelled.set()
+        self.queue.close()
+
+def run_streaming(
+    cmd: List[str],
+    cwd: str,
+    context: JobContext,
+    tail_lines: int = 50
+) -> Dict[str, Any]:
+    """
+    Run a command, forwarding each output line to the job's event log
+
+    On cancellation the process gets SIGINT (Terraform's graceful stop)
+    and is killed if it has not exited 30 seconds later.
+
+    Returns:
+        Result dict with the return code and the last tail_lines lines
+    """
+    tail: deque = deque(maxlen=tail_lines)
+    process = subprocess.Popen(
+        cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+    )
+    interrupted = threading.Event()
+
+    def watch_cancel() -> None:
+        while process.poll() is None:
+            if context.cancelled:
+                interrupted.set()
+                process.send_signal(signal.SIGINT)
+                try:
+                    process.wait(30)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                return
+            time.sleep(0.2)
+
+    threading.Thread(target=watch_cancel, daemon=True).start()
+    for line in process.stdout:
+        line = line.rstrip('\n')
+        tail.append(line)
+        context.log(line)
+    returncode = process.wait()
+    return {
+        'status': 'success' if returncode == 0 and not interrupted.is_set() else 'error',
+        'returncode': returncode,
+        'command': ' '.join(cmd),
+        'output_tail': list(tail)
+    }
+
+def _terraform_command(action: str, params: Dict[str, Any]) -> List[str]:
+    cmd = ['terraform', action, '-input=false']
+    if action in ('apply', 'destroy') and params.get('auto_approve', True):
+        cmd.append('-auto-approve')
+    for key, value in (params.get('variables') or {}).items():
+        cmd.extend(['-var', f'{key}={value}'])
+    return cmd
+
+def _terraform_handler(action: str) -> JobHandler:
+    """
+    TerraformTool.apply/destroy as a job (auto-approved unless auto_approve=False)
+    """
+    def handler(params: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+        directory = params.get('directory') or os.getcwd()
+        context.progress(f'terraform {action}', directory=directory)
+        return run_streaming(_terraform_command(action, params), directory, context)
+    return handler
+
+def _terraform_deploy(params: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+    """
+    AgentIntegrationToolkit.terraform_deploy as a job: init, then the action
+    """
+    directory = params['terraform_dir']
+    action = params.get('action', 'apply')
+    context.progress('terraform init', directory=directory)
+    init = run_streaming(['terraform', 'init', '-input=false'], directory, context)
+    if init['status'] != 'success' or context.cancelled:
+        return init
+    context.progress(f'terraform {action}', directory=directory)
+    return run_streaming(_terraform_command(action, params), directory, context)
+
+def _docker_build_handler(docker_client: Optional[Callable[[], Any]]) -> JobHandler:
+    """
+    AgentIntegrationToolkit.docker_build_image as a job, streaming build output
+    """
+    def handler(params: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+        if docker_client is not None:
+            client = docker_client()
+        else:
+            import docker
+            client = docker.from_env()
+        tag = f"{params['image_name']}:{params.get('tag', 'latest')}"
+        context.progress('docker build', tag=tag)
+
+        image_id = None
+        for chunk in client.api.build(
+            path=params['dockerfile_path'],
+            tag=tag,
+            buildargs=params.get('build_args') or {},
+            rm=True,
+            decode=True
+        ):
+            if context.cancelled:
+                return {'status': 'error', 'error_message': 'Build cancelled'}
+            if 'error' in chunk:
+                return {'status': 'error', 'error_message': chunk['error'].strip()}
+            if 'stream' in chunk and chunk['stream'].strip():
+                context.log(chunk['stream'].rstrip('\n'))
+            if 'aux' in chunk and 'ID' in chunk['aux']:
+                image_id = chunk['aux']['ID']
+        return {'status': 'success', 'image_id': image_id, 'image_tag': tag}
+    return handler
+
+def default_job_handlers(
+    docker_client: Optional[Callable[[], Any]] = None
+) -> Dict[str, JobHandler]:
+    """
+    Handlers for the long-running Terraform and Docker operations
+
+    Kinds and params:
+        terraform.apply / terraform.destroy   directory, variables, auto_approve
+        terraform.deploy                      terraform_dir, action
+        docker.build                          dockerfile_path, image_name, tag, build_args
+
+    Args:
+        docker_client: Factory returning a docker.DockerClient (defaults to docker.from_env)
+    """
+    return {
+        'terraform.apply': _terraform_handler('apply'),
+        'terraform.destroy': _terraform_handler('destroy'),
+        'terraform.deploy': _terraform_deploy,
+        'docker.build': _docker_build_handler(docker_client)
+    }
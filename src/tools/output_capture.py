@@ -0,0 +1,336 @@
+import codecs
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import weakref
+from typing import Dict, Any, Optional, List, Iterator, Tuple
+
+DEFAULT_HEAD_BYTES = 64 * 1024
+DEFAULT_TAIL_BYTES = 64 * 1024
+CHUNK_BYTES = 64 * 1024
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+class _SpillFile:
+    """
+    Spill file shared by a CapturedOutput and its views, deleted with the last of them
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.handles = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            self.handles += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self.handles -= 1
+            if self.handles:
+                return
+        _unlink_quietly(self.path)
+
+class CapturedOutput:
+    """
+    Bounded capture of a process output stream
+
+    The first head_bytes and the last tail_bytes stay in memory. Once the
+    output outgrows both, everything after the head is spilled to a
+    temporary file, so memory stays bounded however much a command
+    prints. Result dicts carry the handle itself rather than the text:
+    str() gives the full output when it fit in memory and a head/tail
+    preview otherwise, and the whole stream can be read lazily with
+    iter_chunks, iter_lines or byte-range slicing.
+
+    The spill file is removed by close() or when the handle is garbage
+    collected. Handles given to several consumers should be view()s, so
+    one consumer closing its handle does not delete the file of the
+    others. JSON encoding with json_default emits to_dict().
+
+    Example:
+        result = terraform_tool('plan', directory='/infra')
+        print(result['stdout'].tail)
+        for line in result['stdout'].iter_lines():
+            ...
+    """
+
+    def __init__(
+        self,
+        head_bytes: int = DEFAULT_HEAD_BYTES,
+        tail_bytes: int = DEFAULT_TAIL_BYTES,
+        spill_dir: Optional[str] = None
+    ):
+        """
+        Initialize capture
+
+        Args:
+            head_bytes: Bytes kept from the start of the stream
+            tail_bytes: Bytes kept from the end of the stream
+            spill_dir: Directory for the spill file (defaults to the temp directory)
+        """
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.spill_dir = spill_dir
+        self.size = 0
+        self.path: Optional[str] = None
+
+        self._head = bytearray()
+        # Bytes after the head: everything until spilling starts, then a rolling tail
+        self._rest = bytearray()
+        self._spill = None
+        self._spill_file: Optional[_SpillFile] = None
+        self._finalizer = None
+
+    @property
+    def spilled(self) -> bool:
+        return self.path is not None
+
+    @property
+    def head(self) -> str:
+        return self._head.decode('utf-8', errors='replace')
+
+    @property
+    def tail(self) -> str:
+        """
+        Last tail_bytes of the output (the whole output if it is shorter)
+        """
+        data = bytes(self._head) + bytes(self._rest) if not self.spilled else bytes(self._rest)
+        return data[-self.tail_bytes:].decode('utf-8', errors='replace') if self.tail_bytes else ''
+
+    def write(self, data: bytes) -> None:
+        """
+        Append bytes read from the stream
+        """
+        self.size += len(data)
+        room = self.head_bytes - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if not data:
+            return
+
+        if self._spill is None and len(self._rest) + len(data) > self.tail_bytes:
+            self._start_spill()
+        if self._spill is not None:
+            self._spill.write(data)
+        self._rest += data
+        if self._spill is not None and len(self._rest) > 2 * self.tail_bytes:
+            self._trim_tail()
+
+    def finish(self) -> 'CapturedOutput':
+        """
+        Close the spill file for writing once the stream has ended
+        """
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+        if self.spilled:
+            self._trim_tail()
+        return self
+
+    def read_bytes(self, start: int = 0, stop: Optional[int] = None) -> bytes:
+        """
+        Bytes [start, stop) of the output, read from the spill file when needed
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        start = max(start, 0)
+        if start >= stop:
+            return b''
+
+        head_end = len(self._head)
+        parts = []
+        if start < head_end:
+            parts.append(bytes(self._head[start:min(stop, head_end)]))
+        if stop > head_end:
+            offset = max(start, head_end) - head_end
+            length = stop - head_end - offset
+            if self.spilled:
+                with open(self.path, 'rb') as handle:
+                    handle.seek(offset)
+                    parts.append(handle.read(length))
+            else:
+                parts.append(bytes(self._rest[offset:offset + length]))
+        return b''.join(parts)
+
+    def iter_chunks(self, chunk_size: int = CHUNK_BYTES) -> Iterator[bytes]:
+        """
+        Stream the whole output in chunks without loading it at once
+        """
+        if self._head:
+            yield bytes(self._head)
+        if not self.spilled:
+            if self._rest:
+                yield bytes(self._rest)
+            return
+        with open(self.path, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(chunk_size), b''):
+                yield chunk
+
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Stream the whole output line by line (without line endings)
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        pending = ''
+        for chunk in self.iter_chunks():
+            lines = (pending + decoder.decode(chunk)).split('\n')
+            pending = lines.pop()
+            yield from lines
+        pending += decoder.decode(b'', final=True)
+        if pending:
+            yield pending
+
+    def text(self) -> str:
+        """
+        The complete output; loads a spilled stream into memory
+        """
+        return b''.join(self.iter_chunks()).decode('utf-8', errors='replace')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-friendly summary: head, tail, total size and spill file
+        """
+        return {
+            'size': self.size,
+            'spilled': self.spilled,
+            'path': self.path,
+            'head': self.head,
+            'tail': self.tail
+        }
+
+    def view(self) -> 'CapturedOutput':
+        """
+        Independent handle on the same output
+
+        The spill file is shared and deleted once every handle on it is
+        closed or collected.
+        """
+        self.finish()
+        view = self._copy(self.path)
+        if self._finalizer is not None and self._finalizer.alive:
+            self._spill_file.acquire()
+            view._spill_file = self._spill_file
+            view._finalizer = weakref.finalize(view, self._spill_file.release)
+        return view
+
+    def persist(self, path: str) -> 'CapturedOutput':
+        """
+        Handle whose spill file is linked (or copied) to path and never deleted automatically
+
+        For results that outlive the process, such as finished jobs. A
+        handle that did not spill has nothing to persist and gets a plain
+        copy.
+        """
+        self.finish()
+        if not self.spilled:
+            return self._copy(None)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        _unlink_quietly(path)
+        try:
+            os.link(self.path, path)
+        except OSError:
+            shutil.copyfile(self.path, path)
+        return self._copy(path)
+
+    def close(self) -> None:
+        """
+        Delete the spill file (once no view of it is left)
+        """
+        self.finish()
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __getitem__(self, index: slice) -> str:
+        """
+        Decoded byte range, e.g. output[-4096:]
+        """
+        if not isinstance(index, slice) or index.step not in (None, 1):
+            raise TypeError('CapturedOutput supports contiguous slices only')
+        start, stop, _ = index.indices(self.size)
+        return self.read_bytes(start, stop).decode('utf-8', errors='replace')
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def __str__(self) -> str:
+        if not self.spilled:
+            return (bytes(self._head) + bytes(self._rest)).decode('utf-8', errors='replace')
+        omitted = self.size - len(self._head) - min(len(self._rest), self.tail_bytes)
+        marker = f'... [{omitted} bytes omitted] ...'
+        return f'{self.head}\n{marker}\n{self.tail}'
+
+    def __repr__(self) -> str:
+        return f'CapturedOutput(size={self.size}, spilled={self.spilled})'
+
+    def _trim_tail(self) -> None:
+        del self._rest[:max(len(self._rest) - self.tail_bytes, 0)]
+
+    def _copy(self, path: Optional[str]) -> 'CapturedOutput':
+        copy = CapturedOutput(self.head_bytes, self.tail_bytes, self.spill_dir)
+        copy.size = self.size
+        copy.path = path
+        copy._head = bytearray(self._head)
+        copy._rest = bytearray(self._rest)
+        return copy
+
+    def _start_spill(self) -> None:
+        fd, self.path = tempfile.mkstemp(prefix='overseer-output-', dir=self.spill_dir)
+        self._spill = os.fdopen(fd, 'wb')
+        self._spill.write(self._rest)
+        self._spill_file = _SpillFile(self.path)
+        self._spill_file.acquire()
+        self._finalizer = weakref.finalize(self, self._spill_file.release)
+
+def json_default(value: Any) -> Any:
+    """
+    json.dumps default for tool results: CapturedOutput as to_dict(), anything else as str()
+
+    Example:
+        json.dumps(result, default=json_default)
+    """
+    if isinstance(value, CapturedOutput):
+        return value.to_dict()
+    return str(value)
+
+def _pump(stream, capture: CapturedOutput) -> None:
+    for chunk in iter(lambda: stream.read1(CHUNK_BYTES), b''):
+        capture.write(chunk)
+    stream.close()
+    capture.finish()
+
+def run_captured(
+    cmd: List[str],
+    cwd: Optional[str] = None,
+    head_bytes: int = DEFAULT_HEAD_BYTES,
+    tail_bytes: int = DEFAULT_TAIL_BYTES,
+    spill_dir: Optional[str] = None
+) -> Tuple[int, CapturedOutput, CapturedOutput]:
+    """
+    Run a command capturing stdout and stderr with bounded memory
+
+    Returns:
+        Return code, stdout and stderr handles
+    """
+    process = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout = CapturedOutput(head_bytes, tail_bytes, spill_dir)
+    stderr = CapturedOutput(head_bytes, tail_bytes, spill_dir)
+    readers = [
+        threading.Thread(target=_pump, args=(process.stdout, stdout), daemon=True),
+        threading.Thread(target=_pump, args=(process.stderr, stderr), daemon=True)
+    ]
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join()
+    return process.wait(), stdout, stderr
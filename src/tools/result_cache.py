@@ -0,0 +1,215 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, Callable, FrozenSet, Tuple
+
+from .output_capture import CapturedOutput
+
+class CachePolicy:
+    """
+    Describes which operations of a tool may be memoized
+
+    Attributes:
+        namespace: Tool name used to separate cache keys
+        ttls: Default time-to-live in seconds for each read-only method
+        mutating: Methods that invalidate cached reads on the same resource
+        resource: Maps call kwargs to the resource the call touches
+        credentials: Kwargs holding secrets; keys only carry a digest of them
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttls: Dict[str, float],
+        mutating: FrozenSet[str],
+        resource: Callable[[Dict[str, Any]], str],
+        credentials: FrozenSet[str] = frozenset()
+    ):
+        self.namespace = namespace
+        self.ttls = ttls
+        self.mutating = mutating
+        self.resource = resource
+        self.credentials = credentials
+
+class ToolResultCache:
+    """
+    Opt-in memoization for idempotent tool calls
+
+    Features:
+    - Keys built from tool, method and normalized kwargs
+    - Per-method TTLs (policy defaults, overridable per cache)
+    - LRU eviction once max_entries is reached
+    - Single-flight: concurrent identical calls share one execution
+    - Mutating calls invalidate cached reads on the same resource
+
+    Example:
+        cache = ToolResultCache(ttls={'list_images': 5})
+        docker_tool('list_images', cache=cache)
+        docker_tool('list_images', cache=cache)  # served from cache
+        docker_tool('remove_container', container_id='abc', cache=cache)  # invalidates
+
+    Every caller gets its own copy of a cached result dict, with its own
+    view() of each CapturedOutput, so closing one handle does not delete
+    the spill file under other callers. Other values are shared and must
+    be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize result cache
+
+        Args:
+            max_entries: Maximum cached results before least recently used are evicted
+            ttls: Per-method TTL overrides in seconds (0 disables caching a method)
+            clock: Monotonic time source
+        """
+        self.max_entries = max_entries
+        self.ttls = ttls or {}
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._generations: Dict[str, int] = {}
+        # Bumped by invalidate(None) so in-flight reads of any resource are not stored
+        self._epoch = 0
+
+    def call(
+        self,
+        policy: CachePolicy,
+        method: str,
+        kwargs: Dict[str, Any],
+        execute: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Execute a tool call through the cache
+
+        Args:
+            policy: Cache policy of the tool being called
+            method: Tool method name
+            kwargs: Call arguments (used for the key and resource)
+            execute: Performs the actual call
+        """
+        resource = f'{policy.namespace}:{policy.resource(kwargs)}'
+
+        if method in policy.mutating:
+            self.invalidate(resource)
+            try:
+                return execute()
+            finally:
+                self.invalidate(resource)
+
+        ttl = self.ttls.get(method, policy.ttls.get(method, 0))
+        if ttl <= 0:
+            return execute()
+
+        key = (policy.namespace, self._normalize(method, kwargs, policy.credentials))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _detach(entry[2])
+
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                leader = True
+                flight = self._inflight[key] = Future()
+                generation = (self._epoch, self._generations.get(resource, 0))
+
+        if not leader:
+            return _detach(flight.result())
+
+        try:
+            result = execute()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            flight.set_exception(e)
+            raise
+
+        # The cache and coalesced callers hold views, the leader the originals
+        shared = _detach(result)
+        with self._lock:
+            del self._inflight[key]
+            # Skip storing results that raced with a mutation or failed
+            if (
+                (self._epoch, self._generations.get(resource, 0)) == generation
+                and result.get('status') == 'success'
+            ):
+                self._entries[key] = (self.clock() + ttl, resource, shared)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        flight.set_result(shared)
+        return result
+
+    def invalidate(self, resource: Optional[str] = None) -> None:
+        """
+        Drop cached results for a resource ('namespace:resource'), or everything
+        """
+        with self._lock:
+            if resource is None:
+                self._epoch += 1
+                self._entries.clear()
+                return
+            self._generations[resource] = self._generations.get(resource, 0) + 1
+            stale = [key for key, entry in self._entries.items() if entry[1] == resource]
+            for key in stale:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return cache hit/miss counters and current size
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'entries': len(self._entries),
+                'inflight': len(self._inflight)
+            }
+
+    @staticmethod
+    def _normalize(
+        method: str,
+        kwargs: Dict[str, Any],
+        credentials: FrozenSet[str] = frozenset()
+    ) -> str:
+        """
+        Build a stable key from method and kwargs (None values are treated as unset)
+
+        Credential kwargs are replaced by a SHA-256 digest, so callers with
+        different credentials still get separate entries but no secret is
+        kept in the key.
+        """
+        normalized = {k: v for k, v in kwargs.items() if v is not None and k != 'method'}
+        for name in credentials & normalized.keys():
+            secret = str(normalized[name]).encode('utf-8')
+            normalized[name] = 'sha256:' + hashlib.sha256(secret).hexdigest()
+        return method + ':' + json.dumps(normalized, sort_keys=True, default=str)
+
+def _detach(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shallow copy of a result with an independent view of every CapturedOutput
+    """
+    return {
+        key: value.view() if isinstance(value, CapturedOutput) else value
+        for key, value in result.items()
+    }
@@ -2,21 +2,30 @@ import os
 import subprocess
 from typing import Dict, Any, Optional
 
+from .instrumentation import backend_timer, instrumented_call
+from .output_capture import run_captured
+from .result_cache import CachePolicy, ToolResultCache
+
 class TerraformTool:
     """
     Comprehensive Terraform infrastructure management tool
     
     Provides atomic, tool-like operations for infrastructure deployment
+    
+    stdout and stderr are returned as CapturedOutput handles: the head and
+    tail stay in memory and large plans spill to a temporary file.
     """
     
-    def __init__(self, terraform_dir: Optional[str] = None):
+    def __init__(self, terraform_dir: Optional[str] = None, spill_dir: Optional[str] = None):
         """
         Initialize Terraform tool
         
         Args:
             terraform_dir: Default directory for Terraform configurations
+            spill_dir: Directory for spilled command output (defaults to the temp directory)
         """
         self.default_dir = terraform_dir or os.getcwd()
+        self.spill_dir = spill_dir
     
     def _run_terraform_command(
         self, 
@@ -43,27 +52,25 @@ class TerraformTool:
             for key, value in variables.items():
                 cmd.extend(['-var', f'{key}={value}'])
         
-        try:
-            result = subprocess.run(
-                cmd, 
+        with backend_timer('subprocess'):
+            returncode, stdout, stderr = run_captured(
+                cmd,
                 cwd=directory or self.default_dir,
-                capture_output=True, 
-                text=True,
-                check=True
+                spill_dir=self.spill_dir
             )
-            
-            return {
-                'status': 'success',
-                'stdout': result.stdout,
-                'stderr': result.stderr
-            }
-        except subprocess.CalledProcessError as e:
+        
+        if returncode != 0:
             return {
                 'status': 'error',
-                'error_message': str(e),
-                'stdout': e.stdout,
-                'stderr': e.stderr
+                'error_message': str(subprocess.CalledProcessError(returncode, cmd)),
+                'stdout': stdout,
+                'stderr': stderr
             }
+        return {
+            'status': 'success',
+            'stdout': stdout,
+            'stderr': stderr
+        }
     
     def init(self, directory: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -125,7 +132,19 @@ class TerraformTool:
         """
         return self._run_terraform_command('destroy', directory, variables, auto_approve)
 
-def terraform_tool(method: str, **kwargs) -> Dict[str, Any]:
+CACHE_POLICY = CachePolicy(
+    namespace='terraform',
+    ttls={'plan': 15.0},
+    mutating=frozenset({'init', 'apply', 'destroy'}),
+    resource=lambda kwargs: os.path.abspath(kwargs.get('directory') or os.getcwd())
+)
+
+def terraform_tool(
+    method: str,
+    cache: Optional[ToolResultCache] = None,
+    instance: Optional[TerraformTool] = None,
+    **kwargs
+) -> Dict[str, Any]:
     """
     Unified interface for Terraform tool operations
     
@@ -133,14 +152,14 @@ def terraform_tool(method: str, **kwargs) -> Dict[str, Any]:
     terraform_tool('init', directory='/infra')
     terraform_tool('apply', variables={'region': 'us-west-2'})
     terraform_tool('destroy', auto_approve=True)
+    terraform_tool('plan', directory='/infra', cache=shared_cache)
+    terraform_tool('plan', directory='/infra', instance=warm_tool)
     """
-    tool = TerraformTool(terraform_dir=kwargs.get('directory'))
-    
     method_map = {
-        'init': tool.init,
-        'plan': tool.plan,
-        'apply': tool.apply,
-        'destroy': tool.destroy
+        'init': TerraformTool.init,
+        'plan': TerraformTool.plan,
+        'apply': TerraformTool.apply,
+        'destroy': TerraformTool.destroy
     }
     
     if method not in method_map:
@@ -149,4 +168,12 @@ def terraform_tool(method: str, **kwargs) -> Dict[str, Any]:
             'error_message': f'Invalid method: {method}'
         }
     
-    return method_map[method](**{k: v for k, v in kwargs.items() if k != 'method'})
+    def execute() -> Dict[str, Any]:
+        tool = instance or TerraformTool(terraform_dir=kwargs.get('directory'))
+        return method_map[method](tool, **{k: v for k, v in kwargs.items() if k != 'method'})
+    
+    if cache is None:
+        return instrumented_call('terraform', method, execute)
+    return instrumented_call(
+        'terraform', method, lambda: cache.call(CACHE_POLICY, method, kwargs, execute)
+    )
@@ -0,0 +1,344 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Any, Optional, Callable, TypeVar
+
+from .instrumentation import LatencyHistogram, record_event, record_retry
+
+T = TypeVar('T')
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling a backend whose circuit breaker is open
+    """
+
+    def __init__(self, backend: str, retry_in: float):
+        super().__init__(f'{backend} circuit breaker is open; retry in {retry_in:.1f}s')
+        self.backend = backend
+        self.retry_in = retry_in
+
+class RetryPolicy:
+    """
+    Capped exponential backoff with full jitter
+
+    The delay before retry n (1-based) is uniform in
+    [0, min(max_delay, base_delay * multiplier ** (n - 1))], so clients
+    that failed together do not retry together. A server-provided
+    Retry-After takes precedence when it is longer.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.2,
+        max_delay: float = 10.0,
+        multiplier: float = 2.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize retry policy
+
+        Args:
+            max_attempts: Total attempts including the first (1 disables retries)
+            base_delay: Backoff ceiling in seconds before the first retry
+            max_delay: Upper bound for any single delay
+            multiplier: Growth of the ceiling per retry
+            seed: Seed for the jitter (None for nondeterministic)
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self._random = random.Random(seed)
+
+    def delay(self, retry: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before the given retry
+        """
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** (retry - 1))
+        delay = self._random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    closed     calls pass; failure_threshold consecutive failures open it
+    open       calls are rejected until reset_timeout has passed
+    half_open  one probe call passes; success closes, failure reopens
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = 'closed'
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> Optional[float]:
+        """
+        Admit a call
+
+        Returns:
+            None if the call may proceed, else seconds until the next probe
+        """
+        with self._lock:
+            if self.state == 'closed':
+                return None
+            remaining = self._opened_at + self.reset_timeout - self.clock()
+            if self.state == 'open' and remaining > 0:
+                return remaining
+            if self._probing:
+                return max(remaining, 0.0)
+            self.state = 'half_open'
+            self._probing = True
+            return None
+
+    def record_success(self) -> Optional[str]:
+        """
+        Returns:
+            The new state if this success changed it
+        """
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            if self.state != 'closed':
+                self.state = 'closed'
+                return 'closed'
+            return None
+
+    def record_failure(self) -> Optional[str]:
+        """
+        Returns:
+            The new state if this failure changed it
+        """
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == 'half_open' or (
+                self.state == 'closed' and self.failures >= self.failure_threshold
+            ):
+                self.state = 'open'
+                self._opened_at = self.clock()
+                return 'open'
+            return None
+
+# Shared by every transport; hedged attempts are short, blocking reads
+_hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='transport-hedge')
+
+class Transport:
+    """
+    Retry, circuit-breaking and hedging policy for one backend
+
+    Every call passes the backend's circuit breaker. Idempotent calls
+    that fail with a retryable error (5xx, connection resets) are
+    retried with jittered backoff; non-idempotent calls are
+    attempted once, since a retry could apply them twice. With hedging
+    enabled, an idempotent call still running after the hedge delay
+    (by default the p95 of recent successful attempts) gets a second,
+    concurrent attempt and the first result wins.
+
+    Decisions are counted as instrumentation events under the backend
+    name (attempt, retry, gave_up, rejected, probe, open, closed, hedged,
+    hedge_won) and retries are also recorded on the current tool call.
+
+    Example:
+        transport = get_transport('github', is_retryable=github_retryable)
+        repo = transport.call(lambda: client.get_repo('owner/repo'))
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        is_retryable: Callable[[BaseException], bool],
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge: bool = False,
+        hedge_delay: Optional[float] = None,
+        retry_after: Optional[Callable[[BaseException], Optional[float]]] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize transport
+
+        Args:
+            backend: Name used for metrics and errors
+            is_retryable: Classifies exceptions as transient
+            retry: Backoff policy (defaults to RetryPolicy())
+            breaker: Circuit breaker (defaults to CircuitBreaker())
+            hedge: Hedge idempotent calls
+            hedge_delay: Fixed hedge delay in seconds (None uses the observed p95)
+            retry_after: Extracts a server-requested delay from an exception
+            sleep: Sleep function (injectable for tests)
+        """
+        self.backend = backend
+        self.is_retryable = is_retryable
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.retry_after = retry_after
+        self.sleep = sleep
+        self.latency_us = LatencyHistogram()
+        self._latency_lock = threading.Lock()
+
+    def call(self, operation: Callable[[], T], idempotent: bool = True) -> T:
+        """
+        Run operation under the policy
+
+        Raises:
+            CircuitOpenError: The breaker rejected the call
+            The operation's own exception once retries are exhausted or
+            when it is not retryable
+        """
+        attempts = self.retry.max_attempts if idempotent else 1
+        attempt = 0
+        while True:
+            attempt += 1
+            was_open = self.breaker.state == 'open'
+            retry_in = self.breaker.allow()
+            if retry_in is not None:
+                record_event(self.backend, 'rejected')
+                raise CircuitOpenError(self.backend, retry_in)
+            if was_open:
+                record_event(self.backend, 'probe')
+
+            record_event(self.backend, 'attempt')
+            try:
+                if idempotent and self.hedge:
+                    result = self._hedged(operation)
+                else:
+                    result = self._timed(operation)
+            except Exception as e:
+                if not self.is_retryable(e):
+                    # The backend answered (e.g. 404): it is healthy
+                    self._transition(self.breaker.record_success())
+                    raise
+                self._transition(self.breaker.record_failure())
+                if attempt >= attempts or self.breaker.state == 'open':
+                    record_event(self.backend, 'gave_up')
+                    raise
+                record_event(self.backend, 'retry')
+                record_retry()
+                hint = self.retry_after(e) if self.retry_after is not None else None
+                self.sleep(self.retry.delay(attempt, hint))
+                continue
+
+            self._transition(self.breaker.record_success())
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._latency_lock:
+            latency = self.latency_us.summary()
+        return {
+            'backend': self.backend,
+            'state': self.breaker.state,
+            'consecutive_failures': self.breaker.failures,
+            'latency_us': latency
+        }
+
+    def _timed(self, operation: Callable[[], T]) -> T:
+        start = time.perf_counter()
+        result = operation()
+        with self._latency_lock:
+            self.latency_us.record((time.perf_counter() - start) * 1e6)
+        return result
+
+    def _current_hedge_delay(self) -> Optional[float]:
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        with self._latency_lock:
+            if self.latency_us.count < 20:
+                return None
+            return self.latency_us.percentile(95) / 1e6
+
+    def _hedged(self, operation: Callable[[], T]) -> T:
+        delay = self._current_hedge_delay()
+        if delay is None:
+            return self._timed(operation)
+
+        primary = _hedge_pool.submit(self._timed, operation)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        record_event(self.backend, 'hedged')
+        backup = _hedge_pool.submit(self._timed, operation)
+        pending = {primary, backup}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        record_event(self.backend, 'hedge_won')
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def _transition(self, state: Optional[str]) -> None:
+        if state is not None:
+            record_event(self.backend, state)
+
+_transports: Dict[str, Transport] = {}
+_transport_options: Dict[str, Dict[str, Any]] = {}
+_transports_lock = threading.Lock()
+
+def get_transport(
+    backend: str,
+    is_retryable: Callable[[BaseException], bool],
+    retry_after: Optional[Callable[[BaseException], Optional[float]]] = None
+) -> Transport:
+    """
+    Process-wide transport for a backend, so all tool instances share one breaker
+    """
+    with _transports_lock:
+        transport = _transports.get(backend)
+        if transport is None:
+            transport = _transports[backend] = Transport(
+                backend,
+                is_retryable,
+                retry_after=retry_after,
+                **_transport_options.get(backend, {})
+            )
+        return transport
+
+def configure_transport(backend: str, **options) -> None:
+    """
+    Set Transport options (retry, breaker, hedge, hedge_delay, sleep) for a backend
+
+    Takes effect for transports created afterwards; the current one is replaced.
+
+    Example:
+        configure_transport('github', hedge=True, retry=RetryPolicy(max_attempts=6))
+    """
+    with _transports_lock:
+        _transport_options[backend] = options
+        _transports.pop(backend, None)
+
+def transport_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Breaker state and attempt latency of every transport
+    """
+    with _transports_lock:
+        transports = list(_transports.values())
+    return {transport.backend: transport.stats() for transport in transports}
+
+def reset_transports() -> None:
+    """
+    Drop all transports and their options
+    """
+    with _transports_lock:
+        _transports.clear()
+        _transport_options.clear()
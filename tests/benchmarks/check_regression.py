@@ -0,0 +1,102 @@
+"""
+Regression gate for the learning-system benchmarks
+
+Compares a pytest-benchmark JSON report against the stored baseline:
+
+    python -m pytest tests/benchmarks -m benchmark --benchmark-json=bench.json
+    python tests/benchmarks/check_regression.py bench.json
+
+Exits non-zero when a benchmark's median time, or a lower-is-better
+extra_info metric, exceeds its baseline by more than the tolerance, or
+when recall drops by more than the recall tolerance. Baselines are
+machine-specific; refresh them on the CI runner with --update.
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Dict, Any, List
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# extra_info metrics where larger values are regressions
+LOWER_IS_BETTER = ('bytes_per_event',)
+# extra_info metrics where smaller values are regressions (absolute tolerance)
+HIGHER_IS_BETTER = ('recall@10',)
+
+def summarize(report: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """
+    Reduce a pytest-benchmark report to the metrics the gate compares
+    """
+    summary = {}
+    for bench in report['benchmarks']:
+        metrics = {'median': bench['stats']['median']}
+        for key in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            if bench.get('extra_info', {}).get(key) is not None:
+                metrics[key] = bench['extra_info'][key]
+        summary[bench['name']] = metrics
+    return summary
+
+def compare(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Any]
+) -> List[str]:
+    """
+    List regressions of current metrics against the baseline
+    """
+    tolerance = baseline.get('tolerance', 0.5)
+    recall_tolerance = baseline.get('recall_tolerance', 0.02)
+    regressions = []
+    for name, expected in baseline['benchmarks'].items():
+        actual = current.get(name)
+        if actual is None:
+            continue
+        for key in ('median',) + LOWER_IS_BETTER:
+            if key in expected and key in actual and actual[key] > expected[key] * (1 + tolerance):
+                regressions.append(
+                    f'{name}: {key} {actual[key]:.6g} exceeds baseline {expected[key]:.6g} '
+                    f'by more than {tolerance:.0%}'
+                )
+        for key in HIGHER_IS_BETTER:
+            if key in expected and key in actual and actual[key] < expected[key] - recall_tolerance:
+                regressions.append(
+                    f'{name}: {key} {actual[key]:.4f} below baseline {expected[key]:.4f}'
+                )
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('report', help='pytest-benchmark --benchmark-json output')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update', action='store_true', help='Overwrite the baseline')
+    args = parser.parse_args(argv)
+
+    with open(args.report, encoding='utf-8') as handle:
+        current = summarize(json.load(handle))
+
+    if args.update:
+        baseline = {'tolerance': 0.5, 'recall_tolerance': 0.02}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as handle:
+                previous = json.load(handle)
+            baseline.update({k: v for k, v in previous.items() if k != 'benchmarks'})
+        baseline['benchmarks'] = current
+        with open(args.baseline, 'w', encoding='utf-8') as handle:
+            json.dump(baseline, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+        print(f'Baseline updated with {len(current)} benchmarks')
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as handle:
+        baseline = json.load(handle)
+    regressions = compare(current, baseline)
+    for regression in regressions:
+        print(regression)
+    missing = sorted(set(baseline['benchmarks']) - set(current))
+    if missing:
+        print(f'Not run (skipped in gate): {", ".join(missing)}')
+    print(f'{len(regressions)} regression(s) in {len(current)} benchmarks')
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
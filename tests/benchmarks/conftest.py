@@ -0,0 +1,92 @@
+import os
+import numpy as np
+import pytest
+from learning.ann import IVFIndex, synthetic_vectors
+from learning.embedding import HashingEmbedder
+from learning.systems.adaptive import RapidAdaptiveLearningSystem
+
+DIMENSION = 384
+AGENTS = ('Scribe', 'Keeper', 'Watcher', 'Seer')
+
+def corpus_sizes():
+    """Corpus sizes to benchmark, overridable with LEARNING_BENCH_SIZES=1000,100000"""
+    sizes = os.getenv('LEARNING_BENCH_SIZES', '1000,10000,50000')
+    return [int(size) for size in sizes.split(',') if size.strip()]
+
+def synthetic_events(system, count, seed=0):
+    """Deterministic events: agents split 4 ways, 'rare' on 1% and 'common' on 50% of rows"""
+    rng = np.random.default_rng(seed)
+    agents = rng.integers(0, len(AGENTS), count)
+    return [
+        system._build_event(
+            f'learning event {i} from {AGENTS[agents[i]]}',
+            {
+                'agent': AGENTS[agents[i]],
+                'tier': 'rare' if i % 100 == 0 else 'common' if i % 2 else 'default'
+            },
+            'benchmark'
+        ) for i in range(count)
+    ]
+
+def populate(system, count, seed=0):
+    """Bulk-load a system with deterministic events and clustered vectors"""
+    events = synthetic_events(system, count, seed)
+    for start in range(0, count, 10_000):
+        system.backend.add(
+            events[start:start + 10_000],
+            synthetic_vectors(min(10_000, count - start), DIMENSION, seed=seed + start)
+        )
+    if isinstance(system.backend.index, IVFIndex):
+        system.backend.index.wait_for_training()
+    return system
+
+def new_system(**kwargs):
+    return RapidAdaptiveLearningSystem(embedder=HashingEmbedder(dimension=DIMENSION), **kwargs)
+
+@pytest.hookimpl(trylast=True)
+def pytest_generate_tests(metafunc):
+    """Parametrize a `size` argument over the configured corpus sizes"""
+    # trylast keeps ids like [flat-1000]: @parametrize marks are applied first
+    if 'size' in metafunc.fixturenames:
+        metafunc.parametrize('size', corpus_sizes())
+
+@pytest.fixture(scope='session')
+def largest_size():
+    """Largest configured corpus size"""
+    return max(corpus_sizes())
+
+@pytest.fixture(scope='session')
+def make_system():
+    """Factory for learning systems on the benchmark embedding dimension"""
+    return new_system
+
+@pytest.fixture(scope='session')
+def make_events():
+    """Factory for deterministic benchmark events (see synthetic_events)"""
+    return synthetic_events
+
+@pytest.fixture(scope='session')
+def populate_system():
+    """Bulk loader for deterministic events and clustered vectors (see populate)"""
+    return populate
+
+@pytest.fixture(scope='session')
+def populated_systems():
+    """Cache of populated systems keyed by (size, index_type)"""
+    systems = {}
+
+    def get(size, index_type='flat'):
+        key = (size, index_type)
+        if key not in systems:
+            systems[key] = populate(new_system(index_type=index_type), size)
+        return systems[key]
+
+    yield get
+    for system in systems.values():
+        system.close()
+
+@pytest.fixture(scope='session')
+def query_vectors():
+    """Fixed query set shared by every query benchmark"""
+    rng = np.random.default_rng(42)
+    return rng.standard_normal((256, DIMENSION)).astype(np.float32)
@@ -0,0 +1,144 @@
+"""
+Benchmarks for the learning system hot paths
+
+They are deselected by default (see addopts in pyproject.toml). Run with:
+    python -m pytest tests/benchmarks -m benchmark --benchmark-json=bench.json
+    python tests/benchmarks/check_regression.py bench.json
+
+All data is synthetic and seeded. Queries go straight to the backend so
+embedding cost does not mask index behaviour; bulk insert includes it.
+"""
+import itertools
+import numpy as np
+import pytest
+from learning.ann import IVFIndex
+from learning.quantization import QuantizedIndex
+
+pytestmark = pytest.mark.benchmark
+
+def record_percentiles(benchmark):
+    """Store the latency distribution tail alongside pytest-benchmark's summary"""
+    data = np.asarray(benchmark.stats.stats.data)
+    benchmark.extra_info['p50_ms'] = float(np.percentile(data, 50) * 1e3)
+    benchmark.extra_info['p99_ms'] = float(np.percentile(data, 99) * 1e3)
+
+@pytest.mark.benchmark(group='insert')
+def test_bulk_insert(benchmark, make_system, make_events):
+    """Embed and store 1000 events per round"""
+    texts = [event['content'] for event in make_events(make_system(), 1000)]
+
+    def setup():
+        system = make_system()
+        return (system, make_events(system, 1000)), {}
+
+    def insert(system, events):
+        system.backend.add(events, system.embedder.embed(texts))
+
+    benchmark.pedantic(insert, setup=setup, rounds=10)
+    benchmark.extra_info['events_per_round'] = 1000
+
+@pytest.mark.benchmark(group='query')
+@pytest.mark.parametrize('index_type', ['flat', 'ivf', 'int8', 'binary'])
+def test_query_latency(benchmark, populated_systems, query_vectors, size, index_type):
+    """Unfiltered top-10 query latency by corpus size (see conftest) and index type"""
+    system = populated_systems(size, index_type)
+    queries = itertools.cycle(query_vectors)
+
+    results = benchmark(lambda: system.backend.query(next(queries), 10))
+    assert len(results) == 10
+    record_percentiles(benchmark)
+
+@pytest.mark.benchmark(group='ivf-build')
+def test_ivf_build(benchmark, populated_systems, largest_size):
+    """Train and fill an IVF index over the largest corpus"""
+    store = populated_systems(largest_size, 'flat').backend.store
+
+    def build():
+        index = IVFIndex(store, train_threshold=1, seed=0)
+        index.add(np.arange(largest_size))
+        index.wait_for_training()
+        return index
+
+    index = benchmark.pedantic(build, rounds=3)
+    benchmark.extra_info['n_lists'] = len(index._lists)
+
+@pytest.mark.benchmark(group='ivf-recall')
+@pytest.mark.parametrize('nprobe', [1, 4, 16, 64])
+def test_ivf_recall(benchmark, populated_systems, largest_size, nprobe):
+    """IVF latency and recall@10 against exact search by number of probed clusters"""
+    system = populated_systems(largest_size, 'ivf')
+    store, index = system.backend.store, system.backend.index
+    # Perturbed copies of stored vectors, so every query has true near neighbours
+    rng = np.random.default_rng(1)
+    queries = store.vectors[rng.integers(0, largest_size, 200)]
+    queries = queries + 0.1 * rng.standard_normal(queries.shape, dtype=np.float32)
+    cycle = itertools.cycle(queries)
+
+    benchmark(lambda: index.search(next(cycle), 10, nprobe=nprobe))
+    record_percentiles(benchmark)
+    benchmark.extra_info['recall@10'] = float(np.mean([
+        len(np.intersect1d(index.search(query, 10, nprobe=nprobe)[0], store.search(query, 10)[0]))
+        / 10 for query in queries
+    ]))
+
+@pytest.mark.benchmark(group='filter')
+@pytest.mark.parametrize('filter_metadata', [
+    None,
+    {'tier': 'common'},
+    {'agent': 'Keeper'},
+    {'tier': 'rare'},
+    {'agent': 'Keeper', 'tier': 'rare'}
+], ids=['unfiltered', 'common-50pct', 'agent-25pct', 'rare-1pct', 'rare-and-agent'])
+def test_filtered_query(
+    benchmark, populated_systems, query_vectors, largest_size, filter_metadata
+):
+    """Filtered versus unfiltered queries on the largest configured corpus"""
+    system = populated_systems(largest_size, 'flat')
+    queries = itertools.cycle(query_vectors)
+
+    benchmark(lambda: system.backend.query(next(queries), 10, filter_metadata))
+    record_percentiles(benchmark)
+
+@pytest.fixture(scope='module')
+def persisted_corpus(tmp_path_factory, make_system, populate_system, largest_size):
+    """On-disk store with the largest configured corpus"""
+    directory = str(tmp_path_factory.mktemp('learning-store'))
+    system = make_system(storage_dir=directory)
+    populate_system(system, largest_size)
+    system.close()
+    return directory
+
+@pytest.mark.benchmark(group='cold-start')
+def test_cold_start(benchmark, persisted_corpus, query_vectors, make_system, largest_size):
+    """Open a persisted store read-only and answer the first query"""
+    def open_and_query():
+        system = make_system(storage_dir=persisted_corpus, readonly=True)
+        results = system.backend.query(query_vectors[0], 10)
+        system.close()
+        return results
+
+    results = benchmark.pedantic(open_and_query, rounds=20)
+    assert len(results) == 10
+    benchmark.extra_info['events'] = largest_size
+
+@pytest.mark.benchmark(group='memory')
+@pytest.mark.parametrize('mode', ['int8', 'binary'])
+def test_memory_footprint(benchmark, populated_systems, largest_size, mode):
+    """Encode the largest corpus; resident bytes per event go to extra_info"""
+    size = largest_size
+    store = populated_systems(size, 'flat').backend.store
+
+    def build():
+        index = QuantizedIndex(store, mode=mode, target_recall=None)
+        index.add(np.arange(size))
+        return index
+
+    index = benchmark.pedantic(build, rounds=3)
+    benchmark.extra_info['bytes_per_event'] = index.bytes_per_vector
+    float32_bytes = store.vectors.nbytes / size
+    benchmark.extra_info['float32_bytes_per_event'] = float32_bytes
+    benchmark.extra_info['recall@10'] = index.evaluate(top_k=10)['recall']
+    # int8 stores one byte per dimension plus a float32 scale, binary one bit per dimension
+    expected = store.dimension + 4 if mode == 'int8' else -(-store.dimension // 8)
+    assert index.bytes_per_vector == expected
+    assert float32_bytes / index.bytes_per_vector >= (3.9 if mode == 'int8' else 31.9)
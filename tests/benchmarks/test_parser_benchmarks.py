@@ -0,0 +1,32 @@
+"""
+Benchmarks for agent command parsing
+
+Deselected by default like the learning benchmarks; see
+test_learning_benchmarks.py for how to run them and gate regressions.
+"""
+import pytest
+from agents.command_parser import AgentCommandParser
+
+pytestmark = pytest.mark.benchmark
+
+# Structured commands, free-form commands, unknown agents and plain chat
+SAMPLE_MESSAGES = [
+    '@GitHub create_pull_request repo_name=owner/repo base_branch=main '
+    'head_branch=feature/x title="Agent update"',
+    '@Docker list_images dangling=false',
+    '@Terraform plan directory=/infra',
+    '@Scribe generate code for a Flask microservice',
+    '@Unknown do something',
+    'plain chat message without a mention'
+]
+
+@pytest.mark.benchmark(group='parser')
+def test_parse_many_throughput(benchmark):
+    """Parse 120k mixed messages per round"""
+    parser = AgentCommandParser()
+    messages = SAMPLE_MESSAGES * 20_000
+
+    parsed = benchmark(lambda: sum(1 for _ in parser.parse_many(messages)))
+
+    assert parsed == 4 * 20_000
+    benchmark.extra_info['messages_per_round'] = len(messages)
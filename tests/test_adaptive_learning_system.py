@@ -1,7 +1,7 @@
 import pytest
 import os
 from datetime import datetime
-from src.learning.systems.adaptive import RapidAdaptiveLearningSystem
+from learning.systems.adaptive import RapidAdaptiveLearningSystem
 
 @pytest.fixture
 def learning_system():
@@ -0,0 +1,71 @@
+import threading
+import time
+import pytest
+from agents.command_parser import AgentCommandParser
+from agents.command_dispatcher import AgentCommandDispatcher
+
+@pytest.fixture
+def parser():
+    """Fixture to create a parser with the default agent table"""
+    return AgentCommandParser()
+
+def test_same_target_commands_stay_ordered(parser):
+    """Test commands for one repository execute in submission order"""
+    executed = []
+    
+    def record(command):
+        time.sleep(0.01)
+        executed.append(command['kwargs']['issue_number'])
+        return {'status': 'success'}
+    
+    with AgentCommandDispatcher(max_workers=4, backends={'GitHub': record}) as dispatcher:
+        futures = dispatcher.dispatch_many(parser.parse_many(
+            f'@GitHub add_comment repo_name=owner/repo issue_number={i}' for i in range(5)
+        ))
+        results = [future.result(timeout=5) for future in futures]
+    
+    assert executed == list(range(5))
+    assert all(result['status'] == 'success' for result in results)
+
+def test_independent_targets_run_in_parallel(parser):
+    """Test commands for different stacks overlap"""
+    barrier = threading.Barrier(2, timeout=5)
+    
+    def plan(command):
+        barrier.wait()
+        return {'status': 'success'}
+    
+    with AgentCommandDispatcher(max_workers=2, backends={'Terraform': plan}) as dispatcher:
+        futures = dispatcher.dispatch_many([
+            parser.parse('@Terraform plan directory=/infra/a'),
+            parser.parse('@Terraform plan directory=/infra/b')
+        ])
+        
+        assert all(future.result(timeout=5)['status'] == 'success' for future in futures)
+
+def test_backpressure_and_unknown_handlers(parser):
+    """Test saturated backends reject submissions after the timeout"""
+    release = threading.Event()
+    
+    def block(command):
+        release.wait(5)
+        return {'status': 'success'}
+    
+    with AgentCommandDispatcher(max_pending=1, backends={'Docker': block}) as dispatcher:
+        dispatcher.dispatch(parser.parse('@Docker list_images'))
+        
+        with pytest.raises(TimeoutError):
+            dispatcher.dispatch(parser.parse('@Docker list_images'), timeout=0.05)
+        
+        missing = dispatcher.dispatch(parser.parse('@Scribe generate code'))
+        assert missing.result()['status'] == 'error'
+        release.set()
+
+def test_tool_commands_reject_positional_arguments(parser):
+    """Test positional arguments are reported instead of silently dropped"""
+    with AgentCommandDispatcher() as dispatcher:
+        result = dispatcher.dispatch(parser.parse('@Docker remove_container abc force=true'))
+        result = result.result(timeout=5)
+    
+    assert result['status'] == 'error'
+    assert 'positional abc' in result['error_message']
@@ -0,0 +1,80 @@
+import pytest
+from agents.command_parser import AgentCommandParser
+
+@pytest.fixture
+def parser():
+    """Fixture to create a parser with the default agent table"""
+    return AgentCommandParser()
+
+def test_parse_structured_arguments(parser):
+    """Test key=value and positional tokenizing"""
+    parsed = parser.parse(
+        '@GitHub add_comment owner/repo issue_number=42 comment="Automated review complete"'
+    )
+    
+    assert parsed['agent'] == 'GitHub'
+    assert parsed['command'] == 'add_comment'
+    assert parsed['args'] == ['owner/repo']
+    assert parsed['kwargs'] == {'issue_number': 42, 'comment': 'Automated review complete'}
+
+def test_parse_free_form_command(parser):
+    """Test natural-language commands keep their raw text"""
+    parsed = parser.parse('@scribe generate code for a Flask microservice')
+    
+    assert parsed['agent'] == 'Scribe'
+    assert parsed['raw'] == 'generate code for a Flask microservice'
+
+def test_unknown_agents_rejected(parser):
+    """Test agents missing from the lookup table are rejected"""
+    assert parser.parse('@Nobody do something') is None
+    assert parser.parse('no mention here') is None
+    
+    parser.register_agent('Nobody')
+    assert parser.parse('@Nobody do something')['agent'] == 'Nobody'
+
+def test_parse_many_stream(parser):
+    """Test bulk parsing from a generator"""
+    messages = (
+        line for line in [
+            '@Docker list_images dangling=false',
+            'plain chat message',
+            '@Terraform plan directory=/infra'
+        ]
+    )
+    
+    parsed = list(parser.parse_many(messages))
+    
+    assert [command['agent'] for command in parsed] == ['Docker', 'Terraform']
+    assert parsed[0]['kwargs'] == {'dangling': False}
+
+def test_parse_many_fixed_corpus(parser):
+    """Test every result of a mixed corpus, keeping invalid messages as None"""
+    corpus = [
+        '@GitHub create_pull_request repo_name=owner/repo base_branch=main '
+        'head_branch=feature/x title="Agent update"',
+        '@Docker list_images dangling=false',
+        '@Terraform plan directory=/infra',
+        '@Scribe generate code for a Flask microservice',
+        '@Unknown do something',
+        'plain chat message without a mention'
+    ]
+
+    parsed = list(parser.parse_many(corpus, skip_invalid=False))
+
+    assert [command and (command['agent'], command['command']) for command in parsed] == [
+        ('GitHub', 'create_pull_request'),
+        ('Docker', 'list_images'),
+        ('Terraform', 'plan'),
+        ('Scribe', 'generate'),
+        None,
+        None
+    ]
+    assert parsed[0]['kwargs'] == {
+        'repo_name': 'owner/repo',
+        'base_branch': 'main',
+        'head_branch': 'feature/x',
+        'title': 'Agent update'
+    }
+    assert parsed[2]['kwargs'] == {'directory': '/infra'}
+    assert parsed[3]['raw'] == 'generate code for a Flask microservice'
+    assert list(parser.parse_many(corpus * 3)) == [c for c in parsed * 3 if c is not None]
@@ -0,0 +1,121 @@
+import threading
+import pytest
+from agents.workflow import Output, Step, Workflow, WorkflowCache, WorkflowRunner
+
+class FakeToolkit:
+    """Toolkit double recording which steps executed"""
+    
+    def __init__(self):
+        self.calls = []
+        self.barrier = threading.Barrier(2, timeout=5)
+    
+    def docker_build_image(self, dockerfile_path, image_name, tag='latest'):
+        self.barrier.wait()
+        self.calls.append('build')
+        return {'image_id': f'sha256:{image_name}', 'status': 'success'}
+    
+    def terraform_deploy(self, terraform_dir, action='apply'):
+        if action == 'plan':
+            self.barrier.wait()
+        self.calls.append(action)
+        return {'action_output': f'{action} {terraform_dir}', 'status': 'success'}
+    
+    def docker_deploy_container(self, image_name, container_config):
+        self.calls.append(f'deploy {image_name}')
+        return {'container_id': 'c1', 'status': 'success'}
+
+def pipeline(source_dir):
+    return Workflow([
+        Step(
+            'image', 'docker_build_image',
+            {'dockerfile_path': str(source_dir), 'image_name': 'app'},
+            outputs=['image_id'], sources=[str(source_dir)], cache=True
+        ),
+        Step(
+            'plan', 'terraform_deploy', {'terraform_dir': '/infra', 'action': 'plan'},
+            cache=True
+        ),
+        Step(
+            'deploy', 'docker_deploy_container',
+            {'image_name': Output('image', 'image_id'), 'container_config': {}},
+            outputs=['container_id'], after=['plan']
+        )
+    ])
+
+def test_independent_steps_run_concurrently_and_pass_outputs(tmp_path):
+    """Test build and plan overlap and the deploy receives the image id"""
+    toolkit = FakeToolkit()
+    result = WorkflowRunner(toolkit).run(pipeline(tmp_path))
+    
+    assert result['status'] == 'success'
+    assert toolkit.calls[-1] == 'deploy sha256:app'
+    assert result['steps']['deploy']['outputs'] == {'container_id': 'c1'}
+
+def test_unchanged_steps_are_served_from_the_cache(tmp_path):
+    """Test re-runs skip cached steps whose inputs and sources are unchanged"""
+    cache = WorkflowCache(str(tmp_path / 'cache'))
+    source_dir = tmp_path / 'app'
+    source_dir.mkdir()
+    (source_dir / 'Dockerfile').write_text('FROM python:3.11\n')
+    
+    first = FakeToolkit()
+    WorkflowRunner(first, cache=cache).run(pipeline(source_dir))
+    assert len(first.calls) == 3
+    
+    # A new process reading the same cache directory only repeats the deploy,
+    # which did not opt into caching
+    second = FakeToolkit()
+    result = WorkflowRunner(second, cache=WorkflowCache(cache.directory)).run(pipeline(source_dir))
+    assert second.calls == ['deploy sha256:app']
+    assert result['steps']['image']['cached'] and result['steps']['plan']['cached']
+    assert not result['steps']['deploy']['cached']
+    
+    # Changing the image sources rebuilds it
+    (source_dir / 'Dockerfile').write_text('FROM python:3.12\n')
+    third = FakeToolkit()
+    result = WorkflowRunner(third, cache=cache).run(pipeline(source_dir), force=['plan'])
+    assert sorted(third.calls) == ['build', 'deploy sha256:app', 'plan']
+
+def test_failures_skip_downstream_steps_only():
+    """Test a failed step skips its dependents while other branches finish"""
+    def failing(**inputs):
+        raise RuntimeError('boom')
+    
+    workflow = Workflow([
+        Step('a', failing, outputs=['value']),
+        Step('b', lambda value: {'status': 'success'}, {'value': Output('a', 'value')}),
+        Step('c', lambda: {'status': 'success'})
+    ])
+    result = WorkflowRunner(None).run(workflow)
+    
+    assert result['status'] == 'failed'
+    assert result['steps']['a']['result']['error'] == 'boom'
+    assert result['steps']['b']['status'] == 'skipped'
+    assert result['steps']['c']['status'] == 'success'
+
+def test_non_dict_results_fail_the_step():
+    """Test that an action returning a non-dict fails its step instead of the run"""
+    workflow = Workflow([
+        Step('none', lambda: None, outputs=['value'], cache=True),
+        Step('after', lambda: {'status': 'success'}, after=['none']),
+        Step('other', lambda: {'status': 'success'}, cache=True)
+    ])
+    cache = WorkflowCache()
+    result = WorkflowRunner(None, cache=cache).run(workflow)
+    
+    assert result['status'] == 'failed'
+    assert result['steps']['none']['status'] == 'failed'
+    assert 'NoneType' in result['steps']['none']['result']['error']
+    assert result['steps']['after']['status'] == 'skipped'
+    assert result['steps']['other']['status'] == 'success'
+    assert cache.stats()['entries'] == 1
+
+def test_invalid_workflows_are_rejected():
+    """Test cycles, unknown steps and undeclared outputs"""
+    noop = lambda **inputs: {'status': 'success'}
+    with pytest.raises(ValueError, match='cycle'):
+        Workflow([Step('a', noop, after=['b']), Step('b', noop, after=['a'])])
+    with pytest.raises(ValueError, match='unknown step'):
+        Workflow([Step('a', noop, after=['missing'])])
+    with pytest.raises(ValueError, match='does not output'):
+        Workflow([Step('a', noop), Step('b', noop, {'x': Output('a', 'x')})])
@@ -0,0 +1,108 @@
+import subprocess
+import pytest
+from agents.changeset_review import git_changed_lines, review_changeset
+from agents.code_review import CodeReviewEngine, ComplexityCheck
+
+SAMPLE_CODE = '''
+import os
+import json
+
+def load(path):
+    unused = 1
+    try:
+        return eval(open(path).read())
+    except:
+        os.system("rm -rf /tmp/cache")
+'''
+
+@pytest.fixture
+def engine():
+    """Fixture to create a review engine with default checks"""
+    return CodeReviewEngine()
+
+def test_detects_common_issues(engine):
+    """Test each default check reports on the sample"""
+    findings = engine.review(SAMPLE_CODE)
+    checks = {(finding['check'], finding['line']) for finding in findings}
+    
+    assert ('unused-name', 3) in checks  # import json
+    assert ('unused-name', 6) in checks  # unused local
+    assert ('dangerous-call', 8) in checks  # eval
+    assert ('bare-except', 9) in checks
+    assert ('dangerous-call', 10) in checks  # os.system
+    assert ('unused-name', 2) not in checks  # os is used
+
+def test_complexity_threshold():
+    """Test functions above the complexity limit are flagged"""
+    branches = '\n'.join(f'    if x == {i}:\n        return {i}' for i in range(5))
+    engine = CodeReviewEngine(checks=[ComplexityCheck(max_complexity=3)])
+    
+    findings = engine.review(f'def branchy(x):\n{branches}\n')
+    
+    assert len(findings) == 1
+    assert 'complexity 6' in findings[0]['message']
+
+def test_clean_code_and_syntax_errors(engine):
+    """Test clean code yields nothing and broken code yields a syntax finding"""
+    assert engine.review('def add(a, b):\n    return a + b\n') == []
+    assert engine.review('def broken(:\n')[0]['check'] == 'syntax'
+
+def test_results_cached_by_content_hash(engine):
+    """Test repeated reviews of unchanged code skip analysis"""
+    engine.review(SAMPLE_CODE)
+    engine._analyze = None  # a second analysis would fail
+    
+    assert len(engine.review(SAMPLE_CODE)) > 0
+
+def test_review_changeset_reports_only_changed_hunks(tmp_path):
+    """Test changeset review against a base revision, across worker processes"""
+    def git(*args):
+        subprocess.run(['git', *args], cwd=tmp_path, check=True, capture_output=True)
+    
+    git('init', '-q')
+    git('config', 'user.email', 'test@example.com')
+    git('config', 'user.name', 'test')
+    (tmp_path / 'legacy.py').write_text('import os\n\ndef old():\n    eval("1")\n')
+    (tmp_path / 'other.py').write_text('x = 1\n')
+    git('add', '.')
+    git('commit', '-q', '-m', 'base')
+    
+    (tmp_path / 'legacy.py').write_text('import os\n\ndef old():\n    eval("1")\n    exec("2")\n')
+    (tmp_path / 'other.py').write_text('x = 1\ntry:\n    pass\nexcept:\n    pass\n')
+    (tmp_path / 'new.py').write_text('import sys\n')
+    (tmp_path / '.gitignore').write_text('ignored.py\n')
+    (tmp_path / 'ignored.py').write_text('import sys\n')
+    
+    results = dict(review_changeset(str(tmp_path), base='HEAD', max_workers=2))
+    
+    legacy = results[str(tmp_path / 'legacy.py')]
+    assert [finding['line'] for finding in legacy] == [5]
+    assert results[str(tmp_path / 'other.py')][0]['check'] == 'bare-except'
+    assert results[str(tmp_path / 'new.py')][0]['line'] == 1
+    assert str(tmp_path / 'ignored.py') not in results
+
+def test_changed_lines_with_unusual_paths_and_prefix_config(tmp_path):
+    """Test non-ASCII, spaced and quoted names with noprefix/mnemonicPrefix configured"""
+    def git(*args):
+        subprocess.run(['git', *args], cwd=tmp_path, check=True, capture_output=True)
+    
+    git('init', '-q')
+    git('config', 'user.email', 'test@example.com')
+    git('config', 'user.name', 'test')
+    git('config', 'core.quotePath', 'true')
+    git('config', 'diff.noprefix', 'true')
+    git('config', 'diff.mnemonicPrefix', 'true')
+    names = ['café.py', 'two words.py', 'say "hi".py']
+    for name in names:
+        (tmp_path / name).write_text('x = 1\n')
+    git('add', '.')
+    git('commit', '-q', '-m', 'base')
+    
+    for name in names:
+        (tmp_path / name).write_text('x = 1\ny = 2\n')
+    (tmp_path / 'naïve new.py').write_text('import sys\n')
+    
+    assert git_changed_lines(str(tmp_path)) == {
+        **{str(tmp_path / name): {2} for name in names},
+        str(tmp_path / 'naïve new.py'): {1}
+    }
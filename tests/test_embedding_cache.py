@@ -0,0 +1,96 @@
+import threading
+import numpy as np
+import pytest
+from learning.batching import MicroBatchingEmbedder
+from learning.embedding import HashingEmbedder
+from learning.embedding_cache import CachedEmbedder, EmbeddingCache
+from learning.systems.adaptive import RapidAdaptiveLearningSystem
+
+class CountingEmbedder(HashingEmbedder):
+    """Hashing embedder that records every batch it is asked to embed"""
+
+    def __init__(self):
+        super().__init__(dimension=32)
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return super().embed(texts)
+
+def test_cache_embeds_each_text_once():
+    """Test that repeated and duplicate content is served from the cache"""
+    base = CountingEmbedder()
+    embedder = CachedEmbedder(base)
+
+    first = embedder.embed(['alpha', 'beta', 'alpha'])
+    second = embedder.embed(['beta'])
+
+    assert base.calls == [['alpha', 'beta']]
+    np.testing.assert_array_equal(first[0], first[2])
+    np.testing.assert_array_equal(first[1], second[0])
+
+def test_disk_cache_survives_new_instance(tmp_path):
+    """Test that vectors written to disk are reused by a fresh cache"""
+    CachedEmbedder(CountingEmbedder(), EmbeddingCache(directory=str(tmp_path))).embed(['gamma'])
+
+    base = CountingEmbedder()
+    cache = EmbeddingCache(directory=str(tmp_path))
+    vector = CachedEmbedder(base, cache).embed(['gamma'])
+
+    assert base.calls == []
+    assert cache.stats()['disk_hits'] == 1
+    assert vector.shape == (1, 32)
+
+def test_micro_batcher_coalesces_concurrent_calls():
+    """Test that concurrent callers share one embedding batch"""
+    base = CountingEmbedder()
+    barrier = threading.Barrier(8)
+    results = {}
+
+    with MicroBatchingEmbedder(base, max_wait=0.2) as batcher:
+        def embed(i):
+            barrier.wait()
+            results[i] = batcher.embed([f'text {i}'])
+
+        threads = [threading.Thread(target=embed, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(base.calls) < 8
+    for i in range(8):
+        np.testing.assert_array_equal(results[i], base.embed([f'text {i}']))
+
+def test_micro_batcher_propagates_errors():
+    """Test that an embedding failure reaches the caller"""
+    class FailingEmbedder:
+        def embed(self, texts):
+            raise RuntimeError('model unavailable')
+
+    with MicroBatchingEmbedder(FailingEmbedder(), max_wait=0) as batcher:
+        with pytest.raises(RuntimeError):
+            batcher.embed(['text'])
+
+def test_micro_batcher_close_stops_worker():
+    """Test that close() stops the worker thread and rejects later calls"""
+    batcher = MicroBatchingEmbedder(CountingEmbedder(), max_wait=0)
+    batcher.embed(['text'])
+    worker = batcher._worker
+    assert worker.is_alive()
+
+    batcher.close()
+    assert not worker.is_alive()
+    with pytest.raises(RuntimeError):
+        batcher.embed(['text'])
+
+def test_learning_system_with_batching():
+    """Test recording through the micro-batcher and cache"""
+    system = RapidAdaptiveLearningSystem(embedder=HashingEmbedder(dimension=64), batch_window=0.001)
+    system.record_learning_event('def process_data(input_params):')
+    system.record_learning_event('def process_data(input_params):')
+
+    results = system.find_similar_events('def process_data(input_params):', top_k=2)
+    assert len(results) == 2
+    assert system.embedder.cache.stats()['hits'] >= 2
+    system.close()
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+from ethics.scoring import SCENARIO_SCORE_DTYPE, ScenarioScoringEngine
+
+def test_scoring_engine_is_reproducible():
+    """Test that the same seed gives the same scores and thresholds match the risk levels"""
+    first = ScenarioScoringEngine(seed=7).score(1000)
+    second = ScenarioScoringEngine(seed=7).score(1000)
+
+    assert first.dtype == SCENARIO_SCORE_DTYPE
+    np.testing.assert_array_equal(first, second)
+
+    expected = np.where(
+        first['risk_score'] > 0.7, 2, np.where(first['risk_score'] > 0.4, 1, 0)
+    )
+    np.testing.assert_array_equal(first['risk_level'], expected)
+
+def test_monte_carlo_sweep():
+    """Test that a 100k-scenario sweep summarizes the distribution quickly"""
+    summary = ScenarioScoringEngine(seed=0).monte_carlo_sweep(100_000)
+
+    assert summary['scenarios'] == 100_000
+    assert sum(summary['risk_levels'].values()) == pytest.approx(1.0)
+    assert summary['means']['risk_score'] == pytest.approx(0.5, abs=0.01)
+    assert summary['seconds'] < 5
@@ -0,0 +1,184 @@
+import threading
+import numpy as np
+import pytest
+from learning.ann import IVFIndex
+from learning.embedding import HashingEmbedder
+from learning.persistence import EventLog, PersistentEventStore
+from learning.systems.adaptive import RapidAdaptiveLearningSystem
+
+def make_system(directory, **kwargs):
+    return RapidAdaptiveLearningSystem(
+        embedder=HashingEmbedder(dimension=64),
+        storage_dir=str(directory),
+        **kwargs
+    )
+
+def test_events_survive_reopen(tmp_path):
+    """Test that a reopened store serves events without re-embedding"""
+    system = make_system(tmp_path)
+    event_id = system.record_learning_event(
+        'terraform plan failed on missing provider',
+        metadata={'agent': 'Keeper'}
+    )
+    system.record_learning_event('docker build cache miss', metadata={'agent': 'Watcher'})
+    system.close()
+
+    reopened = make_system(tmp_path)
+    results = reopened.find_similar_events('terraform provider', top_k=1)
+    assert results[0]['id'] == event_id
+    assert results[0]['metadata'] == {'agent': 'Keeper'}
+    assert len(reopened.backend) == 2
+    reopened.close()
+
+def test_single_writer_and_live_reader(tmp_path):
+    """Test the writer lock and that readers pick up new commits"""
+    writer = make_system(tmp_path)
+    writer.record_learning_event('first event about terraform')
+
+    with pytest.raises(RuntimeError):
+        make_system(tmp_path)
+
+    reader = make_system(tmp_path, readonly=True)
+    assert len(reader.find_similar_events('terraform', top_k=5)) == 1
+
+    writer.record_learning_event('second event about terraform')
+    assert len(reader.find_similar_events('terraform', top_k=5)) == 2
+    with pytest.raises(PermissionError):
+        reader.record_learning_event('readers cannot write')
+
+    reader.close()
+    writer.close()
+
+def test_forget_and_compaction(tmp_path):
+    """Test that deleted events disappear and compaction rewrites the store"""
+    system = make_system(tmp_path)
+    ids = [system.record_learning_event(f'event number {i}') for i in range(8)]
+
+    assert system.forget_event(ids[0])
+    assert not system.forget_event(ids[0])
+    assert system.backend.storage.generation == 0
+
+    system.forget_event(ids[1])
+    # 2 of 8 rows deleted reaches the default 25% compaction ratio
+    assert system.backend.storage.generation == 1
+    assert len(system.backend.storage) == 6
+
+    remaining = {event['id'] for event in system.find_similar_events('event number', top_k=10)}
+    assert remaining == set(ids[2:])
+    system.close()
+
+def test_forget_keeps_rows_across_compactions(tmp_path, monkeypatch):
+    """Test that forget() resolves ids without rescanning the log, also after compaction"""
+    system = make_system(tmp_path)
+    ids = [system.record_learning_event(f'event number {i}') for i in range(12)]
+    scans = []
+    iter_range = EventLog.iter_range
+    monkeypatch.setattr(
+        EventLog, 'iter_range', lambda log, *args: scans.append(args) or iter_range(log, *args)
+    )
+
+    for event_id in ids[:6]:
+        assert system.forget_event(event_id)
+    ids.append(system.record_learning_event('event number 12'))
+
+    assert system.backend.storage.generation == 2
+    assert len(scans) == 1
+    for event_id in ids[6:9]:
+        assert system.forget_event(event_id)
+    remaining = {event['id'] for event in system.find_similar_events('event number', top_k=20)}
+    assert remaining == set(ids[9:])
+    assert len(scans) == 1
+    system.close()
+
+def test_query_reads_events_of_a_compacted_generation(tmp_path):
+    """Test that a query in flight during compaction returns the events it matched"""
+    system = make_system(tmp_path)
+    ids = [system.record_learning_event(f'event number {i}') for i in range(4)]
+    store = system.backend.store
+    matched, release = threading.Event(), threading.Event()
+    search = store.search
+
+    def paused_search(*args, **kwargs):
+        result = search(*args, **kwargs)
+        matched.set()
+        release.wait(5)
+        return result
+
+    store.search = paused_search
+    results = []
+    query = threading.Thread(
+        target=lambda: results.extend(system.find_similar_events('event number', top_k=4))
+    )
+    query.start()
+    assert matched.wait(5)
+    system.forget_event(ids[0])
+    assert system.backend.storage.generation == 1
+    # The old generation's descriptor must not be reused for another file meanwhile
+    with open(tmp_path / 'unrelated.log', 'w') as unrelated:
+        unrelated.write('{"id": "unrelated"}\n' * 64)
+        release.set()
+        query.join(5)
+
+    assert {event['id'] for event in results} == set(ids)
+    system.close()
+
+def test_uncommitted_append_is_discarded(tmp_path):
+    """Test that bytes written after the last manifest commit are dropped on reopen"""
+    store = PersistentEventStore(str(tmp_path))
+    store.append([{'id': 'a', 'metadata': {}}], np.ones((1, 4), dtype=np.float32))
+    # Simulate a crash after writing the log but before committing the manifest
+    store.events.append([{'id': 'b', 'metadata': {}}])
+    store.close()
+
+    reopened = PersistentEventStore(str(tmp_path))
+    assert len(reopened) == 1
+    assert [event['id'] for event in reopened.events] == ['a']
+    reopened.append([{'id': 'c', 'metadata': {}}], np.ones((1, 4), dtype=np.float32))
+    assert reopened.events[1]['id'] == 'c'
+    reopened.close()
+
+def test_uncommitted_delete_is_discarded(tmp_path):
+    """Test that deletions written after the last manifest commit are dropped on reopen"""
+    store = PersistentEventStore(str(tmp_path))
+    store.append(
+        [{'id': str(i), 'metadata': {}} for i in range(4)],
+        np.ones((4, 4), dtype=np.float32)
+    )
+    store.delete([0])
+    # Simulate a crash after writing a deletion but before committing the manifest
+    with open(store._path('deleted', 'i64'), 'ab') as handle:
+        handle.write(np.asarray([3], dtype=np.int64).tobytes())
+    store.close()
+
+    reopened = PersistentEventStore(str(tmp_path))
+    assert reopened.deleted == {0}
+    reopened.delete([1])
+    reopened.close()
+
+    reader = PersistentEventStore(str(tmp_path), readonly=True)
+    assert reader.deleted == {0, 1}
+    reader.close()
+
+def test_ivf_index_is_reloaded_without_retraining(tmp_path, monkeypatch):
+    """Test that a trained IVF index is saved on close and restored on open"""
+    options = {'train_threshold': 16, 'n_lists': 4}
+    system = make_system(tmp_path, index_type='ivf', index_options=options)
+    for i in range(40):
+        system.record_learning_event(f'event {i} about terraform module {i % 5}')
+    assert system.backend.index.wait_for_training(timeout=30)
+    expected = [event['id'] for event in system.find_similar_events('terraform module 3')]
+    assert system.backend.index.is_trained
+    system.close()
+
+    retrained = []
+    monkeypatch.setattr(IVFIndex, '_train', lambda index, size: retrained.append(size))
+    reopened = make_system(tmp_path, index_type='ivf', index_options=options)
+    assert reopened.backend.index.is_trained
+    assert [event['id'] for event in reopened.find_similar_events('terraform module 3')] \
+        == expected
+
+    # Rows committed after the save are assigned to the restored lists
+    reopened.record_learning_event('event 40 about terraform module 3')
+    assert len(reopened.find_similar_events('terraform module 3', top_k=50)) == 41
+    reopened.close()
+    assert retrained == []
@@ -0,0 +1,147 @@
+import datetime
+import pytest
+from github import GithubException, RateLimitExceededException
+from tools.github_token_pool import GitHubQuotaExhausted, GitHubTokenPool
+from tools.github_tool import GitHubTool
+
+class FakeRequester:
+    def __init__(self):
+        self.rate_limiting = (-1, -1)
+        self.rate_limiting_resettime = 0
+
+class FakeClient:
+    """Client double whose responses report a rate-limit window"""
+    
+    def __init__(self, token):
+        self.token = token
+        self.requester = FakeRequester()
+        self.exhausted = False
+    
+    def get_repo(self, name):
+        if self.exhausted:
+            raise RateLimitExceededException(
+                403, {'message': 'API rate limit exceeded'},
+                {'x-ratelimit-remaining': '0', 'x-ratelimit-reset': '5000'}
+            )
+        remaining = {'a': 100, 'b': 4000}.get(self.token, 5000)
+        self.requester.rate_limiting = (remaining, 5000)
+        self.requester.rate_limiting_resettime = 3600
+        return (self.token, name)
+
+class FakeAuthorization:
+    def __init__(self, token, expires_at):
+        self.token = token
+        self.expires_at = expires_at
+
+class FakeIntegration:
+    """GitHub App double issuing one-hour installation tokens"""
+    
+    def __init__(self, clock):
+        self.clock = clock
+        self.issued = 0
+    
+    def get_access_token(self, installation_id):
+        self.issued += 1
+        expires_at = datetime.datetime.fromtimestamp(
+            self.clock() + 3600, tz=datetime.timezone.utc
+        )
+        return FakeAuthorization(f'installation-{installation_id}-{self.issued}', expires_at)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+def test_calls_go_to_the_token_with_most_headroom():
+    """Test quota observed from responses steers later calls"""
+    pool = GitHubTokenPool(tokens=['a', 'b'], client_factory=FakeClient, clock=FakeClock())
+    
+    # Unobserved tokens are spread by the per-call reservation
+    first = pool.call(lambda client: client.get_repo('owner/repo'))
+    second = pool.call(lambda client: client.get_repo('owner/repo'))
+    assert {first[0], second[0]} == {'a', 'b'}
+    
+    tokens = [pool.call(lambda client: client.get_repo('owner/repo'))[0] for _ in range(3)]
+    assert tokens == ['b'] * 3
+    assert pool.stats()['token-0']['remaining'] == 100
+    assert pool.headroom() == 100 + 4000
+
+def test_rate_limited_tokens_are_parked_until_reset():
+    """Test a call rotates away from an exhausted token"""
+    clock = FakeClock()
+    pool = GitHubTokenPool(tokens=['a', 'b'], client_factory=FakeClient, clock=clock)
+    pool.credentials[0].remaining = 10
+    pool.credentials[1].client.exhausted = True
+    
+    assert pool.call(lambda client: client.get_repo('owner/repo'))[0] == 'a'
+    assert pool.credentials[1].remaining == 0 and pool.credentials[1].reset_at == 5000
+    
+    pool.credentials[0].client.exhausted = True
+    with pytest.raises(RateLimitExceededException):
+        pool.call(lambda client: client.get_repo('owner/repo'))
+    
+    # Both parked: fail fast without spending a request
+    clock.now = 4000
+    attempts = []
+    with pytest.raises(GitHubQuotaExhausted) as error:
+        pool.call(lambda client: attempts.append(client))
+    assert attempts == []
+    assert error.value.retry_after == 1000
+    assert isinstance(error.value, LookupError)
+    
+    clock.now = 5000
+    pool.credentials[1].client.exhausted = False
+    assert pool.call(lambda client: client.get_repo('owner/repo'))[0] == 'b'
+
+def test_client_access_does_not_reserve_requests():
+    """Test that reading a client leaves every credential's quota untouched"""
+    pool = GitHubTokenPool(tokens=['a', 'b'], client_factory=FakeClient, clock=FakeClock())
+    pool.credentials[1].remaining = 20
+    before = pool.stats()
+    
+    clients = [pool.client() for _ in range(5)] + [GitHubTool(pool=pool).client]
+    
+    assert [client.token for client in clients] == ['a'] * 6
+    assert pool.stats() == before
+
+def test_installation_tokens_are_scoped_cached_and_refreshed():
+    """Test GitHub App installation tokens per account"""
+    clock = FakeClock()
+    integration = FakeIntegration(clock)
+    pool = GitHubTokenPool(
+        installations={'Acme': 7},
+        integration=integration,
+        client_factory=FakeClient,
+        clock=clock
+    )
+    
+    assert pool.call(lambda client: client.token, owner='acme') == 'installation-7-1'
+    clock.now += 3000
+    assert pool.call(lambda client: client.token, owner='acme') == 'installation-7-1'
+    clock.now += 400
+    assert pool.call(lambda client: client.token, owner='acme') == 'installation-7-2'
+    assert integration.issued == 2
+    
+    with pytest.raises(LookupError):
+        pool.call(lambda client: client.token, owner='other')
+
+def test_non_rate_limit_errors_are_not_rotated():
+    """Test ordinary failures surface from the first credential"""
+    pool = GitHubTokenPool(tokens=['a', 'b'], client_factory=FakeClient, clock=FakeClock())
+    calls = []
+    
+    def missing(client):
+        calls.append(client.token)
+        raise GithubException(404, {'message': 'Not Found'}, {})
+    
+    with pytest.raises(GithubException):
+        pool.call(missing)
+    assert len(calls) == 1
+
+def test_pool_from_toolkit_config():
+    """Test configured tokens are deduplicated and never exposed in stats"""
+    pool = GitHubTokenPool.from_config({'github_token': 'a', 'github_tokens': ['a', 'b']})
+    assert sorted(pool.stats()) == ['token-0', 'token-1']
+    assert sorted(GitHubTokenPool.from_config({}).stats()) == ['anonymous']
@@ -0,0 +1,154 @@
+import queue
+import threading
+import time
+import pytest
+from learning.embedding import HashingEmbedder
+from learning.ingestion import IngestionPipeline
+from learning.systems.adaptive import RapidAdaptiveLearningSystem
+
+class RecordingBackend:
+    """Backend that records each batched write"""
+
+    def __init__(self, delay=0.0):
+        self.batches = []
+        self.delay = delay
+        self.release = threading.Event()
+        self.release.set()
+
+    def add(self, events, vectors):
+        self.release.wait()
+        time.sleep(self.delay)
+        self.batches.append([event['id'] for event in events])
+
+def event(i):
+    return {'id': f'event-{i}', 'content': f'learning event {i}', 'metadata': {}}
+
+def test_submit_is_fire_and_forget_and_flush_is_a_barrier():
+    """Test that submits return before the write and flush waits for it"""
+    backend = RecordingBackend(delay=0.05)
+    pipeline = IngestionPipeline(HashingEmbedder(dimension=16), backend, max_wait=0.01)
+
+    start = time.perf_counter()
+    ids = [pipeline.submit(event(i)) for i in range(100)]
+    assert time.perf_counter() - start < 0.05
+
+    assert pipeline.flush(timeout=5)
+    written = [event_id for batch in backend.batches for event_id in batch]
+    assert written == ids
+    assert len(backend.batches) < 100
+    pipeline.close()
+
+def test_bounded_queue_applies_backpressure():
+    """Test that a full queue blocks and then raises queue.Full"""
+    backend = RecordingBackend()
+    backend.release.clear()
+    pipeline = IngestionPipeline(
+        HashingEmbedder(dimension=16),
+        backend,
+        max_queue=2,
+        batch_size=1,
+        put_timeout=0.05
+    )
+
+    with pytest.raises(queue.Full):
+        for i in range(10):
+            pipeline.submit(event(i))
+
+    backend.release.set()
+    assert pipeline.flush(timeout=5)
+    assert pipeline.stats()['pending'] == 0
+    pipeline.close()
+
+def test_flush_does_not_wait_for_rejected_submits():
+    """Test that a submit failing with queue.Full is not part of a concurrent flush"""
+    backend = RecordingBackend()
+    backend.release.clear()
+    pipeline = IngestionPipeline(
+        HashingEmbedder(dimension=16),
+        backend,
+        max_queue=1,
+        batch_size=1,
+        max_wait=0,
+        put_timeout=0.2
+    )
+    pipeline.submit(event(0))
+    while pipeline.stats()['queued']:
+        time.sleep(0.001)
+    pipeline.submit(event(1))
+
+    rejected = []
+    def overflow():
+        with pytest.raises(queue.Full):
+            pipeline.submit(event(2))
+        rejected.append(2)
+    submitter = threading.Thread(target=overflow)
+    submitter.start()
+    time.sleep(0.05)
+    flushed = []
+    flusher = threading.Thread(target=lambda: flushed.append(pipeline.flush(timeout=5)))
+    flusher.start()
+
+    submitter.join(5)
+    backend.release.set()
+    flusher.join(10)
+    assert rejected == [2]
+    assert flushed == [True]
+    pipeline.close()
+
+def test_failed_batches_are_reported():
+    """Test that write failures surface through errors() and flush still returns"""
+    class FailingBackend:
+        def add(self, events, vectors):
+            raise RuntimeError('disk full')
+
+    pipeline = IngestionPipeline(HashingEmbedder(dimension=16), FailingBackend())
+    pipeline.submit(event(1))
+
+    assert pipeline.flush(timeout=5)
+    assert pipeline.errors() == [{'id': 'event-1', 'error': 'disk full'}]
+    assert pipeline.stats()['failed'] == 1
+    pipeline.close()
+
+def test_close_races_with_submit():
+    """Test that every submit accepted while closing is written, so flush returns"""
+    backend = RecordingBackend()
+    pipeline = IngestionPipeline(HashingEmbedder(dimension=16), backend, max_wait=0)
+    accepted = []
+
+    def submit_until_closed(worker):
+        for i in range(10_000):
+            try:
+                accepted.append(pipeline.submit(event(f'{worker}-{i}')))
+            except RuntimeError:
+                return
+
+    threads = [threading.Thread(target=submit_until_closed, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.01)
+    pipeline.close()
+    for thread in threads:
+        thread.join()
+
+    assert pipeline.flush(timeout=5)
+    assert pipeline.stats()['pending'] == 0
+    assert sorted(event_id for batch in backend.batches for event_id in batch) == sorted(accepted)
+    with pytest.raises(RuntimeError):
+        pipeline.submit(event('late'))
+
+def test_learning_system_async_ingestion():
+    """Test recording asynchronously and querying after flush"""
+    system = RapidAdaptiveLearningSystem(
+        embedder=HashingEmbedder(dimension=64),
+        async_ingestion=True
+    )
+    event_id = system.record_learning_event('terraform plan drift detected')
+    system.record_learning_event('docker image pushed')
+
+    assert system.flush(timeout=5)
+    results = system.find_similar_events('terraform drift', top_k=1)
+    assert results[0]['id'] == event_id
+
+    with pytest.raises(ValueError):
+        system.record_learning_event('')
+    system.close()
@@ -0,0 +1,95 @@
+import threading
+import numpy as np
+import pytest
+from learning.ann import IVFIndex, synthetic_vectors
+from learning.embedding import HashingEmbedder
+from learning.systems.adaptive import RapidAdaptiveLearningSystem
+from learning.vector_store import NumPyVectorStore
+
+@pytest.fixture
+def populated_store():
+    """Fixture with a clustered corpus large enough to train the index"""
+    store = NumPyVectorStore(64)
+    store.add(synthetic_vectors(5_000, 64, n_clusters=32, seed=1))
+    return store
+
+def test_untrained_index_is_exact():
+    """Test that small corpora are answered by brute force"""
+    store = NumPyVectorStore(8)
+    index = IVFIndex(store, train_threshold=100)
+    index.add(store.add(np.eye(8, dtype=np.float32)))
+
+    assert not index.is_trained
+    rows, scores = index.search(np.eye(8, dtype=np.float32)[3], top_k=1)
+    assert rows.tolist() == [3]
+    assert scores[0] == pytest.approx(1.0)
+
+def test_ivf_recall_against_exact_search(populated_store):
+    """Test that probed search finds most of the exact neighbours"""
+    index = IVFIndex(populated_store, train_threshold=1_000, nprobe=8)
+    index.add(np.arange(len(populated_store)))
+    assert index.wait_for_training(timeout=30)
+    assert index.is_trained
+
+    # Incremental inserts after training land in an inverted list
+    new_rows = populated_store.add(synthetic_vectors(100, 64, n_clusters=32, seed=2))
+    index.add(new_rows)
+    assert sum(ids.size for ids in index._lists) == len(populated_store)
+
+    queries = populated_store.vectors[::250]
+    recall = np.mean([
+        len(np.intersect1d(index.search(q, 10)[0], populated_store.search(q, 10)[0])) / 10
+        for q in queries
+    ])
+    assert recall >= 0.9
+
+def test_training_does_not_block_inserts_or_searches(populated_store):
+    """Test that training runs off-lock and catches up with rows added meanwhile"""
+    release = threading.Event()
+
+    class SlowTrainingIndex(IVFIndex):
+        def _train(self, size):
+            release.wait(10)
+            super()._train(size)
+
+    index = SlowTrainingIndex(populated_store, train_threshold=1_000)
+    index.add(np.arange(len(populated_store)))
+    index.add(populated_store.add(synthetic_vectors(100, 64, n_clusters=32, seed=2)))
+
+    assert not index.is_trained
+    assert index.search(populated_store.vectors[5_050], 1)[0].tolist() == [5_050]
+
+    release.set()
+    assert index.wait_for_training(timeout=30)
+    rows = np.sort(np.concatenate([ids.view() for ids in index._lists]))
+    np.testing.assert_array_equal(rows, np.arange(len(populated_store)))
+
+def test_ivf_respects_candidate_filter(populated_store):
+    """Test that pre-filtered searches only return allowed rows"""
+    index = IVFIndex(populated_store, train_threshold=1_000, exact_candidate_limit=100)
+    index.add(np.arange(len(populated_store)))
+    index.wait_for_training()
+    candidates = np.arange(0, len(populated_store), 2)
+
+    rows, _ = index.search(populated_store.vectors[10], 5, candidates=candidates)
+    assert len(rows) == 5
+    assert all(row % 2 == 0 for row in rows)
+
+def test_learning_system_with_ivf_index():
+    """Test the opt-in IVF backend end to end"""
+    system = RapidAdaptiveLearningSystem(
+        embedder=HashingEmbedder(dimension=64),
+        index_type='ivf',
+        index_options={'train_threshold': 1}
+    )
+    system.record_learning_event('parse terraform plan output', metadata={'agent': 'Keeper'})
+    system.record_learning_event(
+        'build docker image from dockerfile',
+        metadata={'agent': 'Watcher'}
+    )
+
+    results = system.find_similar_events('terraform plan', top_k=1)
+    assert results[0]['metadata']['agent'] == 'Keeper'
+
+    with pytest.raises(ValueError):
+        RapidAdaptiveLearningSystem(embedder=HashingEmbedder(), index_type='hnsw')
@@ -0,0 +1,188 @@
+import gc
+import os
+import sys
+import threading
+import time
+import pytest
+from tools.job_queue import JobContext, JobQueue, JobWorkerPool, run_streaming
+from tools.output_capture import CapturedOutput
+
+@pytest.fixture
+def queue(tmp_path):
+    """Fixture creating a queue in a temporary database"""
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'), lease_seconds=0.3)
+    yield queue
+    queue.close()
+
+def test_priorities_and_resource_locks(queue):
+    """Test claims follow priority and never overlap on one resource"""
+    low = queue.submit('terraform.apply', {'directory': '/infra/a'}, priority=0)
+    high = queue.submit('terraform.apply', {'directory': '/infra/b'}, priority=5)
+    same_stack = queue.submit('terraform.apply', {'directory': '/infra/b'}, priority=9)
+
+    first = queue.claim('worker-1')
+    assert first['id'] == same_stack
+    # /infra/b is locked by the running job, so the next claim skips high
+    assert queue.claim('worker-2')['id'] == low
+    assert queue.claim('worker-3') is None
+
+    queue.finish(first['id'], 'worker-1', 'succeeded', {'status': 'success'})
+    assert queue.claim('worker-3')['id'] == high
+
+def test_pool_streams_progress_and_results(queue):
+    """Test handlers report progress that can be streamed while they run"""
+    active, peak = {}, {}
+    lock = threading.Lock()
+
+    def apply(params, context):
+        resource = params['directory']
+        with lock:
+            active[resource] = active.get(resource, 0) + 1
+            peak[resource] = max(peak.get(resource, 0), active[resource])
+        context.progress('starting')
+        for i in range(3):
+            context.log(f'line {i}')
+            time.sleep(0.01)
+        with lock:
+            active[resource] -= 1
+        return {'status': 'success', 'directory': resource}
+
+    jobs = [
+        queue.submit('terraform.apply', {'directory': f'/infra/{i % 2}'}) for i in range(6)
+    ]
+    jobs.append(queue.submit('docker.build', {'image_name': 'app'}))
+    pool = JobWorkerPool(queue, {'terraform.apply': apply}, workers=4, poll_interval=0.05)
+    pool.start()
+    try:
+        events = list(queue.stream(jobs[0], timeout=10))
+        finished = [queue.wait(job_id, timeout=10) for job_id in jobs]
+    finally:
+        pool.stop(timeout=5)
+
+    lines = [event['data']['line'] for event in events if event['kind'] == 'log']
+    assert lines == ['line 0', 'line 1', 'line 2']
+    assert events[-1]['data']['status'] == 'succeeded'
+    assert [job['status'] for job in finished[:-1]] == ['succeeded'] * 6
+    assert finished[-1]['status'] == 'failed'
+    assert 'No handler' in finished[-1]['error']
+    assert max(peak.values()) == 1
+
+def test_abandoned_jobs_are_recovered(queue):
+    """Test a dead worker's job is requeued, then failed once out of attempts"""
+    retried = queue.submit('terraform.apply', {'directory': '/infra'}, max_attempts=2)
+    queue.claim('dead-worker')
+    time.sleep(0.4)
+    assert queue.recover_expired() == 1
+    assert queue.get(retried)['status'] == 'queued'
+
+    pool = JobWorkerPool(queue, {'terraform.apply': lambda params, context: {'status': 'success'}})
+    pool.start()
+    try:
+        job = queue.wait(retried, timeout=10)
+    finally:
+        pool.stop(timeout=5)
+    assert (job['status'], job['attempts']) == ('succeeded', 2)
+
+    exhausted = queue.submit('terraform.apply', {'directory': '/infra'}, max_attempts=1)
+    queue.claim('dead-worker')
+    time.sleep(0.4)
+    queue.recover_expired()
+    assert queue.get(exhausted)['status'] == 'failed'
+
+def test_mutating_jobs_are_not_retried_by_default(queue):
+    """Test terraform changes default to one attempt and other kinds to three"""
+    apply = queue.get(queue.submit('terraform.apply', {'directory': '/infra'}))
+    build = queue.get(queue.submit('docker.build', {'image_name': 'app'}))
+
+    assert (apply['max_attempts'], build['max_attempts']) == (1, 3)
+
+def test_worker_stops_a_job_whose_lease_was_lost(queue):
+    """Test the heartbeat reports lost leases and the pool cancels those jobs"""
+    job_id = queue.submit('terraform.apply', {'directory': '/infra'}, max_attempts=2)
+    job = queue.claim('worker-1')
+    assert queue.heartbeat('worker-1', [job_id]) == ([], [])
+    assert queue.heartbeat('worker-2', [job_id]) == ([], [job_id])
+    queue.finish(job['id'], 'worker-1', 'failed')
+
+    job_id = queue.submit('terraform.apply', {'directory': '/infra'}, max_attempts=2)
+    started, stopped = threading.Event(), []
+
+    def apply(params, context):
+        if started.is_set():
+            return {'status': 'success'}
+        started.set()
+        deadline = time.monotonic() + 10
+        while not context.cancelled and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stopped.append(context.cancelled)
+        return {'status': 'error', 'error_message': 'interrupted'}
+
+    pool = JobWorkerPool(queue, {'terraform.apply': apply}, workers=1, poll_interval=0.05)
+    pool.start()
+    try:
+        assert started.wait(5)
+        # What recover_expired() in another pool does once this pool's lease has expired
+        with queue._transaction() as db:
+            db.execute("UPDATE jobs SET status = 'queued', worker = NULL WHERE id = ?", (job_id,))
+        job = queue.wait(job_id, timeout=10)
+    finally:
+        pool.stop(timeout=5)
+
+    assert stopped == [True]
+    assert (job['status'], job['attempts']) == ('succeeded', 2)
+
+def test_spilled_outputs_outlive_the_job_result(queue):
+    """Test a finished job records its output handles with a spill file that stays readable"""
+    queue.submit('docker.build', {'image_name': 'app'})
+    job = queue.claim('worker-1')
+    output = CapturedOutput(head_bytes=4, tail_bytes=4)
+    output.write(b'0123456789abcdef')
+
+    queue.finish(job['id'], 'worker-1', 'succeeded', {'status': 'success', 'stdout': output})
+    spill_path = output.path
+    del output
+    gc.collect()
+
+    stdout = queue.get(job['id'])['result']['stdout']
+    assert (stdout['head'], stdout['tail'], stdout['size']) == ('0123', 'cdef', 16)
+    assert not os.path.exists(spill_path)
+    with open(stdout['path'], 'rb') as handle:
+        assert handle.read() == b'456789abcdef'
+
+def test_cancel_queued_and_running_jobs(queue):
+    """Test cancellation reaches queued jobs directly and running jobs via heartbeat"""
+    started = threading.Event()
+
+    def wait_for_cancel(params, context):
+        started.set()
+        deadline = time.monotonic() + 10
+        while not context.cancelled and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return {'status': 'error', 'error_message': 'stopped'}
+
+    running = queue.submit('terraform.apply', {'directory': '/infra'})
+    waiting = queue.submit('terraform.apply', {'directory': '/infra'})
+    pool = JobWorkerPool(queue, {'terraform.apply': wait_for_cancel}, poll_interval=0.05)
+    pool.start()
+    try:
+        assert started.wait(5)
+        assert queue.cancel(waiting)
+        assert queue.cancel(running)
+        assert queue.wait(running, timeout=10)['status'] == 'cancelled'
+    finally:
+        pool.stop(timeout=5)
+    assert queue.get(waiting)['status'] == 'cancelled'
+    assert not queue.cancel(waiting)
+
+def test_run_streaming_forwards_subprocess_output(queue, tmp_path):
+    """Test subprocess output is logged line by line and summarized"""
+    job = queue.get(queue.submit('shell'))
+    context = JobContext(queue, job)
+
+    command = [sys.executable, '-c', 'for i in range(100): print(i)']
+    result = run_streaming(command, str(tmp_path), context, tail_lines=3)
+    context.flush()
+
+    assert result['status'] == 'success'
+    assert result['output_tail'] == ['97', '98', '99']
+    assert len([e for e in queue.events(job['id']) if e['kind'] == 'log']) == 100
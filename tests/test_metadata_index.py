@@ -0,0 +1,120 @@
+import numpy as np
+from learning.embedding import HashingEmbedder
+from learning.metadata_index import MetadataIndex
+from learning.persistence import EventLog
+from learning.systems.adaptive import RapidAdaptiveLearningSystem
+
+def test_candidates_intersect_postings():
+    """Test that multi-key filters intersect the per-value postings"""
+    index = MetadataIndex()
+    index.add(0, [
+        {'agent': 'Scribe', 'lang': 'python'},
+        {'agent': 'Keeper', 'lang': 'hcl'},
+        {'agent': 'Scribe', 'lang': 'hcl'},
+        {'agent': 'Scribe', 'tags': ['a', 'b']}
+    ])
+
+    assert index.candidates({'agent': 'Scribe'}).tolist() == [0, 2, 3]
+    assert index.candidates({'agent': 'Scribe', 'lang': 'hcl'}).tolist() == [2]
+    assert index.candidates({'tags': ['a', 'b']}).tolist() == [3]
+    assert index.candidates({'agent': 'Seer'}).tolist() == []
+    assert len(index) == 4
+
+def test_filtered_query_uses_new_rows():
+    """Test that events recorded after a filtered query are still found"""
+    system = RapidAdaptiveLearningSystem(embedder=HashingEmbedder(dimension=64))
+    system.record_learning_event('def process_user_data(params):', metadata={'agent': 'Scribe'})
+    assert len(system.find_similar_events('process data', filter_metadata={'agent': 'Scribe'})) == 1
+
+    system.record_learning_event('terraform apply output', metadata={'agent': 'Keeper'})
+    system.record_learning_event('def load_user_data(path):', metadata={'agent': 'Scribe'})
+    results = system.find_similar_events('user data', top_k=5, filter_metadata={'agent': 'Scribe'})
+
+    assert len(results) == 2
+    assert all(event['metadata']['agent'] == 'Scribe' for event in results)
+    assert system.find_similar_events('user data', filter_metadata={'agent': 'Seer'}) == []
+
+def test_selective_filter_is_cheaper_than_full_scan():
+    """Test that a rare filter value is resolved without scoring the corpus"""
+    system = RapidAdaptiveLearningSystem(embedder=HashingEmbedder(dimension=64))
+    contents = [f'event {i}' for i in range(20_000)]
+    events = [
+        system._build_event(content, {'agent': 'Rare' if i == 7 else 'Common'}, 'general')
+        for i, content in enumerate(contents)
+    ]
+    system.backend.add(events, system.embedder.embed(contents))
+
+    store = system.backend.store
+    scored = []
+    search = store.search
+
+    def counting_search(query, top_k, candidates=None):
+        scored.append(len(store) if candidates is None else len(candidates))
+        return search(query, top_k, candidates)
+
+    store.search = counting_search
+    results = system.find_similar_events('event', filter_metadata={'agent': 'Rare'})
+
+    assert [event['content'] for event in results] == ['event 7']
+    assert system.backend.metadata_index.candidates({'agent': 'Rare'}).tolist() == [7]
+    # Only the one matching row is scored, not the 20,000-row corpus
+    assert scored == [1]
+
+def test_save_load_and_remap(tmp_path):
+    """Test that postings survive a save/load round trip and follow compacted rows"""
+    index = MetadataIndex()
+    index.add(0, [
+        {'agent': 'Scribe', 'tags': ['a']},
+        {'agent': 'Keeper', 'retries': 1},
+        {'agent': 'Scribe', 'retries': True},
+        {'agent': 'Keeper', 'tags': ['a']}
+    ])
+    path = str(tmp_path / 'metadata.npz')
+
+    assert index.save(path)
+    assert MetadataIndex.load(path, max_rows=3) is None
+    loaded = MetadataIndex.load(path, max_rows=4)
+    for query in [{'agent': 'Scribe'}, {'tags': ['a']}, {'retries': 1}, {'agent': 'Seer'}]:
+        assert loaded.candidates(query).tolist() == index.candidates(query).tolist()
+    assert len(loaded) == 4
+
+    remapped = loaded.remap(np.array([1, 3]))
+    assert remapped.candidates({'agent': 'Keeper'}).tolist() == [0, 1]
+    assert remapped.candidates({'tags': ['a']}).tolist() == [1]
+    assert remapped.candidates({'agent': 'Scribe'}).tolist() == []
+    assert len(remapped) == 2
+
+def test_persisted_filters_do_not_reparse_the_log(tmp_path, monkeypatch):
+    """Test that filtered queries after reopening or compacting do not rebuild from the log"""
+    def make_system(**kwargs):
+        return RapidAdaptiveLearningSystem(
+            embedder=HashingEmbedder(dimension=64), storage_dir=str(tmp_path), **kwargs
+        )
+    system = make_system()
+    ids = [
+        system.record_learning_event(f'event {i}', metadata={'agent': 'Rare' if i % 4 else 'Seer'})
+        for i in range(8)
+    ]
+    system.close()
+    scans = []
+    iter_range = EventLog.iter_range
+    monkeypatch.setattr(
+        EventLog, 'iter_range', lambda log, *args: scans.append(args) or iter_range(log, *args)
+    )
+
+    reopened = make_system()
+    seer = reopened.find_similar_events('event', top_k=8, filter_metadata={'agent': 'Seer'})
+    assert {event['id'] for event in seer} == {ids[0], ids[4]}
+
+    assert scans == []
+
+    ids.append(reopened.record_learning_event('event 8', metadata={'agent': 'Seer'}))
+    for event_id in ids[:3]:
+        reopened.forget_event(event_id)
+    assert reopened.backend.storage.generation == 1
+    # forget() resolved its ids with one scan; the filter must not add another
+    scans.clear()
+    seer = reopened.find_similar_events('event', top_k=8, filter_metadata={'agent': 'Seer'})
+    assert {event['id'] for event in seer} == {ids[4], ids[8]}
+    assert scans == []
+    reopened.close()
@@ -0,0 +1,100 @@
+import gc
+import json
+import os
+import stat
+import pytest
+from tools.output_capture import CapturedOutput, json_default
+from tools.terraform_tool import TerraformTool
+
+def capture(data, chunk=997, head_bytes=1024, tail_bytes=1024):
+    output = CapturedOutput(head_bytes, tail_bytes)
+    for start in range(0, len(data), chunk):
+        output.write(data[start:start + chunk])
+    return output.finish()
+
+def test_small_output_stays_in_memory():
+    """Test output within head plus tail behaves like the captured string"""
+    output = capture(b'Plan: 1 to add\n')
+    
+    assert not output.spilled
+    assert str(output) == 'Plan: 1 to add\n'
+    assert output.tail == 'Plan: 1 to add\n'
+    assert list(output.iter_lines()) == ['Plan: 1 to add']
+
+def test_large_output_spills_and_reads_lazily():
+    """Test memory stays bounded while the full stream remains readable"""
+    data = b''.join(f'resource {i} will be created\n'.encode() for i in range(50_000))
+    output = capture(data)
+    
+    assert output.spilled and len(output) == len(data)
+    assert len(output._head) == 1024 and len(output._rest) == 1024
+    assert output.read_bytes(5000, 6000) == data[5000:6000]
+    assert output[-29:] == data[-29:].decode()
+    assert sum(len(chunk) for chunk in output.iter_chunks(4096)) == len(data)
+    assert next(output.iter_lines()) == 'resource 0 will be created'
+    assert sum(1 for _ in output.iter_lines()) == 50_000
+    
+    preview = str(output)
+    assert 'bytes omitted' in preview and len(preview) < 2200
+    
+    path = output.path
+    output.close()
+    assert not os.path.exists(path)
+
+def test_views_keep_the_spill_file_until_the_last_handle_goes():
+    """Test closing or dropping one handle leaves the file to the remaining views"""
+    data = b'x' * 10_000
+    output = capture(data)
+    view = output.view()
+    path = output.path
+
+    output.close()
+    assert view.read_bytes() == data
+    other = view.view()
+    del view
+    gc.collect()
+    assert other.text() == data.decode()
+
+    other.close()
+    assert not os.path.exists(path)
+
+def test_json_encoding_and_persisted_outputs(tmp_path):
+    """Test encoding keeps the spill path and persisted files outlive every handle"""
+    data = b''.join(f'line {i}\n'.encode() for i in range(2000))
+    output = capture(data)
+
+    encoded = json.loads(json.dumps({'stdout': output}, default=json_default))
+    assert encoded['stdout']['path'] == output.path
+    assert encoded['stdout']['size'] == len(data) and encoded['stdout']['spilled']
+
+    kept = output.persist(str(tmp_path / 'outputs' / 'stdout'))
+    output.close()
+    del kept
+    gc.collect()
+    with open(tmp_path / 'outputs' / 'stdout', 'rb') as handle:
+        assert handle.read() == data[1024:]
+
+def test_terraform_results_carry_output_handles(tmp_path, monkeypatch):
+    """Test TerraformTool captures a chatty command without holding it in memory"""
+    script = tmp_path / 'terraform'
+    script.write_text(
+        '#!/bin/sh\n'
+        'seq 1 200000\n'
+        'echo "done $1" >&2\n'
+        '[ "$1" = plan ]\n'
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv('PATH', f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    tool = TerraformTool(str(tmp_path), spill_dir=str(tmp_path))
+    
+    result = tool.plan()
+    assert result['status'] == 'success'
+    assert result['stdout'].spilled and result['stdout'].tail.endswith('199999\n200000\n')
+    assert str(result['stderr']) == 'done plan\n'
+    
+    result = tool.apply()
+    assert result['status'] == 'error'
+    assert 'non-zero exit status 1' in result['error_message']
+    
+    with pytest.raises(TypeError):
+        result['stdout'][5]
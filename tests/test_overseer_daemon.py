@@ -0,0 +1,108 @@
+import os
+import subprocess
+import sys
+import threading
+import pytest
+from project_overseer.cli import main
+from project_overseer.client import OverseerClient
+from project_overseer.daemon import OverseerDaemon
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Fixture running a daemon with recording backends on a temporary socket"""
+    calls = []
+
+    def record(command):
+        calls.append((threading.current_thread().name, command['command'], command['kwargs']))
+        return {'status': 'success', 'echo': command['kwargs']}
+
+    daemon = OverseerDaemon(
+        socket_path=str(tmp_path / 'overseer.sock'),
+        backends={'GitHub': record, 'Terraform': record}
+    )
+    daemon.calls = calls
+    daemon.start()
+    yield daemon
+    daemon.close()
+
+def test_client_round_trips_over_one_connection(daemon):
+    """Test run and call requests reach the warm handlers"""
+    with OverseerClient(daemon.socket_path) as client:
+        assert client.ping()['status'] == 'success'
+        result = client.run('@GitHub add_comment repo_name=owner/repo issue_number=42')
+        assert result['echo'] == {'repo_name': 'owner/repo', 'issue_number': 42}
+        result = client.call('Terraform', 'plan', directory='/infra')
+        assert result['echo'] == {'directory': '/infra'}
+
+        assert client.run('@Nobody do things')['status'] == 'error'
+        assert client.request({'op': 'bogus'})['status'] == 'error'
+        assert client.stats()['requests'] == 6
+
+    assert [call[1] for call in daemon.calls] == ['add_comment', 'plan']
+
+def test_concurrent_clients(daemon):
+    """Test several clients are served at the same time"""
+    results = []
+
+    def worker(i):
+        with OverseerClient(daemon.socket_path) as client:
+            results.append(client.call('GitHub', 'list_repositories', org_name=f'org{i}'))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(results) == 8
+    assert all(result['status'] == 'success' for result in results)
+
+def test_cli_forwards_and_stops_daemon(daemon, capsys):
+    """Test the thin CLI client, shutdown and stale socket handling"""
+    assert main(['--socket', daemon.socket_path, 'run', '@GitHub', 'list_repositories']) == 0
+    assert '"status": "success"' in capsys.readouterr().out
+
+    with pytest.raises(RuntimeError):
+        OverseerDaemon(socket_path=daemon.socket_path, backends={}).start()
+
+    assert main(['--socket', daemon.socket_path, 'stop']) == 0
+    daemon._thread.join(5)
+    assert main(['--socket', daemon.socket_path, 'ping']) == 2
+
+def test_jobs_are_submitted_and_watched_through_the_daemon(tmp_path):
+    """Test the daemon hosts the durable job queue and its workers"""
+    def apply(params, context):
+        context.progress('applying')
+        context.log(f"applied {params['directory']}")
+        return {'status': 'success'}
+
+    daemon = OverseerDaemon(
+        socket_path=str(tmp_path / 'overseer.sock'),
+        backends={},
+        job_database=str(tmp_path / 'jobs.sqlite3'),
+        job_handlers={'terraform.apply': apply}
+    )
+    daemon.start()
+    try:
+        with OverseerClient(daemon.socket_path) as client:
+            job_id = client.submit_job('terraform.apply', {'directory': '/infra'})['job_id']
+            events = list(client.watch_job(job_id, poll_interval=0.05))
+
+            assert client.job(job_id)['job']['status'] == 'succeeded'
+            assert [event['kind'] for event in events].count('log') == 1
+            assert client.cancel_job(job_id)['status'] == 'error'
+            assert client.stats()['jobs'] == {'succeeded': 1}
+    finally:
+        daemon.close()
+
+def test_cli_imports_in_the_installed_layout(tmp_path):
+    """Test the console script's modules import with only src/ on sys.path"""
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+    result = subprocess.run(
+        [sys.executable, '-c', 'import project_overseer.cli, project_overseer.daemon, agents'],
+        cwd=str(tmp_path),
+        env={**os.environ, 'PYTHONPATH': src},
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from learning.ann import synthetic_vectors
+from learning.embedding import HashingEmbedder
+from learning.quantization import QuantizedIndex
+from learning.systems.adaptive import RapidAdaptiveLearningSystem
+from learning.vector_store import NumPyVectorStore
+
+@pytest.fixture
+def store():
+    """Fixture with a clustered corpus"""
+    store = NumPyVectorStore(128)
+    store.add(synthetic_vectors(4_000, 128, n_clusters=64, seed=3))
+    return store
+
+@pytest.mark.parametrize('mode, compression', [('int8', 3.8), ('binary', 32.0)])
+def test_quantized_recall_meets_target(store, mode, compression):
+    """Test that calibration keeps measured recall at or above the target"""
+    index = QuantizedIndex(store, mode=mode, target_recall=0.95)
+    index.add(np.arange(len(store)))
+
+    stats = index.stats()
+    assert stats['compression'] >= compression
+    assert stats['measured_recall'] >= 0.95
+    assert index.evaluate(top_k=10, queries=100)['recall'] >= 0.9
+
+def test_rescoring_returns_exact_similarities(store):
+    """Test that returned scores are full-precision cosine similarities"""
+    index = QuantizedIndex(store, mode='binary', target_recall=None)
+    index.add(np.arange(len(store)))
+    query = store.vectors[42]
+
+    rows, scores = index.search(query, 5)
+    np.testing.assert_allclose(scores, store.vectors[rows] @ query, rtol=1e-5)
+    assert rows[0] == 42
+
+def test_learning_system_with_quantized_index():
+    """Test the int8 backend end to end, including filters and stats"""
+    system = RapidAdaptiveLearningSystem(embedder=HashingEmbedder(dimension=64), index_type='int8')
+    system.record_learning_event('terraform state lock timeout', metadata={'agent': 'Keeper'})
+    system.record_learning_event('docker layer cache invalidated', metadata={'agent': 'Watcher'})
+
+    results = system.find_similar_events(
+        'terraform lock',
+        top_k=1,
+        filter_metadata={'agent': 'Keeper'}
+    )
+    assert results[0]['content'] == 'terraform state lock timeout'
+    assert system.index_stats()['bytes_per_vector'] == 68
+    system.close()
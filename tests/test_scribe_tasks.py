@@ -0,0 +1,55 @@
+import importlib
+import sys
+import types
+import pytest
+
+class StubAgent:
+    """Minimal stand-in for crewai.Agent recording its configuration"""
+    
+    def __init__(self, **kwargs):
+        self.config = kwargs
+
+class StubTask:
+    """Minimal stand-in for crewai.Task"""
+    
+    def __init__(self, description, agent, expected_output):
+        self.description = description
+        self.agent = agent
+        self.expected_output = expected_output
+
+@pytest.fixture
+def scribe(monkeypatch):
+    """Fixture importing agents.scribe against a stubbed crewai"""
+    crewai = types.ModuleType('crewai')
+    crewai.Agent = StubAgent
+    crewai.Task = StubTask
+    monkeypatch.setitem(sys.modules, 'crewai', crewai)
+    monkeypatch.delitem(sys.modules, 'agents.scribe', raising=False)
+    module = importlib.import_module('agents.scribe')
+    module.render_task_prefix.cache_clear()
+    yield module
+    sys.modules.pop('agents.scribe', None)
+
+def test_batched_tasks_share_one_rendered_prefix(scribe):
+    """Test every task starts with the identical, once-rendered prefix"""
+    agent = scribe.ScribeAgent()
+    tasks = agent.create_code_tasks(
+        ['Add a parser', 'Add a dispatcher'], shared_context='  Use type hints.\n'
+    )
+    
+    prefix = scribe.render_task_prefix('  Use type hints.\n')
+    assert [task.description for task in tasks] == [
+        prefix + 'Add a parser', prefix + 'Add a dispatcher'
+    ]
+    assert '## Shared context\nUse type hints.\n\n## Task\n' in prefix
+    assert all(task.agent is agent for task in tasks)
+    assert scribe.render_task_prefix.cache_info().misses == 1
+
+def test_tasks_without_shared_context_use_plain_descriptions(scribe):
+    """Test the unbatched path matches create_code_task"""
+    agent = scribe.ScribeAgent()
+    tasks = agent.create_code_tasks(['Add a parser'])
+    
+    assert tasks[0].description == 'Add a parser'
+    assert tasks[0].expected_output == scribe.CODE_TASK_EXPECTED_OUTPUT
+    assert agent.config['backstory'] == scribe.DEFAULT_BACKSTORY
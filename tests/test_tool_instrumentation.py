@@ -0,0 +1,58 @@
+import time
+import pytest
+from tools.instrumentation import (
+    LatencyHistogram,
+    PrometheusTextfileSink,
+    ToolInstrumentation,
+    backend_timer,
+    instrumented_call,
+    record_retry,
+    set_instrumentation
+)
+
+@pytest.fixture
+def instrumentation():
+    """Fixture installing a fresh process-wide instrumentation"""
+    instrumentation = ToolInstrumentation()
+    set_instrumentation(instrumentation)
+    yield instrumentation
+    set_instrumentation(ToolInstrumentation())
+
+def test_histogram_percentiles_within_bucket_error():
+    """Test percentile estimates stay within the log-linear resolution"""
+    histogram = LatencyHistogram()
+    for value in range(1, 100_001):
+        histogram.record(value)
+    
+    for q, expected in [(50, 50_000), (90, 90_000), (99, 99_000)]:
+        assert abs(histogram.percentile(q) - expected) / expected < 0.07
+    assert histogram.summary()['max'] == 100_000
+
+def test_call_records_backend_time_retries_and_status(instrumentation):
+    """Test a dispatcher call is folded into the snapshot"""
+    def call():
+        record_retry()
+        with backend_timer('network'):
+            time.sleep(0.01)
+        return {'status': 'success', 'payload': 'x' * 100}
+    
+    instrumented_call('github', 'list_repositories', call)
+    instrumented_call('github', 'list_repositories', lambda: {'status': 'error'})
+    
+    metrics = instrumentation.snapshot()['github.list_repositories']
+    assert metrics['statuses'] == {'success': 1, 'error': 1}
+    assert metrics['retries'] == 1
+    assert metrics['backend'] == 'network'
+    assert metrics['backend_us']['max'] >= 10_000
+    assert metrics['payload_bytes']['max'] >= 100
+
+def test_prometheus_textfile_sink(instrumentation, tmp_path):
+    """Test metrics are exported in text exposition format"""
+    path = tmp_path / 'overseer.prom'
+    instrumentation.add_sink(PrometheusTextfileSink(str(path), interval=0))
+    
+    instrumented_call('docker', 'list_images', lambda: {'status': 'success'})
+    
+    content = path.read_text()
+    assert 'overseer_tool_calls_total{tool="docker",method="list_images",status="success"} 1' in content
+    assert 'overseer_tool_wall_seconds_count{tool="docker",method="list_images"} 1' in content
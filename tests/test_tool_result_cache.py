@@ -0,0 +1,153 @@
+import threading
+import time
+import pytest
+from tools.output_capture import CapturedOutput
+from tools.result_cache import CachePolicy, ToolResultCache
+
+@pytest.fixture
+def policy():
+    """Fixture describing a tool with one read and one write method"""
+    return CachePolicy(
+        namespace='test',
+        ttls={'list_items': 60.0},
+        mutating=frozenset({'remove_item'}),
+        resource=lambda kwargs: kwargs.get('owner', 'default')
+    )
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+def test_read_calls_memoized_until_ttl(policy):
+    """Test identical reads hit the cache until their TTL expires"""
+    clock = FakeClock()
+    cache = ToolResultCache(clock=clock)
+    calls = []
+    
+    def execute():
+        calls.append(1)
+        return {'status': 'success', 'items': [len(calls)]}
+    
+    first = cache.call(policy, 'list_items', {'owner': 'a'}, execute)
+    second = cache.call(policy, 'list_items', {'owner': 'a', 'filter': None}, execute)
+    assert first == second
+    assert len(calls) == 1
+    
+    clock.now = 61
+    cache.call(policy, 'list_items', {'owner': 'a'}, execute)
+    assert len(calls) == 2
+
+def test_mutation_invalidates_same_resource(policy):
+    """Test writes drop cached reads for the resource they target"""
+    cache = ToolResultCache()
+    calls = []
+    
+    def execute():
+        calls.append(1)
+        return {'status': 'success'}
+    
+    cache.call(policy, 'list_items', {'owner': 'a'}, execute)
+    cache.call(policy, 'list_items', {'owner': 'b'}, execute)
+    cache.call(policy, 'remove_item', {'owner': 'a'}, execute)
+    cache.call(policy, 'list_items', {'owner': 'a'}, execute)
+    cache.call(policy, 'list_items', {'owner': 'b'}, execute)
+    
+    assert len(calls) == 4
+
+def test_lru_bound_and_errors_not_cached(policy):
+    """Test the size bound and that failed results are not stored"""
+    cache = ToolResultCache(max_entries=2)
+    
+    for owner in ['a', 'b', 'c']:
+        cache.call(policy, 'list_items', {'owner': owner}, lambda: {'status': 'success'})
+    cache.call(policy, 'list_items', {'owner': 'd'}, lambda: {'status': 'error'})
+    
+    assert cache.stats()['entries'] == 2
+
+def test_single_flight_deduplication(policy):
+    """Test concurrent identical calls share one execution"""
+    cache = ToolResultCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    
+    def execute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'status': 'success'}
+    
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.call(policy, 'list_items', {}, execute))
+        ) for _ in range(4)
+    ]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    while cache.stats()['coalesced'] < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert len(calls) == 1
+    assert len(results) == 4
+
+def test_clear_discards_inflight_reads(policy):
+    """Test a read started before invalidate() of everything is not stored"""
+    cache = ToolResultCache()
+    
+    def execute():
+        cache.invalidate()
+        return {'status': 'success'}
+    
+    cache.call(policy, 'list_items', {'owner': 'a'}, execute)
+    
+    assert cache.stats()['entries'] == 0
+
+def test_credentials_kept_out_of_keys():
+    """Test credential kwargs separate entries without appearing in the key"""
+    secret_policy = CachePolicy(
+        namespace='test',
+        ttls={'list_items': 60.0},
+        mutating=frozenset(),
+        resource=lambda kwargs: 'default',
+        credentials=frozenset({'token'})
+    )
+    cache = ToolResultCache()
+    calls = []
+    
+    def execute():
+        calls.append(1)
+        return {'status': 'success'}
+    
+    for token in ['secret-a', 'secret-b', 'secret-a']:
+        cache.call(secret_policy, 'list_items', {'token': token}, execute)
+    
+    assert len(calls) == 2
+    assert not any('secret' in key[1] for key in cache._entries)
+
+def test_cached_output_handles_are_independent(policy):
+    """Test closing the output of one cache hit keeps the spill file for the others"""
+    cache = ToolResultCache()
+
+    def execute():
+        output = CapturedOutput(head_bytes=4, tail_bytes=4)
+        output.write(b'0123456789abcdef')
+        return {'status': 'success', 'stdout': output.finish()}
+
+    first = cache.call(policy, 'list_items', {}, execute)
+    second = cache.call(policy, 'list_items', {}, execute)
+    assert second['stdout'] is not first['stdout']
+    assert second['stdout'].path == first['stdout'].path
+
+    first['stdout'].close()
+    second['stdout'].close()
+    third = cache.call(policy, 'list_items', {}, execute)
+    assert third['stdout'].text() == '0123456789abcdef'
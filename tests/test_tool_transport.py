@@ -0,0 +1,197 @@
+import time
+import pytest
+from github import GithubException
+from tools.github_token_pool import GitHubTokenPool
+from tools.github_tool import github_retryable, github_retry_after
+from tools.instrumentation import (
+    ToolInstrumentation,
+    instrumented_call,
+    render_prometheus,
+    set_instrumentation
+)
+from tools.transport import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    Transport,
+    configure_transport,
+    get_transport,
+    reset_transports,
+    transport_stats
+)
+
+class Transient(Exception):
+    pass
+
+def is_transient(error):
+    return isinstance(error, Transient)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def instrumentation():
+    """Fixture installing a fresh process-wide instrumentation and transport registry"""
+    instrumentation = ToolInstrumentation()
+    set_instrumentation(instrumentation)
+    reset_transports()
+    yield instrumentation
+    reset_transports()
+    set_instrumentation(ToolInstrumentation())
+
+def flaky(failures, result='ok'):
+    calls = []
+    
+    def operation():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise Transient('503')
+        return result
+    
+    operation.calls = calls
+    return operation
+
+def test_backoff_is_jittered_capped_and_honours_retry_after():
+    """Test full-jitter delays stay under the exponential ceiling"""
+    policy = RetryPolicy(base_delay=1, max_delay=5, seed=1)
+    for retry in range(1, 8):
+        assert 0 <= policy.delay(retry) <= min(5, 2 ** (retry - 1))
+    assert policy.delay(1, retry_after=3) >= 3
+    assert policy.delay(1, retry_after=60) == 5
+
+def test_idempotent_calls_are_retried_and_counted(instrumentation):
+    """Test transient failures are retried and recorded on the tool call"""
+    sleeps = []
+    transport = Transport('github', is_transient, sleep=sleeps.append)
+    operation = flaky(2)
+    
+    result = instrumented_call(
+        'github', 'list_repositories',
+        lambda: {'status': 'success', 'value': transport.call(operation)}
+    )
+    
+    assert result['value'] == 'ok'
+    assert len(operation.calls) == 3 and len(sleeps) == 2
+    assert instrumentation.snapshot()['github.list_repositories']['retries'] == 2
+    assert instrumentation.events() == {'github.attempt': 3, 'github.retry': 2}
+
+def test_writes_and_permanent_errors_are_not_retried(instrumentation):
+    """Test non-idempotent calls get one attempt and 4xx-style errors pass through"""
+    transport = Transport('github', is_transient, sleep=lambda delay: None)
+    write = flaky(1)
+    with pytest.raises(Transient):
+        transport.call(write, idempotent=False)
+    assert len(write.calls) == 1
+    
+    def missing():
+        raise KeyError('404')
+    
+    with pytest.raises(KeyError):
+        transport.call(missing)
+    assert transport.breaker.failures == 0
+    assert instrumentation.events()['github.gave_up'] == 1
+
+def test_breaker_opens_rejects_probes_and_closes(instrumentation):
+    """Test the circuit breaker state machine"""
+    clock = FakeClock()
+    transport = Transport(
+        'docker:default',
+        is_transient,
+        retry=RetryPolicy(max_attempts=1),
+        breaker=CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    )
+    for _ in range(2):
+        with pytest.raises(Transient):
+            transport.call(flaky(1))
+    assert transport.breaker.state == 'open'
+    
+    clock.now = 4
+    with pytest.raises(CircuitOpenError) as error:
+        transport.call(flaky(0))
+    assert error.value.retry_in == pytest.approx(6)
+    
+    clock.now = 11
+    with pytest.raises(Transient):
+        transport.call(flaky(1))
+    assert transport.breaker.state == 'open'
+    
+    clock.now = 22
+    assert transport.call(flaky(0)) == 'ok'
+    assert transport.breaker.state == 'closed'
+    
+    events = instrumentation.events()
+    assert events['docker:default.open'] == 2
+    assert events['docker:default.rejected'] == 1
+    assert events['docker:default.probe'] == 2
+    assert events['docker:default.closed'] == 1
+
+def test_hedged_read_returns_the_faster_attempt(instrumentation):
+    """Test a slow first attempt is overtaken by the hedge"""
+    transport = Transport('github', is_transient, hedge=True, hedge_delay=0.01)
+    calls = []
+    
+    def operation():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.5)
+            return 'slow'
+        return 'fast'
+    
+    start = time.perf_counter()
+    assert transport.call(operation) == 'fast'
+    assert time.perf_counter() - start < 0.4
+    assert instrumentation.events()['github.hedge_won'] == 1
+    
+    content = render_prometheus(instrumentation.snapshot(), instrumentation.events())
+    assert 'overseer_events_total{scope="github",event="hedged"} 1' in content
+
+def test_registry_shares_transports_and_applies_configuration(instrumentation):
+    """Test tools share one transport per backend"""
+    transport = get_transport('github', is_transient)
+    assert get_transport('github', is_transient) is transport
+    
+    configure_transport('github', hedge=True)
+    assert get_transport('github', is_transient).hedge
+    assert transport_stats()['github']['state'] == 'closed'
+
+def test_github_error_classification():
+    """Test which GitHub errors are treated as transient"""
+    assert github_retryable(GithubException(502, 'bad gateway', None))
+    assert not github_retryable(GithubException(404, 'not found', None))
+    assert not github_retryable(GithubException(403, 'forbidden', None))
+    
+    throttled = GithubException(403, 'secondary rate limit', {'retry-after': '7'})
+    assert not github_retryable(throttled)
+    assert github_retry_after(throttled) == 7
+
+def test_rate_limits_rotate_tokens_without_opening_the_breaker(instrumentation):
+    """Test throttled credentials are left to the pool and count as a healthy backend"""
+    clients = {}
+
+    class ThrottledClient:
+        def __init__(self, token):
+            self.token = token
+            self.requester = type('Requester', (), {'rate_limiting': (-1, -1)})()
+            clients[token] = self
+            self.calls = 0
+
+        def get_repo(self, name):
+            self.calls += 1
+            if self.token == 'a':
+                raise GithubException(429, 'secondary rate limit', {'retry-after': '30'})
+            return self.token
+
+    transport = get_transport('github', github_retryable, github_retry_after)
+    transport.breaker.failure_threshold = 1
+    pool = GitHubTokenPool(tokens=['a', 'b'], client_factory=ThrottledClient)
+
+    for _ in range(3):
+        assert pool.call(lambda client: transport.call(lambda: client.get_repo('o/r'))) == 'b'
+
+    assert clients['a'].calls == 1
+    assert transport.breaker.state == 'closed'
+    assert 'github.retry' not in instrumentation.events()
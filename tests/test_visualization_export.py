@@ -0,0 +1,79 @@
+import os
+import sys
+import networkx as nx
+
+# The visualization modules live in docs/ and import each other by module name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'docs'))
+
+import visualization_export
+from visualization_export import LayoutCache, graph_structure_key, render_in_pool
+
+def path_graph(n):
+    return nx.path_graph(n)
+
+def counting_layout(calls):
+    def compute(G):
+        calls.append(G.number_of_nodes())
+        return nx.circular_layout(G)
+    return compute
+
+def test_structure_key_ignores_styling():
+    """Test that only nodes, edges, variant and the layout weight change the key"""
+    plain = nx.Graph([('a', 'b'), ('b', 'c')])
+    styled = nx.Graph()
+    styled.add_node('a', color='red', size=300)
+    styled.add_edge('b', 'c', color='gray', weight=5)
+    styled.add_edge('a', 'b', style='dashed')
+
+    assert graph_structure_key(plain) == graph_structure_key(styled)
+    assert graph_structure_key(plain, variant='spring') != graph_structure_key(plain)
+    weighted = graph_structure_key(styled, weight='weight')
+    assert graph_structure_key(plain, weight='weight') != weighted
+    assert graph_structure_key(plain) != graph_structure_key(nx.Graph([('a', 'b')]))
+    assert graph_structure_key(plain) != graph_structure_key(nx.DiGraph(plain))
+
+def test_layout_cache_evicts_least_recently_used():
+    """Test that the entry not used for longest is evicted first"""
+    calls = []
+    compute = counting_layout(calls)
+    cache = LayoutCache(max_entries=2)
+
+    cache.layout(path_graph(2), compute)
+    cache.layout(path_graph(3), compute)
+    cache.layout(path_graph(2), compute)
+    cache.layout(path_graph(4), compute)
+    assert calls == [2, 3, 4]
+
+    cache.layout(path_graph(2), compute)
+    cache.layout(path_graph(3), compute)
+    assert calls == [2, 3, 4, 3]
+    assert cache.stats() == {'hits': 2, 'disk_hits': 0, 'misses': 4, 'entries': 2}
+
+def test_layout_cache_round_trips_through_disk(tmp_path):
+    """Test that another cache on the same directory reuses layouts with the original nodes"""
+    G = nx.Graph([(1, (2, 'x')), ((2, 'x'), 'three')])
+    calls = []
+    first = LayoutCache(directory=str(tmp_path)).layout(G, counting_layout(calls))
+
+    second_cache = LayoutCache(directory=str(tmp_path))
+    second = second_cache.layout(G, counting_layout(calls))
+
+    assert calls == [3]
+    assert second == first
+    assert set(second) == {1, (2, 'x'), 'three'}
+    assert second_cache.stats()['disk_hits'] == 1
+
+def render_job(n):
+    G = path_graph(n)
+    visualization_export.default_layout_cache().layout(G, nx.circular_layout)
+    return [f'graph-{n}']
+
+def test_in_process_render_keeps_caller_state(tmp_path):
+    """Test that rendering without a pool leaves the process-wide cache in place"""
+    cache = visualization_export.default_layout_cache()
+
+    paths = render_in_pool(render_job, [(3,)], layout_cache_dir=str(tmp_path))
+
+    assert paths == ['graph-3']
+    assert visualization_export.default_layout_cache() is cache
+    assert os.listdir(tmp_path) == []
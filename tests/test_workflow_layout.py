@@ -0,0 +1,99 @@
+import os
+import sys
+import networkx as nx
+import numpy as np
+import pytest
+
+pytest.importorskip('matplotlib')
+pytest.importorskip('seaborn')
+pytest.importorskip('scipy')
+
+# The visualization modules live in docs/ and import each other by module name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'docs'))
+
+from ETHICAL_WORKFLOW_VISUALIZATION import (
+    EthicalWorkflowVisualizer, prune_edges, sparse_spectral_layout
+)
+from visualization_export import LayoutCache
+
+def as_array(pos, nodes):
+    return np.array([pos[node] for node in nodes])
+
+def test_spectral_layout_of_tiny_graphs():
+    """Test the empty, single-node and two-node cases"""
+    assert sparse_spectral_layout(nx.Graph()) == {}
+
+    single = nx.Graph()
+    single.add_node('only')
+    np.testing.assert_array_equal(sparse_spectral_layout(single)['only'], [0.0, 0.0])
+
+    pos = sparse_spectral_layout(nx.Graph([('a', 'b')]))
+    np.testing.assert_allclose(as_array(pos, ['a', 'b']), [[-1.0, 0.0], [1.0, 0.0]])
+
+def test_spectral_layout_separates_components():
+    """Test that disconnected components get disjoint, normalized, reproducible regions"""
+    G = nx.disjoint_union_all([nx.cycle_graph(12), nx.complete_graph(5), nx.path_graph(2)])
+    G.add_node('isolated')
+    components = [sorted(c, key=str) for c in nx.connected_components(G)]
+
+    pos = sparse_spectral_layout(G, seed=3)
+    coords = as_array(pos, list(G.nodes()))
+
+    assert set(pos) == set(G.nodes())
+    assert np.isfinite(coords).all()
+    assert np.abs(coords).max() == pytest.approx(1.0)
+    np.testing.assert_allclose(coords.mean(axis=0), [0.0, 0.0], atol=1e-12)
+    boxes = [
+        (as_array(pos, members).min(axis=0), as_array(pos, members).max(axis=0))
+        for members in components
+    ]
+    for i, (low_a, high_a) in enumerate(boxes):
+        for low_b, high_b in boxes[i + 1:]:
+            assert (high_a < low_b).any() or (high_b < low_a).any()
+
+    again = sparse_spectral_layout(G, seed=3)
+    np.testing.assert_array_equal(coords, as_array(again, list(G.nodes())))
+
+def test_prune_edges_keeps_strongest_edge_per_node():
+    """Test that keep_fraction=0 keeps only the heaviest edges plus each node's strongest"""
+    G = nx.Graph()
+    G.add_weighted_edges_from([
+        ('a', 'b', 5.0),
+        ('b', 'c', 1.0),
+        ('c', 'd', 2.0),
+        ('a', 'd', 0.5),
+        ('e', 'd', 0.1)
+    ])
+
+    kept = {frozenset(edge) for edge in prune_edges(G, keep_fraction=0)}
+
+    assert kept == {frozenset('ab'), frozenset('cd'), frozenset('de')}
+    assert {node for edge in kept for node in edge} == set(G.nodes())
+
+def test_prune_edges_thresholds():
+    """Test min_weight, the default weight of 1 and graphs without edges"""
+    G = nx.Graph()
+    G.add_edge('a', 'b', weight=3.0)
+    G.add_edge('b', 'c')
+    G.add_edge('a', 'c', weight=0.5)
+    G.add_edge('c', 'd', weight=0.2)
+    # ('a', 'c') is no node's strongest edge, so only the threshold decides it
+
+    assert prune_edges(G, keep_fraction=1.0) == list(G.edges())
+    assert ('a', 'c') in prune_edges(G, min_weight=0.4)
+    assert {frozenset(e) for e in prune_edges(G, min_weight=1.0)} == {
+        frozenset('ab'), frozenset('bc'), frozenset('cd')
+    }
+    assert prune_edges(nx.empty_graph(3)) == []
+
+def test_large_network_layout_is_cached_across_renders(tmp_path):
+    """Test that re-rendering the same workflows reuses the layout despite new weights"""
+    cache = LayoutCache(directory=str(tmp_path / 'layouts'))
+    visualizer = EthicalWorkflowVisualizer(output_dir=str(tmp_path), layout_cache=cache)
+    workflows = {f'agent-{i}': {} for i in range(40)}
+
+    for _ in range(2):
+        visualizer.visualize_ethical_intervention_network(workflows, large_graph=True)
+
+    assert cache.stats()['hits'] == 1
+    assert len(os.listdir(tmp_path / 'layouts')) == 1